@@ -30,6 +30,7 @@ from gremlin.input_devices import ButtonReleaseActions
 import gremlin.config
 import gremlin.macro
 import gremlin.shared_state
+import gremlin.tick
 import gremlin.ui.ui_common
 import gremlin.ui.input_item
 import enum
@@ -39,8 +40,6 @@ from gremlin.keyboard import Key, key_from_name, key_from_code
 from gremlin.ui.virtual_keyboard import *
 from gremlin.types import MouseButton, MouseAction, MouseClickMode, KeyboardOutputMode
 import logging
-import threading
-import time
 from gremlin.util import log_info
 
 class MapToKeyboardExWidget(gremlin.ui.input_item.AbstractActionWidget):
@@ -309,8 +308,7 @@ class MapToKeyboardExFunctor(gremlin.base_profile.AbstractFunctor):
         self.delay = action.delay / 1000
         self.autorepeat_delay = action.autorepeat_delay / 1000
         self.is_pressed = False
-        self._ar_thread = None
-        self._ar_running = False
+        self._ar_task = None # autorepeat subscription to the shared tick
 
         if self.delay < 0:
             self.delay = 0
@@ -347,13 +345,13 @@ class MapToKeyboardExFunctor(gremlin.base_profile.AbstractFunctor):
         self.is_pressed = False
 
     def profile_start(self):
-        self._ar_running = False
+        self._ar_stop()
 
     def profile_stop(self):
         # release all keys
         if self.mode == KeyboardOutputMode.Hold:
             gremlin.macro.MacroManager().queue_macro(self.release)
-        self._ar_running = False
+        self._ar_stop()
 
     def process_event(self, event, value):
         if event.event_type == InputType.JoystickAxis or value.current:
@@ -387,19 +385,20 @@ class MapToKeyboardExFunctor(gremlin.base_profile.AbstractFunctor):
                         event
                     )
             elif self.mode == KeyboardOutputMode.AutoRepeat:
-                # setup autorepeat thread
-                if self._ar_thread is None:
-                    self._ar_thread = threading.Thread(target=self._ar_execute)
-                    self._ar_running = True
-                    self._ar_thread.start()
+                # setup autorepeat task
+                if self._ar_task is None:
+                    if gremlin.config.runtime_settings.verbose:
+                        log_info("autorepeat start...")
+                    # give time for the key pulse + our own delay
+                    self._ar_task = gremlin.tick.TickService().subscribe(
+                        self._ar_execute,
+                        interval=self.delay + self.autorepeat_delay
+                    )
         else:
             # release
             if self.mode == KeyboardOutputMode.Hold:
                 gremlin.macro.MacroManager().queue_macro(self.release)
-            self._ar_running = False
-            if self._ar_thread is not None:
-                self._ar_thread.join()
-                self._ar_thread = None
+            self._ar_stop()
 
             
             
@@ -408,15 +407,16 @@ class MapToKeyboardExFunctor(gremlin.base_profile.AbstractFunctor):
         return True
 
     def _ar_execute(self):
-        ''' autorepeat run thread '''
-        verbose = gremlin.config.Configuration().verbose
-        if verbose:
-            log_info("autorepeat start...")
-        while self._ar_running:
-            gremlin.macro.MacroManager().queue_macro(self.delay_press_release)
-            time.sleep(self.delay + self.autorepeat_delay) # give time for the key pulse + our own delay
-        if verbose:
-            log_info("autorepeat stop...")
+        ''' autorepeat pulse - runs periodically on the shared tick '''
+        gremlin.macro.MacroManager().queue_macro(self.delay_press_release)
+
+    def _ar_stop(self):
+        ''' stops autorepeat '''
+        if self._ar_task is not None:
+            self._ar_task.cancel()
+            self._ar_task = None
+            if gremlin.config.runtime_settings.verbose:
+                log_info("autorepeat stop...")
         
 
             
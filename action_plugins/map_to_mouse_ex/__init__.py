@@ -21,8 +21,9 @@ import gremlin.sendinput
 from gremlin import input_devices
 
 
-import enum, threading,time, random
+import enum, time, random
 
+import gremlin.tick
 import gremlin.util
 
 
@@ -501,6 +502,68 @@ class MapToMouseExWidget(gremlin.ui.input_item.AbstractActionWidget):
         self.button_press_dialog.show()
 
 
+class MouseWiggle:
+
+    """Moves the mouse back and forth every now and then from the shared tick."""
+
+    # (dx, dy, duration in seconds) steps of a single wiggle
+    steps = ((1, 1, 1.0), (-1, -1, 0.5), (0, 0, 0.0))
+
+    def __init__(self, name, move):
+        """Creates a new instance.
+
+        :param name name of the output, used in messages
+        :param move callable taking the dx and dy of the motion to send
+        """
+        self.name = name
+        self.move = move
+        self._subscription = None
+        self._step = 0
+        self._next_time = 0.0
+
+    @property
+    def active(self):
+        ''' true if wiggling is enabled '''
+        return self._subscription is not None
+
+    def start(self):
+        ''' enables wiggling, the first wiggle happens right away '''
+        if self._subscription is not None:
+            return
+        syslog.debug(f"Wiggle {self.name} start...")
+        input_devices.remote_state.say(f"{self.name} wiggle mode on")
+        self._step = 0
+        self._next_time = time.time()
+        self._subscription = gremlin.tick.TickService().subscribe(self._tick, interval=0.05)
+
+    def stop(self):
+        ''' disables wiggling, stopping any motion of a wiggle in progress '''
+        if self._subscription is None:
+            return
+        self._subscription.cancel()
+        self._subscription = None
+        if self._step != 0:
+            self.move(0, 0)
+        syslog.debug(f"Wiggle {self.name} stop...")
+        input_devices.remote_state.say(f"{self.name} wiggle mode off")
+
+    def _tick(self):
+        ''' advances the wiggle once the current step has elapsed '''
+        now = time.time()
+        if now < self._next_time:
+            return
+        if self._step == 0:
+            syslog.debug(f"wiggling {self.name}...")
+        dx, dy, duration = self.steps[self._step]
+        self.move(dx, dy)
+        self._step += 1
+        if self._step == len(self.steps):
+            # wait a random time until the next wiggle
+            self._step = 0
+            duration = random.uniform(10, 40)
+        self._next_time = now + duration
+
+
 class MapToMouseExFunctor(gremlin.base_profile.AbstractFunctor):
 
     """Implements the functionality required to move a mouse cursor.
@@ -510,11 +573,15 @@ class MapToMouseExFunctor(gremlin.base_profile.AbstractFunctor):
     properly with a single input, at least partially.
     """
 
-    # shared wiggle thread
-    _wiggle_local_thread = None
-    _wiggle_remote_thread = None
-    _wiggle_local_stop_requested = False
-    _wiggle_remote_stop_requested = False
+    # shared wiggle state
+    _wiggle_local = MouseWiggle(
+        "local",
+        lambda dx, dy: MapToMouseExFunctor._mouse_controller.set_absolute_motion(dx, dy)
+    )
+    _wiggle_remote = MouseWiggle(
+        "remote",
+        lambda dx, dy: input_devices.remote_client.send_mouse_motion(dx, dy)
+    )
     _mouse_controller = None
 
 
@@ -532,6 +599,9 @@ class MapToMouseExFunctor(gremlin.base_profile.AbstractFunctor):
         self.input_type = action.input_type
         self.exec_on_release = action.exec_on_release
         self.action_mode = action.action_mode
+
+    def profile_stop(self):
+        self._wiggle_stop(is_local=True, is_remote=True)
     
 
     def process_event(self, event, value):
@@ -708,84 +778,19 @@ class MapToMouseExFunctor(gremlin.base_profile.AbstractFunctor):
 
 
     def _wiggle_start(self, is_local = False, is_remote = False):
-        ''' starts the wiggle thread, local or remote '''
-
-        if is_local and not MapToMouseExFunctor._wiggle_local_thread:
-            syslog.debug("Wiggle start local requested...")
-            MapToMouseExFunctor._wiggle_local_stop_requested = False
-            MapToMouseExFunctor._wiggle_local_thread = threading.Thread(target=MapToMouseExFunctor._wiggle_local)
-            MapToMouseExFunctor._wiggle_local_thread.start()
-
-        if is_remote and not MapToMouseExFunctor._wiggle_remote_thread:
-            syslog.debug("Wiggle start remote requested...")
-            MapToMouseExFunctor._wiggle_remote_stop_requested = False
-            MapToMouseExFunctor._wiggle_remote_thread = threading.Thread(target=MapToMouseExFunctor._wiggle_remote)
-            MapToMouseExFunctor._wiggle_remote_thread.start()
+        ''' starts wiggling, local or remote '''
+        if is_local:
+            MapToMouseExFunctor._wiggle_local.start()
+        if is_remote:
+            MapToMouseExFunctor._wiggle_remote.start()
 
     def _wiggle_stop(self, is_local = False, is_remote = False):
-        ''' stops the wiggle thread, local or remote '''
-
-        if is_local and MapToMouseExFunctor._wiggle_local_thread:
-            syslog.debug("Wiggle stop local requested...")
-            MapToMouseExFunctor._wiggle_local_stop_requested = True
-            MapToMouseExFunctor._wiggle_local_thread.join()
-            syslog.debug("Wiggle thread local exited...")
-            MapToMouseExFunctor._wiggle_local_thread = None
-
-        if is_remote and MapToMouseExFunctor._wiggle_remote_thread:
-            syslog.debug("Wiggle stop local requested...")
-            MapToMouseExFunctor._wiggle_remote_stop_requested = True
-            MapToMouseExFunctor._wiggle_remote_thread.join()
-            syslog.debug("Wiggle thread remote exited...")
-            MapToMouseExFunctor._wiggle_remote_thread = None
-
-    @staticmethod
-    def _wiggle_local():
-        ''' wiggles the mouse '''
-        syslog.debug("Wiggle local start...")
-        msg = "local wiggle mode on"
-        input_devices.remote_state.say(msg)
-
-        t_wait = time.time()
-        while not MapToMouseExFunctor._wiggle_local_stop_requested:
-            if time.time() >= t_wait:
-                syslog.debug("wiggling local...")
-                MapToMouseExFunctor._mouse_controller.set_absolute_motion(1, 1)
-                time.sleep(1)
-                MapToMouseExFunctor._mouse_controller.set_absolute_motion(-1, -1)
-                time.sleep(0.5)
-                MapToMouseExFunctor._mouse_controller.set_absolute_motion(0, 0)
-                t_wait = time.time() + random.uniform(10,40)
-            time.sleep(0.5)
-            
-        syslog.debug("Wiggle local stop...")
-        input_devices.remote_state.say("local wiggle mode off")
-
-
-
-    @staticmethod
-    def _wiggle_remote():
-        ''' wiggles the mouse - remote clients'''
-        syslog.debug("Wiggle remote start...")
-
-        msg = "remote wiggle mode on"
-        input_devices.remote_state.say(msg)
-
-        t_wait = time.time()
-        while not MapToMouseExFunctor._wiggle_remote_stop_requested:
-            if time.time() >= t_wait:
-                syslog.debug("wiggling remote...")
-                input_devices.remote_client.send_mouse_motion(1, 1)
-                time.sleep(1)
-                input_devices.remote_client.send_mouse_motion(-1, -1)
-                time.sleep(0.5)
-                input_devices.remote_client.send_mouse_motion(0,0)
-                t_wait = time.time() + random.uniform(10,40)
-            time.sleep(0.5)
-            
-        syslog.debug("Wiggle remote stop...")
-        input_devices.remote_state.say("remote wiggle mode off")
-        
+        ''' stops wiggling, local or remote '''
+        if is_local:
+            MapToMouseExFunctor._wiggle_local.stop()
+        if is_remote:
+            MapToMouseExFunctor._wiggle_remote.stop()
+
 
 class MapToMouseEx(gremlin.base_profile.AbstractAction):
 
@@ -17,7 +17,6 @@
 
 from __future__ import annotations
 import logging
-import threading
 import time
 from lxml import etree as ElementTree
 
@@ -47,6 +46,8 @@ import gremlin.ui.input_item
 import gremlin.base_profile
 import gremlin.shared_state
 import gremlin.curve_handler
+import gremlin.scheduler
+import gremlin.tick
 
 
 
@@ -955,11 +956,12 @@ class VJoyWidget(gremlin.ui.input_item.AbstractActionWidget):
     QtCore.Slot()
     def _curve_button_cb(self):
         if not self.action_data.curve_data:
-            curve_data = gremlin.curve_handler.AxisCurveData()
+            curve_data = gremlin.curve_handler.AxisCurveData(self.action_data)
             curve_data.curve_update()
             self.action_data.curve_data = curve_data
             
         dialog = gremlin.curve_handler.AxisCurveDialog(self.action_data.curve_data)
+        dialog.changed.connect(self.action_data.mark_modified)
         util.centerDialog(dialog, dialog.width(), dialog.height())
         self.curve_update_handler = dialog.curve_update_handler
         self._update_axis_widget(self._current_input_axis())
@@ -2032,17 +2034,18 @@ class VJoyRemapFunctor(gremlin.base_classes.AbstractFunctor):
         self.paired = action_data.paired
 
         self.needs_auto_release = self._check_for_auto_release(action_data)
-        self.thread_running = False
-        self.should_stop_thread = False
-        self.thread_last_update = time.time()
-        self.thread = None
-        self.axis_delta_value = 0.0
+        self.should_stop_axis = False
+        self.axis_last_update = time.time()
+        self._axis_tick = None # relative axis subscription to the shared tick
+        self._axis_device = None
+        self._axis_state = (True, False)
+        self.axis_delta_value = 0.0 # relative axis change per second
         self.axis_value = 0.0
         self.axis_start_value = action_data.axis_start_value
 
         self.remote_client = input_devices.remote_client
 
-        self.lock = threading.Lock()
+        self._pulse_task = None # scheduled release of the current pulse
 
         
     @property
@@ -2090,22 +2093,17 @@ class VJoyRemapFunctor(gremlin.base_classes.AbstractFunctor):
                     self.process_event(event, action_value)
 
 	
-    # async routine to pulse a button
-    def _fire_pulse(self, *args):
-
-        self.lock.acquire()
-        vjoy_device_id, vjoy_input_id, duration = args
-        # vjoy_device_id = args]
-        # vjoy_input_id = args[2]
-        # duration = args[3]
-
+    # pulses a button - the release runs on the shared scheduler
+    def _fire_pulse(self, vjoy_device_id, vjoy_input_id, duration):
         button = joystick_handling.VJoyProxy()[vjoy_device_id].button(vjoy_input_id)
         button.is_pressed = True
         self.remote_client.send_button(vjoy_device_id, vjoy_input_id, True)
-        time.sleep(duration)
+        self._pulse_task = gremlin.scheduler.Scheduler().schedule(duration, self._release_pulse, vjoy_device_id, vjoy_input_id)
+
+    def _release_pulse(self, vjoy_device_id, vjoy_input_id):
+        button = joystick_handling.VJoyProxy()[vjoy_device_id].button(vjoy_input_id)
         button.is_pressed = False
         self.remote_client.send_button(vjoy_device_id, vjoy_input_id, False)
-        self.lock.release()
 
     # def smooth(self, value, reverse = False, power = 3):
     #     '''
@@ -2196,15 +2194,13 @@ class VJoyRemapFunctor(gremlin.base_classes.AbstractFunctor):
                     self.remote_client.send_axis(self.vjoy_device_id, self.vjoy_input_id, value)
             else:
                 value = -target if self.reverse else target
-                self.should_stop_thread = abs(event.value) < 0.05
+                self.should_stop_axis = abs(event.value) < 0.05
+                # scaling is the change per 10 ms
                 self.axis_delta_value = \
-                    value * (self.axis_scaling / 1000.0)
-                self.thread_last_update = time.time()
-                if self.thread_running is False:
-                    if isinstance(self.thread, threading.Thread):
-                        self.thread.join()
-                    self.thread = threading.Thread(target=self.relative_axis_thread)
-                    self.thread.start()
+                    value * (self.axis_scaling / 10.0)
+                self.axis_last_update = time.time()
+                if self._axis_tick is None:
+                    self._start_relative_axis()
 
         elif self.input_type in VJoyWidget.input_type_buttons:
 
@@ -2270,8 +2266,8 @@ class VJoyRemapFunctor(gremlin.base_classes.AbstractFunctor):
                 
                 # pulse action
                 if fire_event:
-                    if not self.lock.locked():
-                        threading.Timer(0.01, self._fire_pulse, [self.vjoy_device_id, self.vjoy_input_id, self.pulse_delay/1000]).start()
+                    if self._pulse_task is None or not self._pulse_task.pending:
+                        self._fire_pulse(self.vjoy_device_id, self.vjoy_input_id, self.pulse_delay/1000)
             elif self.action_mode == VjoyAction.VJoyInvertAxis:
                 # invert the specified axis
                 if fire_event:
@@ -2315,37 +2311,50 @@ class VJoyRemapFunctor(gremlin.base_classes.AbstractFunctor):
 
         return True
 
-    def relative_axis_thread(self):
-        self.thread_running = True
-        vjoy_dev = joystick_handling.VJoyProxy()[self.vjoy_device_id]
-        self.axis_value = vjoy_dev.axis(self.vjoy_input_id).value
-        (is_local, is_remote) = input_devices.remote_state.state
-        while self.thread_running:
-            try:
-                # If the vjoy value has was changed from what we set it to
-                # in the last iteration, terminate the thread
-                change = vjoy_dev.axis(self.vjoy_input_id).value - self.axis_value
-                if abs(change) > 0.0001:
-                    self.thread_running = False
-                    self.should_stop_thread = True
-                    return
+    def profile_stop(self):
+        self._stop_relative_axis()
+
+    def _start_relative_axis(self):
+        ''' starts moving the relative axis on the shared tick '''
+        self._axis_device = joystick_handling.VJoyProxy()[self.vjoy_device_id]
+        self.axis_value = self._axis_device.axis(self.vjoy_input_id).value
+        self._axis_state = input_devices.remote_state.state
+        self._axis_tick = gremlin.tick.TickService().subscribe(self._relative_axis_tick)
+
+    def _stop_relative_axis(self):
+        ''' stops moving the relative axis '''
+        if self._axis_tick is not None:
+            self._axis_tick.cancel()
+            self._axis_tick = None
+
+    def _relative_axis_tick(self):
+        ''' applies one tick worth of relative axis change '''
+        (is_local, is_remote) = self._axis_state
+        vjoy_dev = self._axis_device
+        try:
+            # If the vjoy value has was changed from what we set it to
+            # in the last tick, stop updating the axis
+            change = vjoy_dev.axis(self.vjoy_input_id).value - self.axis_value
+            if abs(change) > 0.0001:
+                self.should_stop_axis = True
+                self._stop_relative_axis()
+                return
 
-                self.axis_value = max(
-                    -1.0,
-                    min(1.0, self.axis_value + self.axis_delta_value)
-                )
-                
-                if is_local:
-                    vjoy_dev.axis(self.vjoy_input_id).value = self.axis_value
-                if is_remote:
-                    self.remote_client.send_axis(self.vjoy_device_id, self.vjoy_input_id, self.axis_value)
+            self.axis_value = max(
+                -1.0,
+                min(1.0, self.axis_value + self.axis_delta_value * gremlin.tick.TickService().interval)
+            )
+
+            if is_local:
+                vjoy_dev.axis(self.vjoy_input_id).value = self.axis_value
+            if is_remote:
+                self.remote_client.send_axis(self.vjoy_device_id, self.vjoy_input_id, self.axis_value)
 
-                if self.should_stop_thread and \
-                        self.thread_last_update + 1.0 < time.time():
-                    self.thread_running = False
-                time.sleep(0.01)
-            except gremlin.error.VJoyError:
-                self.thread_running = False
+            if self.should_stop_axis and \
+                    self.axis_last_update + 1.0 < time.time():
+                self._stop_relative_axis()
+        except gremlin.error.VJoyError:
+            self._stop_relative_axis()
 
     def _check_for_auto_release(self, action):
         activation_condition = None
@@ -2786,7 +2795,7 @@ class VjoyRemap(gremlin.base_profile.AbstractAction):
             # curve data
             curve_node = util.get_xml_child(node,"response-curve")
             if curve_node is not None:
-                self.curve_data = gremlin.curve_handler.AxisCurveData()
+                self.curve_data = gremlin.curve_handler.AxisCurveData(self)
                 self.curve_data._parse_xml(curve_node)
                 self.curve_data.curve_update()
 
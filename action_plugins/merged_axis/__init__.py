@@ -390,6 +390,13 @@ class MergedAxisFunctor(gremlin.base_profile.AbstractContainerActionFunctor):
     def process_event(self, event, value):
         ''' do nothing because the container will not be called through the normal hierarchy '''
         return True
+
+    def _merged_inputs(self):
+        ''' returns the (device_guid, input_id) pairs of the merged axes '''
+        return (
+            (self.action_data.joy1_guid, self.action_data.joy1_input_id),
+            (self.action_data.joy2_guid, self.action_data.joy2_input_id)
+        )
     
     def _event_handler(self, event):
         ''' internal event on axis input - determine if we should fire an update or not '''
@@ -430,6 +437,8 @@ class MergedAxisFunctor(gremlin.base_profile.AbstractContainerActionFunctor):
             elif operation == gremlin.types.MergeAxisOperation.Average:
                 value = (joy1_value - joy2_value) / 2.0            
 
+            # the event is shared with other listeners
+            event = event.clone()
             event.raw_value = value
             shared_value = gremlin.actions.Value(value)
 
@@ -457,8 +466,10 @@ class MergedAxisFunctor(gremlin.base_profile.AbstractContainerActionFunctor):
         self._joy1_value = gremlin.joystick_handling.get_curved_axis(self.action_data.joy1_guid, self.action_data.joy1_input_id)
         self._joy2_value = gremlin.joystick_handling.get_curved_axis(self.action_data.joy2_guid, self.action_data.joy2_input_id)
 
+        # only listen to the two merged axes
         el = gremlin.event_handler.EventListener()
-        el.joystick_event.connect(self._event_handler)
+        for device_guid, input_id in self._merged_inputs():
+            el.subscribe_joystick_input(device_guid, InputType.JoystickAxis, input_id, self._event_handler)
 
 
  
@@ -468,7 +479,8 @@ class MergedAxisFunctor(gremlin.base_profile.AbstractContainerActionFunctor):
 
 
         el = gremlin.event_handler.EventListener()
-        el.joystick_event.disconnect(self._event_handler)
+        for device_guid, input_id in self._merged_inputs():
+            el.unsubscribe_joystick_input(device_guid, InputType.JoystickAxis, input_id, self._event_handler)
 
         # clean up callback map
         self._callbacks.clear()
@@ -1064,6 +1064,18 @@ class DeadzoneWidget(QtWidgets.QWidget):
             self.right_upper.value()
         ]
 
+    def _set_deadzone(self, index, value):
+        """Stores a single deadzone value in the profile data.
+
+        A new list is assigned so the change is recorded by the profile.
+
+        :param index the index of the deadzone value to change
+        :param value the new value
+        """
+        deadzone = list(self.profile_data.deadzone)
+        deadzone[index] = value
+        self.profile_data.deadzone = deadzone
+
     def _update_left(self, handle, value):
         """Updates the left spin boxes.
 
@@ -1072,10 +1084,10 @@ class DeadzoneWidget(QtWidgets.QWidget):
         """
         if handle == DualSlider.LowerHandle:
             self.left_lower.setValue(value / self._normalizer)
-            self.profile_data.deadzone[0] = value / self._normalizer
+            self._set_deadzone(0, value / self._normalizer)
         elif handle == DualSlider.UpperHandle:
             self.left_upper.setValue(value / self._normalizer)
-            self.profile_data.deadzone[1] = value / self._normalizer
+            self._set_deadzone(1, value / self._normalizer)
 
     def _update_right(self, handle, value):
         """Updates the right spin boxes.
@@ -1085,10 +1097,10 @@ class DeadzoneWidget(QtWidgets.QWidget):
         """
         if handle == DualSlider.LowerHandle:
             self.right_lower.setValue(value / self._normalizer)
-            self.profile_data.deadzone[2] = value / self._normalizer
+            self._set_deadzone(2, value / self._normalizer)
         elif handle == DualSlider.UpperHandle:
             self.right_upper.setValue(value / self._normalizer)
-            self.profile_data.deadzone[3] = value / self._normalizer
+            self._set_deadzone(3, value / self._normalizer)
 
     def _update_from_spinner(self, value, handle, widget):
         """Updates the slider position.
@@ -1417,12 +1429,12 @@ class ResponseCurveFunctor(gremlin.base_profile.AbstractFunctor):
             action.deadzone[3]
         )
         if action.mapping_type == "cubic-spline":
-            self.response_fn = gremlin.spline.CubicSpline(action.control_points)
+            spline = gremlin.spline.CubicSpline(action.control_points)
         elif action.mapping_type == "cubic-bezier-spline":
-            self.response_fn = \
-                gremlin.spline.CubicBezierSpline(action.control_points)
+            spline = gremlin.spline.CubicBezierSpline(action.control_points)
         else:
             raise gremlin.error.GremlinError("Invalid curve type")
+        self.response_fn = gremlin.spline.LookupTableCurve(spline)
 
     def process_event(self, event, value):
         value.current = self.response_fn(self.deadzone_fn(value.current))
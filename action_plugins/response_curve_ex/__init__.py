@@ -61,6 +61,7 @@ class ResponseCurveExWidget(gremlin.ui.input_item.AbstractActionWidget):
     def _create_ui(self):
         """Creates the required UI elements."""
         self.curve_widget = gremlin.curve_handler.AxisCurveWidget(self.action_data.curve_data, self)
+        self.curve_widget.changed.connect(self.action_data.mark_modified)
         self.main_layout.addWidget(self.curve_widget)
 
         el = gremlin.event_handler.EventListener()
@@ -145,7 +146,7 @@ class ResponseCurveEx(gremlin.base_profile.AbstractAction):
         """
         super().__init__(parent)
         self.parent = parent
-        self.curve_data = gremlin.curve_handler.AxisCurveData()
+        self.curve_data = gremlin.curve_handler.AxisCurveData(self)
         self.curve_data.curve_update()
         self.show_input_axis = gremlin.config.Configuration().show_input_axis
         
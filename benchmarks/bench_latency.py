@@ -0,0 +1,395 @@
+# -*- coding: utf-8; -*-
+
+# Based on original work by (C) Lionel Ott -  (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+''' End to end input to output latency benchmark of the runtime.
+
+Each scenario profile in benchmarks/profiles is started through
+CodeRunner.start on top of the simulated DILL and vJoy backends. Synthetic
+input is played back at the requested rates and every vJoy output is paired
+with the input that caused it, giving the latency from the DILL callback to
+the vJoy write. Inputs and outputs are paired in order, so the scenarios
+are built such that every measured input produces exactly one measured
+output.
+
+Axis scenarios play back the given rate per axis, button and keyboard
+scenarios press at a tenth of that rate.
+
+Scenarios listed in LATENCY_BUDGET_MS have a p99 latency budget, with
+--check-budget the benchmark exits with a non zero status if a run exceeds
+its budget.
+
+Supported platforms: Windows and Linux, headless on both. Qt runs with the
+offscreen platform unless QT_QPA_PLATFORM is set. Neither DirectInput nor
+vJoy are used. Off Windows, installing the simulated backends also replaces
+the pywin32 modules and Windows DLLs with the no-op versions of
+gremlin.simulated_windows. This happens before the runtime is imported. The
+keyboard scenario feeds its keys straight to the event listener, so it does
+not need the Windows keyboard hook. PySide6, lxml and the other packages in
+requirements.txt are needed on both platforms.
+
+Usage: python benchmarks/bench_latency.py [--rates 250 500 1000]
+    [--duration 2.0] [--scenario NAME ...] [--output results.json]
+    [--check-budget]
+'''
+
+import argparse
+import collections
+import json
+import os
+import platform
+import sys
+import time
+sys.path.append(".")
+
+import dinput
+import dinput.simulated
+import vjoy.simulated
+
+
+PROFILE_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles")
+
+# GUID of the simulated input device referenced by the scenario profiles
+BENCH_DEVICE_GUID = "{B3E1A6C0-5A1D-11EF-8000-444553540000}"
+
+DEFAULT_RATES = (250, 500, 1000)
+
+# presses per second of button scenarios relative to the axis rate
+BUTTON_RATE_DIVIDER = 10
+
+# time without new outputs after which a run is considered drained
+DRAIN_IDLE = 0.2
+
+# p99 latency budget in milliseconds of scenarios, the keyboard path hands
+# keys to a worker thread which must not add a polling interval
+LATENCY_BUDGET_MS = {
+    "keyboard_latch": 2.0,
+}
+
+
+Scenario = collections.namedtuple("Scenario", ["name", "profile", "script", "is_trigger", "is_output"])
+
+
+class KeyboardDevice:
+    ''' feeds synthetic key events to the keyboard hook handler of the event listener '''
+
+    def __init__(self, event_listener):
+        self.event_listener = event_listener
+
+    def set_input(self, input_type, index, value):
+        ''' index is the (scan code, virtual code) of the key, value the pressed state '''
+        import gremlin.windows_event_hook
+        scan_code, virtual_code = index
+        self.event_listener._keyboard_handler(
+            gremlin.windows_event_hook.KeyEvent(virtual_code, scan_code, False, value, False)
+        )
+
+
+def axis_output(axis_id):
+    ''' matches writes to the given axis of vJoy device 1 '''
+    return lambda record: record.vjoy_id == 1 and record.input_type == "axis" and record.input_id == axis_id
+
+
+def button_press_output(button_id):
+    ''' matches presses of the given button of vJoy device 1 '''
+    return lambda record: record.vjoy_id == 1 and record.input_type == "button" \
+        and record.input_id == button_id and record.value
+
+
+def any_input(entry):
+    return True
+
+
+def press_input(entry):
+    return bool(entry.value)
+
+
+def build_scenarios(stick, keyboard):
+    ''' returns the scenarios by name '''
+    sim = dinput.simulated
+
+    def single_axis(rate, duration):
+        return sim.axis_sweep(stick, 1, rate, duration)
+
+    def gated_axis(rate, duration):
+        # stay between the outer gates so every sample lies in a range
+        return sim.axis_sweep(stick, 1, rate, duration, period=2.0, amplitude=0.8)
+
+    def merged_axes(rate, duration):
+        return sim.merge_scripts(
+            sim.axis_sweep(stick, 1, rate, duration),
+            sim.axis_sweep(stick, 2, rate, duration, period=1.3, start=0.5 / rate)
+        )
+
+    def button_presses(rate, duration):
+        return sim.button_presses(stick, 1, rate / BUTTON_RATE_DIVIDER, duration)
+
+    def keyboard_chord(rate, duration):
+        # hold left control and tap A, A triggers the latched input
+        press_rate = rate / BUTTON_RATE_DIVIDER
+        step = 0.25 / press_rate
+        control = (0x1D, 0xA2)
+        key_a = (0x1E, 0x41)
+        script = []
+        for i in range(int(press_rate * duration)):
+            t = i / press_rate
+            script.append(sim.ScriptedInput(t, keyboard, None, control, True))
+            script.append(sim.ScriptedInput(t + step, keyboard, None, key_a, True))
+            script.append(sim.ScriptedInput(t + 2 * step, keyboard, None, key_a, False))
+            script.append(sim.ScriptedInput(t + 3 * step, keyboard, None, control, False))
+        return script
+
+    def chord_trigger(entry):
+        return entry.value and entry.index == (0x1E, 0x41)
+
+    scenarios = [
+        Scenario("vjoy_remap", "vjoy_remap.xml", single_axis, any_input, axis_output(1)),
+        Scenario("response_curve", "response_curve.xml", single_axis, any_input, axis_output(1)),
+        Scenario("gated_axis", "gated_axis.xml", gated_axis, any_input, axis_output(1)),
+        Scenario("merged_axis", "merged_axis.xml", merged_axes, any_input, axis_output(1)),
+        Scenario("keyboard_latch", "keyboard_latch.xml", keyboard_chord, chord_trigger, button_press_output(1)),
+        Scenario("macro", "macro.xml", button_presses, press_input, button_press_output(1)),
+    ]
+    return {scenario.name: scenario for scenario in scenarios}
+
+
+def percentile(values, fraction):
+    ''' returns the given percentile of an ascending list of values '''
+    if not values:
+        return None
+    index = min(len(values) - 1, int(round(fraction * (len(values) - 1))))
+    return values[index]
+
+
+def pair_latencies(inputs, outputs):
+    ''' pairs each output with the oldest unpaired input preceding it
+
+    :param inputs ascending input timestamps
+    :param outputs ascending output timestamps
+    :return list of latencies in seconds
+    '''
+    latencies = []
+    pending = collections.deque(inputs)
+    for timestamp in outputs:
+        if not pending or pending[0] > timestamp:
+            # output not caused by a measured input
+            continue
+        latencies.append(timestamp - pending.popleft())
+    return latencies
+
+
+class LatencyBenchmark:
+    ''' sets up the simulated environment and runs the scenarios '''
+
+    def __init__(self):
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PySide6 import QtWidgets
+        self.app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+
+        self.vjoy_backend = vjoy.simulated.install(vjoy.simulated.SimulatedVJoy([
+            vjoy.simulated.SimulatedVJoyDevice(1, axis_count=8, button_count=32, hat_count=4)
+        ]))
+        self.stick = dinput.simulated.VirtualDevice(
+            "Bench Stick", axis_count=8, button_count=32, hat_count=1, guid=BENCH_DEVICE_GUID
+        )
+        self.dill_backend = dinput.simulated.install(dinput.simulated.SimulatedDill(
+            [self.stick] + self.vjoy_backend.dinput_devices()
+        ))
+
+        # imported once the simulated backends replaced missing Windows modules
+        import gremlin.code_runner
+        import gremlin.event_handler
+        import gremlin.joystick_handling
+        import gremlin.plugin_manager
+
+        gremlin.joystick_handling.joystick_devices_initialization()
+        gremlin.plugin_manager.ActionPlugins()
+        gremlin.plugin_manager.ContainerPlugins()
+
+        self.event_listener = gremlin.event_handler.EventListener()
+        # the listener registers its DILL callbacks from its own thread
+        self._wait(lambda: dinput.DILL.input_event_callback_fn is not None, 5.0)
+
+        class HeadlessCodeRunner(gremlin.code_runner.CodeRunner):
+            ''' code runner without a user interface to lock '''
+
+            def setUIState(self, enabled):
+                pass
+
+        self.runner = HeadlessCodeRunner()
+        self.scenarios = build_scenarios(self.stick, KeyboardDevice(self.event_listener))
+
+    def _wait(self, condition, timeout):
+        ''' runs the Qt event loop until the condition holds or the timeout expires '''
+        from PySide6 import QtCore
+        loop = QtCore.QEventLoop()
+        timer = QtCore.QTimer()
+        timer.setInterval(5)
+        timer.timeout.connect(lambda: condition() and loop.quit())
+        timer.start()
+        QtCore.QTimer.singleShot(int(timeout * 1000), loop.quit)
+        if not condition():
+            loop.exec()
+        timer.stop()
+        return condition()
+
+    def _start_profile(self, fname):
+        import gremlin.base_profile
+        import gremlin.event_handler
+        import gremlin.shared_state
+
+        profile = gremlin.base_profile.Profile()
+        gremlin.shared_state.current_profile = profile
+        profile.from_xml(fname)
+
+        eh = gremlin.event_handler.EventHandler()
+        eh.set_runtime_mode(profile.get_root_mode())
+        eh.set_edit_mode(profile.get_root_mode())
+
+        self.runner.start(
+            profile.build_inheritance_tree(),
+            profile.settings,
+            profile.get_start_mode(),
+            profile
+        )
+        if not self.event_listener.gremlin_active:
+            raise RuntimeError(f"Profile failed to start: {fname}")
+
+    def run(self, scenario, rate, duration):
+        ''' runs a scenario at the given rate and returns its measurements '''
+        self._start_profile(os.path.join(PROFILE_FOLDER, scenario.profile))
+        try:
+            script = scenario.script(rate, duration)
+            inputs = []
+
+            def listener(timestamp, entry):
+                if scenario.is_trigger(entry):
+                    inputs.append(timestamp)
+
+            # sleep instead of spinning so the CPU time is spent processing
+            generator = dinput.simulated.EventGenerator(script, listener=listener, spin=0.0)
+            records = self.vjoy_backend.records
+            self.vjoy_backend.clear()
+
+            cpu_start = time.process_time()
+            wall_start = time.perf_counter()
+            generator.start()
+
+            state = {"count": 0, "changed": time.perf_counter()}
+
+            def drained():
+                count = len(records)
+                now = time.perf_counter()
+                if count != state["count"]:
+                    state["count"] = count
+                    state["changed"] = now
+                return not generator.running and now - state["changed"] > DRAIN_IDLE
+
+            self._wait(drained, duration * 10 + 5.0)
+            generator.stop()
+            cpu_time = time.process_time() - cpu_start
+
+            recorded = list(records)
+            outputs = [record.timestamp for record in recorded if scenario.is_output(record)]
+            # from the start of the playback to the last input or output
+            end = wall_start
+            if inputs:
+                end = max(end, inputs[-1])
+            if recorded:
+                end = max(end, recorded[-1].timestamp)
+            wall_time = end - wall_start
+        finally:
+            self.runner.stop()
+
+        latencies = sorted(pair_latencies(inputs, outputs))
+        p99 = _ms(percentile(latencies, 0.99))
+        budget = LATENCY_BUDGET_MS.get(scenario.name)
+        return {
+            "scenario": scenario.name,
+            "rate": rate,
+            "duration": duration,
+            "inputs": generator.emitted,
+            "measured_inputs": len(inputs),
+            "outputs": len(outputs),
+            "paired": len(latencies),
+            "latency_ms": {
+                "p50": _ms(percentile(latencies, 0.50)),
+                "p99": p99,
+                "max": _ms(latencies[-1] if latencies else None),
+                "mean": _ms(sum(latencies) / len(latencies) if latencies else None),
+            },
+            "events_per_second": generator.emitted / wall_time if wall_time > 0 else None,
+            "cpu_us_per_event": cpu_time / generator.emitted * 1e6 if generator.emitted else None,
+            "budget_ms": budget,
+            "within_budget": None if budget is None or p99 is None else p99 <= budget,
+        }
+
+
+def _ms(value):
+    return None if value is None else round(value * 1000.0, 4)
+
+
+def run(scenarios = None, rates = DEFAULT_RATES, duration = 2.0):
+    ''' runs the benchmark and returns the JSON serializable results '''
+    benchmark = LatencyBenchmark()
+    names = scenarios or list(benchmark.scenarios.keys())
+    results = []
+    for name in names:
+        for rate in rates:
+            results.append(benchmark.run(benchmark.scenarios[name], rate, duration))
+    return {
+        "benchmark": "latency",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "End to end input to output latency benchmark")
+    parser.add_argument("--rates", type = int, nargs = "+", default = list(DEFAULT_RATES), help = "input rates in Hz")
+    parser.add_argument("--duration", type = float, default = 2.0, help = "seconds of input per run")
+    parser.add_argument("--scenario", nargs = "+", default = None, help = "scenarios to run, all by default")
+    parser.add_argument("--output", default = None, help = "file to write the JSON results to")
+    parser.add_argument("--check-budget", action = "store_true", help = "exit with status 1 if a scenario exceeds its p99 latency budget")
+    args = parser.parse_args()
+
+    data = run(args.scenario, args.rates, args.duration)
+    for entry in data["results"]:
+        latency = entry["latency_ms"]
+        print(
+            f"{entry['scenario']:>16} {entry['rate']:5d} Hz: "
+            f"p50 {latency['p50']} ms  p99 {latency['p99']} ms  max {latency['max']} ms  "
+            f"{entry['events_per_second'] or 0:9.1f} events/s  "
+            f"{entry['cpu_us_per_event'] or 0:8.1f} us cpu/event  "
+            f"({entry['paired']}/{entry['measured_inputs']} paired)"
+            + (" OVER BUDGET" if entry["within_budget"] is False else "")
+        )
+
+    text = json.dumps(data, indent = 2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.check_budget and any(entry["within_budget"] is False for entry in data["results"]):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# -*- coding: utf-8; -*-
+
+# Based on original work by (C) Lionel Ott -  (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+''' Microbenchmark of the per event cost of reading the verbose flags.
+
+Compares the configuration singleton lookups previously performed for every
+joystick event with reads from the runtime settings snapshot.
+
+Usage: python benchmarks/bench_runtime_settings.py
+'''
+
+import sys
+import timeit
+sys.path.append(".")
+
+import gremlin.config
+
+
+def per_event_configuration():
+    ''' flag reads as done per joystick event through the singleton '''
+    gremlin.config.Configuration().verbose_mode_joystick # listener
+    gremlin.config.Configuration().verbose_mode_inputs # process_event
+    gremlin.config.Configuration().verbose_mode_joystick # process_event
+    gremlin.config.Configuration().verbose_mode_details # matching callbacks
+
+
+def per_event_snapshot():
+    ''' flag reads as done per joystick event through the snapshot '''
+    gremlin.config.runtime_settings.verbose_mode_joystick
+    gremlin.config.runtime_settings.verbose_mode_inputs
+    gremlin.config.runtime_settings.verbose_mode_joystick
+    gremlin.config.runtime_settings.verbose_mode_details
+
+
+def run(iterations = 200000, repeat = 5):
+    ''' runs both variants and returns the best per event cost in nanoseconds '''
+    gremlin.config.Configuration().refresh_runtime_settings()
+    results = {}
+    for name, fn in (("configuration", per_event_configuration), ("snapshot", per_event_snapshot)):
+        best = min(timeit.repeat(fn, number = iterations, repeat = repeat))
+        results[name] = best / iterations * 1e9
+    return results
+
+
+if __name__ == "__main__":
+    results = run()
+    for name, ns in results.items():
+        print(f"{name:>14}: {ns:8.1f} ns/event")
+    print(f"{'speedup':>14}: {results['configuration'] / results['snapshot']:8.1f}x")
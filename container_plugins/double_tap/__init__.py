@@ -15,7 +15,6 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import copy
 import logging
 import threading
 import time
@@ -258,7 +257,7 @@ class DoubleTapContainerFunctor(gremlin.base_classes.AbstractFunctor):
                 
                 # Copy state when input is pressed
                 if value.current:
-                    self.value_press = copy.deepcopy(value)
+                    self.value_press = value.copy()
                     self.event_press = event.clone()
 
                 # Execute double tap logic
@@ -125,9 +125,35 @@ class _DeviceSummary(ctypes.Structure):
     ]
 
 
+# Interned GUID instances indexed by the raw bytes of their C structure
+_guid_intern = {}
+
+
 class GUID:
 
-    """Python GUID class."""
+    """Python GUID class.
+
+    Instances are interned, creating a GUID for a value that has been seen
+    before returns the existing instance. GUIDs are immutable and their
+    hash is computed once, so equality checks between the instances of a
+    device reduce to an identity test.
+    """
+
+    __slots__ = ("_ctypes_guid", "guid", "_key", "_hash")
+
+    def __new__(cls, guid):
+        """Returns the interned instance for the given GUID.
+
+        Parameters
+        ==========
+        guid : _GUID
+            Mapping of a C struct representing a device GUID
+        """
+        if isinstance(guid, _GUID):
+            instance = _guid_intern.get(bytes(guid))
+            if instance is not None:
+                return instance
+        return super().__new__(cls)
 
     def __init__(self, guid):
         """Creates a new instance.
@@ -138,6 +164,10 @@ class GUID:
             Mapping of a C struct representing a device GUID
         """
 
+        if hasattr(self, "_key"):
+            # interned instance that is already initialized
+            return
+
         if isinstance(guid, uuid.UUID):
             # convert to ctypes structure using the integer value if the class is given a regular python UUID
             guid = _GUID(guid.int)
@@ -152,6 +182,52 @@ class GUID:
             (guid.Data4[4] << 24) + (guid.Data4[5] << 16) +
             (guid.Data4[6] << 8) + guid.Data4[7]
         )
+        self._key = bytes(self._ctypes_guid)
+        self._hash = hash((
+            guid.Data1,
+            guid.Data2,
+            guid.Data3,
+            guid.Data4[0],
+            guid.Data4[1],
+            guid.Data4[2],
+            guid.Data4[3],
+            guid.Data4[4],
+            guid.Data4[5],
+            guid.Data4[6],
+            guid.Data4[7]
+        ))
+        _guid_intern.setdefault(self._key, self)
+
+    @staticmethod
+    def from_raw(guid):
+        """Returns the GUID instance for a C GUID structure.
+
+        Fast path for GUIDs reported by DILL, a known GUID is looked up by
+        the raw bytes of the structure without creating a new instance.
+
+        Parameters
+        ==========
+        guid : _GUID
+            Mapping of a C struct representing a device GUID
+
+        Returns
+        =======
+        GUID
+            The interned instance representing the GUID
+        """
+        instance = _guid_intern.get(bytes(guid))
+        if instance is None:
+            instance = GUID(guid)
+        return instance
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (GUID, (self._ctypes_guid,))
 
     
     @property
@@ -196,6 +272,10 @@ class GUID:
         bool
             True if the two GUIDs are equal, False otherwise
         """
+        if self is other:
+            return True
+        if isinstance(other, GUID):
+            return self._key == other._key
         return hash(self) == hash(other)
 
     def __lt__(self, other):
@@ -221,19 +301,7 @@ class GUID:
         int
             The has computed from this GUID
         """
-        return hash((
-            self._ctypes_guid.Data1,
-            self._ctypes_guid.Data2,
-            self._ctypes_guid.Data3,
-            self._ctypes_guid.Data4[0],
-            self._ctypes_guid.Data4[1],
-            self._ctypes_guid.Data4[2],
-            self._ctypes_guid.Data4[3],
-            self._ctypes_guid.Data4[4],
-            self._ctypes_guid.Data4[5],
-            self._ctypes_guid.Data4[6],
-            self._ctypes_guid.Data4[7]
-        ))
+        return self._hash
 
 
 GUID_Keyboard = GUID(_GUID_SysKeyboard)
@@ -264,8 +332,6 @@ class InputType(Enum):
             Enum value representing the correct InputType
         """
 
-        from gremlin.util import log_sys_error
-        
         if value == 1:
             return InputType.Axis
         elif value == 2:
@@ -273,6 +339,7 @@ class InputType(Enum):
         elif value == 3:
             return InputType.Hat
         
+        from gremlin.util import log_sys_error
         log_sys_error(f"Invalid DLL input type value received: {value:d}")
         return None
 
@@ -328,12 +395,12 @@ class InputEvent:
         
         input_type = InputType.from_ctype(data.input_type)
         if input_type:
-            self.device_guid = GUID(data.device_guid)
+            self.device_guid = GUID.from_raw(data.device_guid)
             self.input_type = input_type
             self.input_index = int(data.input_index)
             self.value = int(data.value)
         else:
-            self.device_guid = GUID.InvalidGuid()
+            self.device_guid = GUID_Invalid
             self.input_type = InputType.Button
             self.input_index = 0
             self.value = 0
@@ -378,7 +445,7 @@ class DeviceSummary:
         data : _DeviceSummary
             The data received from DILL and to be held by this instance
         """
-        self.device_guid = GUID(data.device_guid)
+        self.device_guid = GUID.from_raw(data.device_guid)
         self.device_id = str(self.device_guid)
         self.vendor_id = data.vendor_id
         self.product_id = data.product_id
@@ -542,8 +609,23 @@ class DILL:
 
             DILL.initalized = True
 
+    @staticmethod
+    def set_backend(backend):
+        """Replaces the DILL library with another implementation of its API.
 
+        Has to be called before init, the backend is used as is and no
+        library is loaded. This allows running without DirectInput, for
+        example with the simulated devices of dinput.simulated.
 
+        Parameters
+        ==========
+        backend : object
+            Object providing the functions of the DILL C API
+        """
+        DILL._dll = backend
+        DILL.version = getattr(backend, "version", None)
+        DILL._dll.init()
+        DILL.initalized = True
 
     @staticmethod
     def set_input_event_callback(callback):
@@ -721,6 +803,9 @@ class DILL:
     @staticmethod
     def initialize_capi():
         """Initializes the functions as class methods."""
+        if not isinstance(DILL._dll, ctypes.CDLL):
+            # replacement backends take Python values directly
+            return
         for fn_name, params in DILL.api_functions.items():
             dll_fn = getattr(DILL._dll, fn_name)
             if "arguments" in params:
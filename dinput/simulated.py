@@ -0,0 +1,563 @@
+# -*- coding: utf-8; -*-
+
+# Based on original work by (C) Lionel Ott -  (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""In-process simulation of the DILL library.
+
+SimulatedDill implements the C API of dill.dll on top of virtual devices and
+can be installed in place of the library with install(). Inputs are injected
+by changing the state of a VirtualDevice, either directly or through an
+EventGenerator playing back a script of timed inputs.
+"""
+
+import collections
+import math
+import threading
+import time
+import uuid
+
+from dinput import (
+    DILL,
+    _AxisMap,
+    _DeviceSummary,
+    _GUID,
+    _JoystickInputData,
+)
+
+
+# Input type values as reported by DILL
+AXIS = 1
+BUTTON = 2
+HAT = 3
+
+# Device change action values as reported by DILL
+DEVICE_CONNECTED = 1
+DEVICE_DISCONNECTED = 2
+
+
+def _raw_guid(value):
+    """Returns the C structure of a GUID.
+
+    Parameters
+    ==========
+    value : uuid.UUID
+        GUID to convert
+
+    Returns
+    =======
+    _GUID
+        C structure holding the GUID
+    """
+    raw = _GUID()
+    data = value.bytes
+    raw.Data1 = int.from_bytes(data[0:4], "big")
+    raw.Data2 = int.from_bytes(data[4:6], "big")
+    raw.Data3 = int.from_bytes(data[6:8], "big")
+    for i in range(8):
+        raw.Data4[i] = data[8 + i]
+    return raw
+
+
+class VirtualDevice:
+
+    """Simulated DirectInput device.
+
+    Axis values use the raw DILL range of [-32768, 32767], hats report -1
+    when centered and the direction in hundredths of a degree otherwise.
+    Input indices are one based like the ones reported by DILL.
+    """
+
+    def __init__(
+            self,
+            name,
+            axis_count=8,
+            button_count=32,
+            hat_count=1,
+            guid=None,
+            vendor_id=0x1209,
+            product_id=0x0001
+    ):
+        """Creates a new instance.
+
+        Parameters
+        ==========
+        name : str
+            Name reported for the device
+        axis_count : int
+            Number of axes, at most 8
+        button_count : int
+            Number of buttons
+        hat_count : int
+            Number of hats
+        guid : str
+            GUID of the device, a random one is used if None
+        vendor_id : int
+            USB vendor id reported for the device
+        product_id : int
+            USB product id reported for the device
+        """
+        self.name = name
+        self.axis_count = min(8, axis_count)
+        self.button_count = button_count
+        self.hat_count = hat_count
+        self.uuid = uuid.UUID(guid) if guid is not None else uuid.uuid4()
+        self.raw_guid = _raw_guid(self.uuid)
+        self.vendor_id = vendor_id
+        self.product_id = product_id
+        self.joystick_id = 0
+
+        self.axes = [0] * self.axis_count
+        self.buttons = [False] * self.button_count
+        self.hats = [-1] * self.hat_count
+
+        # backend the device is attached to
+        self.backend = None
+
+    @property
+    def guid(self):
+        """Returns the GUID of the device as a string.
+
+        Returns
+        =======
+        str
+            GUID in the format used by profiles
+        """
+        return f"{{{str(self.uuid).upper()}}}"
+
+    def summary(self):
+        """Returns the device information structure.
+
+        Returns
+        =======
+        _DeviceSummary
+            Structure as returned by the DILL device information functions
+        """
+        info = _DeviceSummary()
+        info.device_guid = self.raw_guid
+        info.vendor_id = self.vendor_id
+        info.product_id = self.product_id
+        info.joystick_id = self.joystick_id
+        info.name = self.name.encode("utf-8")
+        info.axis_count = self.axis_count
+        info.button_count = self.button_count
+        info.hat_count = self.hat_count
+        for i in range(8):
+            entry = _AxisMap()
+            if i < self.axis_count:
+                entry.linear_index = i + 1
+                entry.axis_index = i + 1
+            info.axis_map[i] = entry
+        return info
+
+    def set_axis(self, index, value):
+        """Moves an axis and reports the change.
+
+        Parameters
+        ==========
+        index : int
+            One based index of the axis
+        value : int
+            Raw axis value in [-32768, 32767]
+        """
+        value = max(-32768, min(32767, int(value)))
+        self.axes[index - 1] = value
+        self._report(AXIS, index, value)
+
+    def set_button(self, index, is_pressed):
+        """Presses or releases a button and reports the change.
+
+        Parameters
+        ==========
+        index : int
+            One based index of the button
+        is_pressed : bool
+            True if the button is pressed
+        """
+        self.buttons[index - 1] = bool(is_pressed)
+        self._report(BUTTON, index, 1 if is_pressed else 0)
+
+    def set_hat(self, index, value):
+        """Moves a hat and reports the change.
+
+        Parameters
+        ==========
+        index : int
+            One based index of the hat
+        value : int
+            -1 if centered, direction in hundredths of a degree otherwise
+        """
+        self.hats[index - 1] = int(value)
+        self._report(HAT, index, int(value))
+
+    def set_input(self, input_type, index, value):
+        """Changes any input and reports the change.
+
+        Parameters
+        ==========
+        input_type : int
+            DILL input type value, one of AXIS, BUTTON or HAT
+        index : int
+            One based index of the input
+        value : int
+            New raw value of the input
+        """
+        if input_type == AXIS:
+            self.set_axis(index, value)
+        elif input_type == BUTTON:
+            self.set_button(index, value)
+        elif input_type == HAT:
+            self.set_hat(index, value)
+
+    def _report(self, input_type, index, value):
+        if self.backend is not None:
+            self.backend.report_input(self, input_type, index, value)
+
+
+class SimulatedDill:
+
+    """Implementation of the DILL C API on top of virtual devices.
+
+    Input events are delivered synchronously on the thread changing the
+    device state, in the same way DILL calls back from its own thread.
+    """
+
+    version = "simulated"
+
+    def __init__(self, devices=()):
+        """Creates a new instance.
+
+        Parameters
+        ==========
+        devices : list
+            VirtualDevice instances present from the start
+        """
+        self._devices = []
+        self._device_lookup = {}
+        self._input_callback = None
+        self._device_change_callback = None
+        for device in devices:
+            self._attach(device)
+
+    @property
+    def devices(self):
+        """Returns the attached devices.
+
+        Returns
+        =======
+        list
+            VirtualDevice instances in the order they were added
+        """
+        return list(self._devices)
+
+    def add_device(self, device):
+        """Attaches a device and reports it as connected.
+
+        Parameters
+        ==========
+        device : VirtualDevice
+            The device to attach
+        """
+        self._attach(device)
+        if self._device_change_callback is not None:
+            self._device_change_callback(device.summary(), DEVICE_CONNECTED)
+
+    def remove_device(self, device):
+        """Detaches a device and reports it as disconnected.
+
+        Parameters
+        ==========
+        device : VirtualDevice
+            The device to detach
+        """
+        if device not in self._devices:
+            return
+        self._devices.remove(device)
+        del self._device_lookup[bytes(device.raw_guid)]
+        device.backend = None
+        if self._device_change_callback is not None:
+            self._device_change_callback(device.summary(), DEVICE_DISCONNECTED)
+
+    def report_input(self, device, input_type, index, value):
+        """Delivers an input event to the registered callback.
+
+        Parameters
+        ==========
+        device : VirtualDevice
+            Device the input belongs to
+        input_type : int
+            DILL input type value
+        index : int
+            One based index of the input
+        value : int
+            Raw value of the input
+        """
+        callback = self._input_callback
+        if callback is None:
+            return
+        data = _JoystickInputData()
+        data.device_guid = device.raw_guid
+        data.input_type = input_type
+        data.input_index = index
+        data.value = value
+        callback(data)
+
+    def _attach(self, device):
+        device.joystick_id = len(self._devices)
+        device.backend = self
+        self._devices.append(device)
+        self._device_lookup[bytes(device.raw_guid)] = device
+
+    def _device(self, guid):
+        return self._device_lookup.get(bytes(guid))
+
+    # DILL C API
+
+    def init(self):
+        pass
+
+    def set_input_event_callback(self, callback):
+        self._input_callback = callback
+
+    def set_device_change_callback(self, callback):
+        self._device_change_callback = callback
+
+    def get_device_count(self):
+        return len(self._devices)
+
+    def get_device_information_by_index(self, index):
+        return self._devices[index].summary()
+
+    def get_device_information_by_guid(self, guid):
+        device = self._device(guid)
+        return device.summary() if device is not None else _DeviceSummary()
+
+    def device_exists(self, guid):
+        return self._device(guid) is not None
+
+    def get_axis(self, guid, index):
+        device = self._device(guid)
+        return device.axes[index - 1] if device is not None else 0
+
+    def get_button(self, guid, index):
+        device = self._device(guid)
+        return device.buttons[index - 1] if device is not None else False
+
+    def get_hat(self, guid, index):
+        device = self._device(guid)
+        return device.hats[index - 1] if device is not None else -1
+
+
+ScriptedInput = collections.namedtuple(
+    "ScriptedInput",
+    ["time", "device", "input_type", "index", "value"]
+)
+ScriptedInput.__doc__ = "Input change applied at a time, in seconds, relative to the start of the playback."
+
+
+def axis_sweep(device, index, rate, duration, period=1.0, start=0.0, amplitude=1.0):
+    """Returns a script moving an axis along a sine wave.
+
+    Parameters
+    ==========
+    device : VirtualDevice
+        Device owning the axis
+    index : int
+        One based index of the axis
+    rate : float
+        Number of samples per second
+    duration : float
+        Length of the script in seconds
+    period : float
+        Time in seconds of one full sweep
+    start : float
+        Time of the first sample
+    amplitude : float
+        Deflection at the peak of the sweep in [0, 1]
+
+    Returns
+    =======
+    list
+        ScriptedInput entries
+    """
+    count = int(rate * duration)
+    return [
+        ScriptedInput(
+            start + i / rate,
+            device,
+            AXIS,
+            index,
+            int(32767 * amplitude * math.sin(2.0 * math.pi * (i / rate) / period))
+        )
+        for i in range(count)
+    ]
+
+
+def button_presses(device, index, rate, duration, hold=0.5, start=0.0):
+    """Returns a script repeatedly pressing and releasing a button.
+
+    Parameters
+    ==========
+    device : VirtualDevice
+        Device owning the button
+    index : int
+        One based index of the button
+    rate : float
+        Number of presses per second
+    duration : float
+        Length of the script in seconds
+    hold : float
+        Fraction of each press period the button is held down
+    start : float
+        Time of the first press
+
+    Returns
+    =======
+    list
+        ScriptedInput entries
+    """
+    script = []
+    for i in range(int(rate * duration)):
+        pressed_at = start + i / rate
+        script.append(ScriptedInput(pressed_at, device, BUTTON, index, True))
+        script.append(ScriptedInput(pressed_at + hold / rate, device, BUTTON, index, False))
+    return script
+
+
+def merge_scripts(*scripts):
+    """Combines several scripts into one ordered by time.
+
+    Returns
+    =======
+    list
+        ScriptedInput entries of all scripts sorted by time
+    """
+    merged = [entry for script in scripts for entry in script]
+    merged.sort(key=lambda entry: entry.time)
+    return merged
+
+
+class EventGenerator:
+
+    """Plays back a script of timed inputs on virtual devices.
+
+    The playback runs on its own thread which takes the role of the DILL
+    callback thread. Each input is applied when its time is reached, the
+    time at which it was applied is passed to the optional listener which
+    allows measuring the latency of the processing pipeline.
+    """
+
+    def __init__(self, script, listener=None, realtime=True, spin=0.002):
+        """Creates a new instance.
+
+        Parameters
+        ==========
+        script : list
+            ScriptedInput entries, sorted by time
+        listener : callable
+            Called with the time.perf_counter timestamp and the ScriptedInput
+            right before each input is applied
+        realtime : bool
+            If False inputs are applied back to back ignoring their times
+        spin : float
+            Time in seconds before each input during which the thread busy
+            waits instead of sleeping, trades CPU time for timing accuracy
+        """
+        self.script = script
+        self.listener = listener
+        self.realtime = realtime
+        self.spin = spin
+        self.emitted = 0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        """Returns True while the playback thread is active.
+
+        Returns
+        =======
+        bool
+            True if the script is still being played back
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Starts the playback."""
+        self._stop_event.clear()
+        self.emitted = 0
+        self._thread = threading.Thread(target=self.run, name="event-generator", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops the playback."""
+        self._stop_event.set()
+        self.join()
+
+    def join(self, timeout=None):
+        """Waits for the playback to complete.
+
+        Parameters
+        ==========
+        timeout : float
+            Maximum time in seconds to wait, None waits indefinitely
+        """
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def run(self):
+        """Plays back the script on the calling thread."""
+        origin = time.perf_counter()
+        listener = self.listener
+        spin = self.spin
+        for entry in self.script:
+            if self._stop_event.is_set():
+                break
+            if self.realtime:
+                delay = origin + entry.time - time.perf_counter()
+                if delay > spin:
+                    # sleep most of the wait and spin the remainder
+                    time.sleep(delay - spin)
+                while spin > 0 and time.perf_counter() < origin + entry.time:
+                    pass
+            if listener is not None:
+                listener(time.perf_counter(), entry)
+            entry.device.set_input(entry.input_type, entry.index, entry.value)
+            self.emitted += 1
+
+
+def install(backend=None):
+    """Replaces the DILL library with a simulated backend.
+
+    The Windows only modules missing on this system are replaced as well,
+    see gremlin.simulated_windows.
+
+    Parameters
+    ==========
+    backend : SimulatedDill
+        The backend to install, a new one without devices if None
+
+    Returns
+    =======
+    SimulatedDill
+        The installed backend
+    """
+    import gremlin.simulated_windows
+    gremlin.simulated_windows.install()
+
+    if backend is None:
+        backend = SimulatedDill()
+    DILL.set_backend(backend)
+    return backend
@@ -63,6 +63,8 @@ class Value:
 
     """Represents an input value, keeping track of raw and "seen" value."""
 
+    __slots__ = ("_raw", "_current", "_is_pressed")
+
     def __init__(self, raw, is_pressed = None):
         """Creates a new value and initializes it.
 
@@ -105,6 +107,21 @@ class Value:
     @is_pressed.setter
     def is_pressed(self, value: bool):
         self._is_pressed = value
+
+    def copy(self):
+        """Returns an independent copy of this value.
+
+        The held data are immutable scalars or tuples so copying the
+        references is sufficient, modifications of the copy through
+        current or is_pressed do not affect the original.
+
+        :return copy of this value
+        """
+        value = Value.__new__(Value)
+        value._raw = self._raw
+        value._current = self._current
+        value._is_pressed = self._is_pressed
+        return value
         
 class ActivationCondition:
 
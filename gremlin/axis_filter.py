@@ -0,0 +1,127 @@
+# -*- coding: utf-8; -*-
+
+# Based on original work by (C) Lionel Ott -  (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Per axis filtering of raw joystick samples before they become events."""
+
+import enum
+import threading
+import time
+
+
+class FilterResult(enum.Enum):
+
+    """Outcome of filtering a single axis sample."""
+
+    Accept = 1      # process the sample
+    Drop = 2        # discard the sample
+    Defer = 3       # discard for now, the newest value is delivered by flush
+
+
+class AxisFilter:
+
+    """Drops axis samples that carry no useful change.
+
+    A sample is dropped if it differs from the last accepted sample of the
+    axis by no more than epsilon raw units, which removes the jitter of
+    noisy sensors. The extreme raw values always pass so full deflection
+    is still reached.
+
+    If a maximum rate is set, samples arriving faster than that rate are
+    deferred instead. The newest deferred value is held back and has to be
+    delivered by calling flush once the interval has elapsed, so the axis
+    always settles on its final position.
+    """
+
+    raw_minimum = -32768
+    raw_maximum = 32767
+
+    def __init__(self, epsilon=0, max_rate=0):
+        """Creates a new instance.
+
+        :param epsilon largest change in raw units that is ignored, 0
+            disables the change threshold
+        :param max_rate maximum number of samples per second and axis, 0
+            disables rate limiting
+        """
+        self.epsilon = max(0, int(epsilon))
+        self.min_interval = 1.0 / max_rate if max_rate > 0 else 0.0
+
+        # (device_guid, input_index) -> last accepted raw value
+        self._last_value = {}
+        # (device_guid, input_index) -> time of the last accepted sample
+        self._last_time = {}
+        # (device_guid, input_index) -> value waiting for a flush
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        """Returns True if the filter can drop samples at all."""
+        return self.epsilon > 0 or self.min_interval > 0
+
+    def filter(self, device_guid, input_index, value, now=None):
+        """Decides whether a raw axis sample is processed.
+
+        :param device_guid guid of the device the sample originates from
+        :param input_index index of the axis on the device
+        :param value raw value of the sample
+        :param now current time as returned by time.perf_counter
+        :return tuple of the FilterResult and, when deferred, the delay in
+            seconds after which flush has to be called
+        """
+        key = (device_guid, input_index)
+        with self._lock:
+            last_value = self._last_value.get(key)
+            if self.epsilon > 0 and last_value is not None \
+                    and abs(value - last_value) <= self.epsilon \
+                    and value != self.raw_minimum and value != self.raw_maximum:
+                return FilterResult.Drop, 0.0
+
+            if self.min_interval > 0:
+                if now is None:
+                    now = time.perf_counter()
+                last_time = self._last_time.get(key)
+                if last_time is not None:
+                    remaining = last_time + self.min_interval - now
+                    if remaining > 0:
+                        if key in self._pending:
+                            # a flush is already scheduled, update its value
+                            self._pending[key] = value
+                            return FilterResult.Drop, 0.0
+                        self._pending[key] = value
+                        return FilterResult.Defer, remaining
+                self._last_time[key] = now
+
+            self._pending.pop(key, None)
+            self._last_value[key] = value
+            return FilterResult.Accept, 0.0
+
+    def flush(self, device_guid, input_index, now=None):
+        """Returns the deferred value of an axis, if any.
+
+        :param device_guid guid of the device
+        :param input_index index of the axis on the device
+        :param now current time as returned by time.perf_counter
+        :return the newest deferred raw value or None if there is none
+        """
+        key = (device_guid, input_index)
+        with self._lock:
+            value = self._pending.pop(key, None)
+            if value is not None:
+                self._last_value[key] = value
+                self._last_time[key] = time.perf_counter() if now is None else now
+            return value
@@ -0,0 +1,117 @@
+# -*- coding: utf-8; -*-
+
+# Based on original work by (C) Lionel Ott -  (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Fused transformation of raw axis values into calibrated and curved values."""
+
+
+class AxisTransform:
+
+    """Transformation pipeline of a single physical axis.
+
+    Converts the raw DirectInput value of an axis into its calibrated value
+    and the curved value of the input item associated with the axis. The
+    calibration is reduced to precomputed constants and the input deadzone
+    and response curve are evaluated through the single lookup table
+    provided by the curve data, so a sample runs through two calls only.
+
+    The curve is picked up from the input item on every call and recompiled
+    when the curve data revision changes, calibration changes require a new
+    instance.
+    """
+
+    __slots__ = (
+        "_minimum",
+        "_center",
+        "_maximum",
+        "_is_slider",
+        "_low_scale",
+        "_high_scale",
+        "_input_item",
+        "_curve_data",
+        "_curve_revision",
+        "_curve_fn",
+    )
+
+    def __init__(self, minimum=-32768, center=0, maximum=32767, input_item=None):
+        """Creates a new instance.
+
+        :param minimum the minimal value reported by the axis
+        :param center the value reported in the neutral position
+        :param maximum the maximal value reported by the axis
+        :param input_item input item holding the curve data of the axis
+        """
+        self._minimum = minimum
+        self._center = center
+        self._maximum = maximum
+
+        # mirrors gremlin.util.create_calibration_function
+        self._is_slider = minimum == center or maximum == center
+        if self._is_slider:
+            self._low_scale = 2.0 / float(maximum - minimum)
+            self._high_scale = self._low_scale
+        else:
+            self._low_scale = 1.0 / float(center - minimum)
+            self._high_scale = 1.0 / float(maximum - center)
+
+        self._input_item = input_item
+        self._curve_data = None
+        self._curve_revision = None
+        self._curve_fn = None
+
+    def calibrate(self, raw_value):
+        """Returns the calibrated value of a raw axis value.
+
+        :param raw_value the raw value reported by the device
+        :return calibrated value in [-1, 1]
+        """
+        if raw_value < self._minimum:
+            raw_value = self._minimum
+        elif raw_value > self._maximum:
+            raw_value = self._maximum
+
+        if self._is_slider:
+            return (raw_value - self._minimum) * self._low_scale - 1.0
+        if raw_value < self._center:
+            return (raw_value - self._center) * self._low_scale
+        return (raw_value - self._center) * self._high_scale
+
+    def curve(self, value):
+        """Returns the curved value of a calibrated axis value.
+
+        :param value calibrated value in [-1, 1]
+        :return value with the input deadzone and response curve applied
+        """
+        item = self._input_item
+        curve_data = item.curve_data if item is not None else None
+        if curve_data is None:
+            return value
+
+        if curve_data is not self._curve_data or \
+                curve_data.revision != self._curve_revision:
+            self._curve_data = curve_data
+            self._curve_revision = curve_data.revision
+            self._curve_fn = curve_data.transform_function()
+        return self._curve_fn(value)
+
+    def __call__(self, raw_value):
+        """Runs the full transformation of a raw axis value.
+
+        :param raw_value the raw value reported by the device
+        :return tuple of the calibrated and the curved value
+        """
+        value = self.calibrate(raw_value)
+        return value, self.curve(value)
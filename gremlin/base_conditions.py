@@ -294,10 +294,11 @@ class AbstractFunctor(metaclass=ABCMeta):
         """
         import gremlin.event_handler
         self._name = instance.name
+        self._instance = instance
         self.enabled = True
 
         el = gremlin.event_handler.EventListener()
-        el.profile_start.connect(self.profile_start)
+        el.profile_start.connect(self._profile_start_cb)
         el.profile_stop.connect(self.profile_stop)
 
         
@@ -314,6 +315,12 @@ class AbstractFunctor(metaclass=ABCMeta):
         """
         pass
 
+    def _profile_start_cb(self):
+        ''' profile start event - ignored by functors of a profile kept in the profile cache '''
+        import gremlin.base_profile
+        if not gremlin.base_profile.is_retained(self._instance):
+            self.profile_start()
+
     def profile_start(self):
         ''' called when the profile starts '''
         pass
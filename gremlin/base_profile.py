@@ -20,6 +20,7 @@ from abc import abstractmethod, ABCMeta
 from collections import namedtuple
 import codecs
 import collections
+import contextlib
 import os
 import copy
 import logging
@@ -79,7 +80,90 @@ def _get_input_item(parent):
         return parent
     return None
 
-class ProfileData(metaclass=ABCMeta):
+def _get_profile(item):
+    ''' gets the Profile an item of the profile tree belongs to if it exists '''
+    while item is not None and not isinstance(item, Profile):
+        parent = getattr(item, "parent", None)
+        item = parent if parent is not None else getattr(item, "_input_item", None)
+    return item
+
+def is_retained(item) -> bool:
+    ''' true if the item belongs to a profile kept by the profile cache '''
+    profile = _get_profile(item)
+    return profile is not None and profile.retained
+
+class _TrackedMeta(ABCMeta):
+
+    """Enables change tracking of an instance once it is fully constructed."""
+
+    def __call__(cls, *args, **kwargs):
+        instance = super().__call__(*args, **kwargs)
+        instance.__dict__["_tracking"] = True
+        return instance
+
+
+class ChangeTracker(metaclass=_TrackedMeta):
+
+    """Counts modifications of an item of the profile tree.
+
+    Every assignment of an attribute with a different value after the item
+    was constructed increments the generation of the item and of all items
+    above it up to the profile, so comparing the profile's generation with
+    the one recorded when it was last saved tells whether the profile
+    changed. In place modifications of lists and dictionaries are not seen
+    by the assignment hook and call mark_modified explicitly.
+    """
+
+    # attributes holding view or runtime state rather than profile data
+    _untracked_attributes = frozenset()
+
+    @property
+    def generation(self) -> int:
+        ''' number of modifications of this item and the items below it '''
+        return self.__dict__.get("_generation", 0)
+
+    def __setattr__(self, name, value):
+        d = self.__dict__
+        # properties are skipped, the attribute they assign is tracked
+        tracked = d.get("_tracking", False) \
+            and name not in self._untracked_attributes \
+            and not isinstance(getattr(type(self), name, None), property)
+        if tracked:
+            old_value = d.get(name, _unset)
+            try:
+                tracked = old_value is not value and bool(old_value != value)
+            except Exception:
+                pass
+        object.__setattr__(self, name, value)
+        if tracked:
+            self.mark_modified()
+
+    @contextlib.contextmanager
+    def untracked(self):
+        ''' suspends change tracking of this item, used when filling in defaults '''
+        d = self.__dict__
+        tracking = d.get("_tracking", False)
+        d["_tracking"] = False
+        try:
+            yield self
+        finally:
+            d["_tracking"] = tracking
+
+    def mark_modified(self):
+        ''' records a modification of this item '''
+        item = self
+        while isinstance(item, ChangeTracker):
+            d = item.__dict__
+            d["_generation"] = d.get("_generation", 0) + 1
+            parent = d.get("parent")
+            item = parent if parent is not None else d.get("_input_item")
+
+
+# marks an attribute that was not set before
+_unset = object()
+
+
+class ProfileData(ChangeTracker):
 
     """Base class for all items holding profile data.
 
@@ -318,6 +402,9 @@ class AbstractContainer(ProfileData):
     # default allowed input types = all
     input_types = InputType.to_list()
 
+    # view state of the container
+    _untracked_attributes = frozenset(["current_view_type"])
+
     def __init__(self, parent):
         """Creates a new instance.
 
@@ -400,6 +487,7 @@ class AbstractContainer(ProfileData):
             self.action_sets.append([])
             index = len(self.action_sets) - 1
         self.action_sets[index].append(action)
+        self.mark_modified()
 
         # Create activation condition data if needed
         self.create_or_delete_virtual_button()
@@ -599,8 +687,12 @@ class AbstractContainer(ProfileData):
 
 
 
-class Device:
+class Device(ChangeTracker):
     ''' device information '''
+
+    # connection state is detected, not part of the profile
+    _untracked_attributes = frozenset(["connected"])
+
     def __init__(self, parent):
         """Creates a new instance.
 
@@ -644,7 +736,8 @@ class Device:
             mode = self.modes[mode_name]
         else:
             mode = Mode(self)
-            mode.name = mode_name
+            with mode.untracked():
+                mode.name = mode_name
             self.modes[mode.name] = mode
 
         if device is not None:
@@ -697,10 +790,12 @@ class Device:
         return node
 
 
-class InputItem():
+class InputItem(ChangeTracker):
 
     """Represents a single input item such as a button or axis, containers and parameters/options associated with that input mapping """
 
+    _untracked_attributes = frozenset(["_selected"])
+
     def __init__(self, parent = None):
         """Creates a new InputItem instance.
 
@@ -791,9 +886,11 @@ class InputItem():
 
     def add_container(self, container):
         self._containers.append(container)
+        self.mark_modified()
 
     def remove_container(self, container):
         self._containers.remove(container)
+        self.mark_modified()
 
     def get_containers(self):
         return self._containers
@@ -949,7 +1046,7 @@ class InputItem():
             # check for curve data
             for child in node:
                 if child.tag == "response-curve":
-                    self.curve_data = gremlin.curve_handler.AxisCurveData()
+                    self.curve_data = gremlin.curve_handler.AxisCurveData(self)
                     self.curve_data._parse_xml(child)
                     break
 
@@ -1126,6 +1223,9 @@ class AbstractAction(ProfileData):
     # allow all input types by default
     input_types = InputType.to_list()
 
+    # runtime state of the action
+    _untracked_attributes = frozenset(["_enabled"])
+
     def __init__(self, parent):
         """Creates a new instance.
 
@@ -1140,17 +1240,24 @@ class AbstractAction(ProfileData):
         self._enabled = False # true if the action is enabled
         eh = gremlin.event_handler.EventListener()
         eh.action_created.emit(self)
-        eh.profile_unload.connect(self._cleanup)
+        eh.profile_unload.connect(self._profile_unload)
         eh.action_delete.connect(self._action_delete)
         
     def _action_delete(self, action_data):
         if self._id == action_data._id:
             self._cleanup()
 
+    def _profile_unload(self):
+        ''' called when a profile is unloaded '''
+        if is_retained(self):
+            # the profile is kept in the profile cache for reuse
+            return
+        self._cleanup()
+
     def _cleanup(self):
         ''' called when the action should clean itself up '''
         eh = gremlin.event_handler.EventListener()
-        eh.profile_unload.disconnect(self._cleanup)
+        eh.profile_unload.disconnect(self._profile_unload)
         eh.action_delete.disconnect(self._action_delete)
         
 
@@ -1381,7 +1488,7 @@ class AbstractContainerAction(AbstractAction):
         
 
 
-class Settings:
+class Settings(ChangeTracker):
 
     """Stores general profile specific settings."""
 
@@ -1510,13 +1617,19 @@ def extract_remap_actions(action_sets):
     return remap_actions
 
 
-class Profile():
+class Profile(ChangeTracker):
 
     """Stores the contents of an entire configuration profile.
 
     This includes configurations for each device's modes.
     """
 
+    # modes are persisted in the configuration, not the profile
+    _untracked_attributes = frozenset([
+        "_last_runtime_mode", "_last_edit_mode", "_saved_generation",
+        "retained", "load_timing"
+    ])
+
 
     def __init__(self, parent = None):
         """Constructor creating a new instance."""
@@ -1535,13 +1648,20 @@ class Profile():
         self._last_runtime_mode = "Default" # last active mode
         self._last_edit_mode = "Default"
         self._restore_last_mode = False # True if the profile should start with the last active mode (profile specific)
-        self._dirty = False # dirty flag - indicates the profile data was changed but not saved yet
+        self._saved_generation = 0 # generation of the profile when it was last loaded or saved
+        self.retained = False # true while the profile is held by the profile cache
+        self.load_timing = {} # seconds spent in each phase of from_xml
         self._force_numlock_off = True # if set, forces numlock to be off if it isn't so numpad keys report the correct scan codes
         
 
     @property
-    def dirty(self):
-        return self._dirty
+    def dirty(self) -> bool:
+        ''' true if the profile was changed since it was last loaded or saved '''
+        return self.generation != self._saved_generation
+
+    def mark_saved(self):
+        ''' records the current state of the profile as the saved state '''
+        self._saved_generation = self.generation
 
     @property
     def name(self):
@@ -1565,9 +1685,10 @@ class Profile():
         :param modes the list of modes to be present
         """
         new_device = Device(self)
-        new_device.name = device.name
-        new_device.device_guid = device.device_guid
-        new_device.type = DeviceType.Joystick
+        with new_device.untracked():
+            new_device.name = device.name
+            new_device.device_guid = device.device_guid
+            new_device.type = DeviceType.Joystick
         self.devices[device.device_guid] = new_device
 
         for mode in modes:
@@ -1776,6 +1897,7 @@ class Profile():
         # Remove the mode from the profile
         for device in self.devices.values():
             del device.modes[name]
+            device.mark_modified()
 
         eh = gremlin.event_handler.EventListener()
         eh.modes_changed.emit()
@@ -1879,17 +2001,22 @@ class Profile():
         """Parses the global XML document into the profile data structure.
 
         :param fname the path to the XML file to parse
+        :return True if the profile was converted from an older version
         """
-        # Check for outdated profile structure and warn user / convert
+        start_time = time.perf_counter()
+        tree = ElementTree.parse(fname)
+        root = tree.getroot()
+        parse_time = time.perf_counter()
+
+        # Check for outdated profile structure and warn user / convert, the
+        # conversion works on the tree parsed above
         profile_converter = gremlin.profile.ProfileConverter()
         profile_was_updated = False
-        if not profile_converter.is_current(fname):
+        if not profile_converter.is_current_root(root):
             logging.getLogger("system").warning("Outdated profile, converting")
-            profile_converter.convert_profile(fname)
+            root = profile_converter.convert_profile(fname, tree)
             profile_was_updated = True
-
-        tree = ElementTree.parse(fname)
-        root = tree.getroot()
+        convert_time = time.perf_counter()
 
         self._start_mode = None
         if "start_mode" in root.attrib:
@@ -1981,6 +2108,18 @@ class Profile():
         config = gremlin.config.Configuration()
         config.ensure_profile(self)
 
+        end_time = time.perf_counter()
+        self.load_timing = {
+            "parse": parse_time - start_time,
+            "convert": convert_time - parse_time,
+            "model": end_time - convert_time,
+        }
+        logging.getLogger("system").info(
+            f"Profile: loaded {name} in {(end_time - start_time) * 1000:.1f} ms"
+            f" (parse {self.load_timing['parse'] * 1000:.1f} ms,"
+            f" convert {self.load_timing['convert'] * 1000:.1f} ms,"
+            f" model {self.load_timing['model'] * 1000:.1f} ms)"
+        )
 
         return profile_was_updated
     
@@ -2070,9 +2209,10 @@ class Profile():
             if device_guid not in self.vjoy_devices:
                 # Create the device
                 device = Device(self)
-                device.name = device_name
-                device.device_guid = device_guid
-                device.type = DeviceType.VJoy
+                with device.untracked():
+                    device.name = device_name
+                    device.device_guid = device_guid
+                    device.type = DeviceType.VJoy
                 self.vjoy_devices[device_guid] = device
             return self.vjoy_devices[device_guid]
 
@@ -2080,11 +2220,12 @@ class Profile():
             if device_guid not in self.devices:
                 # Create the device
                 device = Device(self)
-                device.name = device_name
-                device.device_guid = device_guid
+                with device.untracked():
+                    device.name = device_name
+                    device.device_guid = device_guid
 
-                # Set the correct device type
-                device.type = device_type
+                    # Set the correct device type
+                    device.type = device_type
                 self.devices[device_guid] = device
             return self.devices[device_guid]
 
@@ -2205,11 +2346,11 @@ class Profile():
 
         assert self._profile_fname,"File name is not set"
         self.to_xml(self._profile_fname)
-        self._dirty = False
+        self.mark_saved()
 
         
 
-class Mode:
+class Mode(ChangeTracker):
 
     """Represents the configuration of the mode of a single device."""
 
@@ -2296,6 +2437,7 @@ class Mode:
         """
         if input_id in self.config[input_type]:
             del self.config[input_type][input_id]
+            self.mark_modified()
 
     def get_data(self, input_type, input_id):
         """Returns the configuration data associated with the provided
@@ -2310,9 +2452,11 @@ class Mode:
         assert(input_type in self.config)
 
         if input_id not in self.config[input_type]:
+            # an empty entry holds no mapping and is not a modification
             entry = InputItem(self)
-            entry.input_type = input_type
-            entry.input_id = input_id
+            with entry.untracked():
+                entry.input_type = input_type
+                entry.input_id = input_id
             self.config[input_type][input_id] = entry
         return self.config[input_type][input_id]
 
@@ -2325,6 +2469,7 @@ class Mode:
         """
         assert(input_type in self.config)
         self.config[input_type][input_id] = data
+        self.mark_modified()
 
     def has_data(self, input_type, input_id):
         """Returns True if data for the given input exists, False otherwise.
@@ -2343,7 +2488,7 @@ class Mode:
 
 
 
-class Plugin:
+class Plugin(ChangeTracker):
 
     """Custom module."""
 
@@ -2368,7 +2513,7 @@ class Plugin:
         return node
 
 
-class PluginInstance:
+class PluginInstance(ChangeTracker):
 
     """Instantiation of a custom module with its own set of parameters."""
 
@@ -2394,6 +2539,7 @@ class PluginInstance:
 
     def set_variable(self, name, variable):
         self.variables[name] = variable
+        self.mark_modified()
 
     def get_variable(self, name):
         if name not in self.variables:
@@ -2426,7 +2572,7 @@ class PluginInstance:
         return node
 
 
-class PluginVariable:
+class PluginVariable(ChangeTracker):
 
     """A single variable of a custom module instance."""
 
@@ -2823,6 +2969,94 @@ class ProfileMapItem():
     def __str__(self):
         return f"ProfileItem: process: {self.process}  profile: {self.profile}  default mode: {self.default_mode}  valid: {self.valid}"
 
+@SingletonDecorator
+class ProfileCache():
+
+    """Keeps recently used profiles loaded for process triggered switches.
+
+    A profile that is switched away from is kept if it has no unsaved
+    changes, and is handed back instead of parsing the file again as long
+    as the file was not modified in the meantime. The least recently used
+    profile is dropped once more than the configured number of profiles
+    are kept. The actions of a kept profile ignore the profile unload so
+    they remain usable, they clean up at the first unload after the
+    profile was dropped.
+    """
+
+    def __init__(self):
+        # normalized profile path -> (file stat key, profile)
+        self._profiles = collections.OrderedDict()
+
+    @staticmethod
+    def _key(fname):
+        return os.path.normcase(os.path.realpath(fname))
+
+    @staticmethod
+    def _stat(fname):
+        try:
+            st = os.stat(fname)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    @property
+    def capacity(self) -> int:
+        ''' number of profiles kept '''
+        return max(0, gremlin.config.Configuration().profile_cache_size)
+
+    def put(self, profile : Profile):
+        """Keeps a profile that is being unloaded.
+
+        :param profile the profile to keep, ignored if it has no file or has
+            unsaved changes
+        """
+        fname = profile.profile_file
+        if not fname or profile.dirty or self.capacity == 0:
+            return
+        stat = self._stat(fname)
+        if stat is None:
+            return
+        key = self._key(fname)
+        previous = self._profiles.pop(key, None)
+        if previous is not None and previous[1] is not profile:
+            previous[1].retained = False
+        profile.retained = True
+        self._profiles[key] = (stat, profile)
+        while len(self._profiles) > self.capacity:
+            _, (_, evicted) = self._profiles.popitem(last=False)
+            evicted.retained = False
+            logging.getLogger("system").info(
+                f"Profile cache: dropped {os.path.basename(evicted.profile_file)}"
+            )
+
+    def take(self, fname) -> Profile:
+        """Removes and returns a kept profile.
+
+        :param fname path of the profile file
+        :return the profile, None if it is not kept or its file changed
+        """
+        entry = self._profiles.pop(self._key(fname), None)
+        if entry is None:
+            return None
+        stat, profile = entry
+        profile.retained = False
+        if stat != self._stat(fname):
+            return None
+        return profile
+
+    def clear(self):
+        ''' drops all kept profiles '''
+        for _, profile in self._profiles.values():
+            profile.retained = False
+        self._profiles.clear()
+
+    def __contains__(self, fname):
+        return self._key(fname) in self._profiles
+
+    def __len__(self):
+        return len(self._profiles)
+
+
 @SingletonDecorator
 class ProfileMap():
     ''' manages the profile to process maps '''
@@ -44,6 +44,7 @@ import gremlin.macro
 import gremlin.input_devices
 import gremlin.user_plugin
 import gremlin.sendinput as sendinput
+import gremlin.tick
 
 
 syslog = logging.getLogger("system")
@@ -143,6 +144,14 @@ class CodeRunner:
 
         config = gremlin.config.Configuration()
 
+        # snapshot the settings read on the runtime event paths, this is
+        # refreshed when the configuration file changes
+        config.refresh_runtime_settings()
+
+        # apply the joystick event buffer and axis filter options
+        el.configure_event_ring()
+        el.configure_axis_filter()
+
         # store the startup mode in the UI so it can be restored later
         self._startup_profile = gremlin.shared_state.current_profile
         self._startup_mode = gremlin.shared_state.current_mode
@@ -342,6 +351,10 @@ class CodeRunner:
             # Use inheritance to build input action lookup table
             self.event_handler.build_event_lookup(inheritance_tree)
 
+            # Compile the flat joystick dispatch table for the active mode,
+            # this is rebuilt whenever the runtime mode changes
+            self.event_handler.compile_dispatch_table()
+
             # Set vJoy axis default values
             for vid, data in settings.vjoy_initial_values.items():
                 vjoy_proxy = gremlin.joystick_handling.VJoyProxy()[vid]
@@ -357,6 +370,9 @@ class CodeRunner:
             # tell callbacks they are starting
             el.profile_start.emit()
 
+            # build the fused calibration and curve transform of each axis
+            el.compile_axis_transforms()
+
 
 
             # Connect signals
@@ -458,6 +474,7 @@ class CodeRunner:
                         mode = start_mode
 
 
+            gremlin.tick.TickService().rate = config.tick_rate
             sendinput.MouseController().start()
 
 
@@ -15,12 +15,15 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import atexit
+import collections
 import json
 import logging
 import time
 import os
 import re
 import sys
+import threading
 
 from PySide6 import QtCore
 import gremlin.base_classes
@@ -34,10 +37,52 @@ import gremlin.util
 
 
 import gremlin.singleton_decorator
+
+
+# Immutable snapshot of the configuration values read on runtime hot paths
+RuntimeSettings = collections.namedtuple(
+    "RuntimeSettings",
+    [
+        "verbose",
+        "verbose_mode_keyboard",
+        "verbose_mode_joystick",
+        "verbose_mode_inputs",
+        "verbose_mode_mouse",
+        "verbose_mode_details",
+        "verbose_mode_simconnect",
+        "runtime_statistics",
+    ]
+)
+
+# Current runtime settings snapshot, replaced by Configuration.refresh_runtime_settings()
+runtime_settings = RuntimeSettings(
+    verbose=False,
+    verbose_mode_keyboard=False,
+    verbose_mode_joystick=False,
+    verbose_mode_inputs=False,
+    verbose_mode_mouse=False,
+    verbose_mode_details=False,
+    verbose_mode_simconnect=False,
+    runtime_statistics=False
+)
+
+
 @gremlin.singleton_decorator.SingletonDecorator
 class Configuration:
 
-    """Responsible for loading and saving configuration data."""
+    """Responsible for loading and saving configuration data.
+
+    Changes are written behind: save() only marks the configuration as
+    changed and a flush on a dedicated writer thread writes all changes
+    made within save_delay in one go, so the file I/O never runs on the
+    scheduler or UI threads. The file is written to a temporary file
+    which then replaces the configuration file, so it is never seen
+    partially written, and the file watcher ignores the writes made by
+    the flush.
+    """
+
+    # seconds between the first unsaved change and it being written to disk
+    save_delay = 0.5
 
     def get_config(sef):
         fname = os.path.join(gremlin.util.userprofile_path(), "config.json")
@@ -54,11 +99,20 @@ class Configuration:
         """Creates a new instance, loading the current configuration."""
 
         self._data = {} # gremlin items 
+        self._file_content = None # content of the configuration file as last read or written
         self._profile_data = {}  # profile specific options 
         self._profile_loaded = False
         self._profile_fname = None # current profile to use for the conig
         self._profile_config_fname = None # config file specific to the profile
 
+        self._dirty = False # true if there are changes not yet written to disk
+        self._save_due = None # time.monotonic() at which pending changes are written
+        self._save_lock = threading.Lock()
+        self._save_condition = threading.Condition(self._save_lock)
+        self._writer = None # thread writing pending changes
+        self._flush_lock = threading.Lock()
+        self._written_stat = None # (mtime, size) of the file as last written
+
         fname = self.get_config()
         if not os.path.isfile(fname):
             # create a stub - first time run
@@ -83,7 +137,10 @@ class Configuration:
             os.path.join(gremlin.util.userprofile_path(), "config.json")
         ])
         
-        self.watcher.fileChanged.connect(self.reload)
+        self.watcher.fileChanged.connect(self._config_changed_cb)
+
+        # write pending changes when the application exits
+        atexit.register(self.flush)
         
 
     
@@ -92,24 +149,51 @@ class Configuration:
     
 
 
+    def _config_changed_cb(self, path):
+        """Handles a change of the configuration file on disk.
+
+        :param path path of the changed file
+        """
+        # replacing the file ends the watch on some platforms
+        if os.path.isfile(path) and path not in self.watcher.files():
+            self.watcher.addPath(path)
+        self.reload()
+
     def reload(self):
         """Loads the configuration file's content."""
-        if self._last_reload is not None and \
-                time.time() - self._last_reload < 1:
-            return
-
         fname = self.get_config()
+        content = None
+        if os.path.isfile(fname):
+            if self._last_reload is not None and self._dirty:
+                # reloading would drop the changes not written yet, which
+                # replace the file's content once written
+                logging.getLogger("system").warning(f"Config: {fname} changed while changes are pending - keeping current configuration")
+                return
+            if self._last_reload is not None and self._written_stat is not None:
+                stat = os.stat(fname)
+                if (stat.st_mtime_ns, stat.st_size) == self._written_stat:
+                    # notification of our own write
+                    return
+            with open(fname) as hdl:
+                content = hdl.read()
+            if self._last_reload is not None and content == self._file_content:
+                # file unchanged since the last read or write
+                return
+
         # Attempt to load the configuration file if this fails set
         # default empty values.
         load_successful = False
-        if os.path.isfile(fname):
-            with open(fname) as hdl:
-                try:
-                    decoder = json.JSONDecoder()
-                    self._data = decoder.decode(hdl.read())
-                    load_successful = True
-                except ValueError:
-                    pass
+        if content is not None:
+            try:
+                decoder = json.JSONDecoder()
+                self._data = decoder.decode(content)
+                self._file_content = content
+                load_successful = True
+            except ValueError:
+                if self._last_reload is not None:
+                    # partially written file - keep the current data
+                    logging.getLogger("system").warning(f"Config: unable to parse {fname} - keeping current configuration")
+                    return
         if not load_successful:
             self._data = {
                 "calibration": {},
@@ -126,6 +210,28 @@ class Configuration:
         # Save all data
         self._last_reload = time.time()
         self.save()
+        self.refresh_runtime_settings()
+
+    def refresh_runtime_settings(self):
+        """Rebuilds the runtime settings snapshot from the current values.
+
+        Runtime hot paths read gremlin.config.runtime_settings instead of
+        querying the configuration for every event.
+
+        :return the new runtime settings snapshot
+        """
+        global runtime_settings
+        runtime_settings = RuntimeSettings(
+            verbose=bool(self.verbose),
+            verbose_mode_keyboard=self.verbose_mode_keyboard,
+            verbose_mode_joystick=self.verbose_mode_joystick,
+            verbose_mode_inputs=self.verbose_mode_inputs,
+            verbose_mode_mouse=self.verbose_mode_mouse,
+            verbose_mode_details=self.verbose_mode_details,
+            verbose_mode_simconnect=self.verbose_mode_simconnect,
+            runtime_statistics=self.runtime_statistics
+        )
+        return runtime_settings
 
     def reload_profile(self):
         """Loads the profile's configuration file's content."""
@@ -158,14 +264,68 @@ class Configuration:
 
 
     def save(self):
-        """Writes the configuration file to disk."""
-        fname = self.get_config()
-        with open(fname, "w") as hdl:
+        """Marks the configuration as changed, it is written to disk shortly after."""
+        with self._save_lock:
+            self._dirty = True
+            if self._save_due is None:
+                self._save_due = time.monotonic() + self.save_delay
+                if self._writer is None:
+                    self._writer = threading.Thread(
+                        target=self._run_writer,
+                        name="config writer",
+                        daemon=True
+                    )
+                    self._writer.start()
+                self._save_condition.notify()
+
+    def _run_writer(self):
+        """Writes pending changes once they are save_delay old."""
+        while True:
+            with self._save_lock:
+                while self._save_due is None:
+                    self._save_condition.wait()
+                remaining = self._save_due - time.monotonic()
+                if remaining > 0:
+                    # woken early by a save or a flush, check again
+                    self._save_condition.wait(remaining)
+                    continue
+            self.flush()
+
+    def flush(self):
+        """Writes pending changes to the configuration file."""
+        with self._flush_lock:
+            with self._save_lock:
+                self._save_due = None
+                if not self._dirty:
+                    return
+                self._dirty = False
+
             encoder = json.JSONEncoder(
                 sort_keys=True,
                 indent=4
             )
-            hdl.write(encoder.encode(self._data))
+            try:
+                content = encoder.encode(self._data)
+            except RuntimeError:
+                # changed by another thread while encoding, try again later
+                self.save()
+                return
+
+            fname = self.get_config()
+            tmp_fname = fname + ".tmp"
+            # set before the file changes so the watcher sees our own content
+            self._file_content = content
+            try:
+                with open(tmp_fname, "w") as hdl:
+                    hdl.write(content)
+                os.replace(tmp_fname, fname)
+                stat = os.stat(fname)
+                self._written_stat = (stat.st_mtime_ns, stat.st_size)
+            except OSError as e:
+                logging.getLogger("system").error(f"Config: unable to write {fname}: {e}")
+                # keep the changes pending, the next save or the exit retries
+                with self._save_lock:
+                    self._dirty = True
 
 
     def save_profile(self):
@@ -715,6 +875,36 @@ class Configuration:
             self._data["server_port"] = value
             self.save()
 
+    @property
+    def remote_batch_interval(self):
+        ''' time in milliseconds remote joystick output is collected before it is sent as one datagram '''
+        return self._data.get("remote_batch_interval", 2)
+
+    @remote_batch_interval.setter
+    def remote_batch_interval(self, value):
+        self._data["remote_batch_interval"] = max(0, int(value))
+        self.save()
+
+    @property
+    def tick_rate(self):
+        ''' rate in Hz at which continuous outputs such as relative axes and mouse motion are updated '''
+        return self._data.get("tick_rate", 100)
+
+    @tick_rate.setter
+    def tick_rate(self, value):
+        self._data["tick_rate"] = max(1, min(1000, int(value)))
+        self.save()
+
+    @property
+    def profile_cache_size(self):
+        ''' number of process mapped profiles kept loaded for fast switching on process focus changes, 0 disables the cache '''
+        return self._data.get("profile_cache_size", 4)
+
+    @profile_cache_size.setter
+    def profile_cache_size(self, value):
+        self._data["profile_cache_size"] = max(0, int(value))
+        self.save()
+
     @property
     def mode_change_message(self):
         """Returns whether or not to show a windows notification on mode change.
@@ -872,6 +1062,77 @@ class Configuration:
         self._data["macro_axis_minimum_change_rate"] = value
         self.save()
 
+    @property
+    def curve_lookup_resolution(self):
+        ''' number of samples of the lookup table used to evaluate response curves at runtime '''
+        return self._data.get("curve_lookup_resolution", 2048)
+
+    @curve_lookup_resolution.setter
+    def curve_lookup_resolution(self, value):
+        self._data["curve_lookup_resolution"] = max(2, int(value))
+        self.save()
+
+    @property
+    def joystick_event_buffer(self):
+        ''' if set, joystick samples are handed to the event thread through a bounded ring buffer drained in batches '''
+        return self._data.get("joystick_event_buffer", False)
+
+    @joystick_event_buffer.setter
+    def joystick_event_buffer(self, value):
+        self._data["joystick_event_buffer"] = bool(value)
+        self.save()
+
+    @property
+    def joystick_event_buffer_size(self):
+        ''' maximum number of joystick samples held by the ring buffer '''
+        return self._data.get("joystick_event_buffer_size", 1024)
+
+    @joystick_event_buffer_size.setter
+    def joystick_event_buffer_size(self, value):
+        self._data["joystick_event_buffer_size"] = max(16, int(value))
+        self.save()
+
+    @property
+    def joystick_event_coalesce(self):
+        ''' if set, only the newest undrained sample of each axis is kept in the ring buffer '''
+        return self._data.get("joystick_event_coalesce", True)
+
+    @joystick_event_coalesce.setter
+    def joystick_event_coalesce(self, value):
+        self._data["joystick_event_coalesce"] = bool(value)
+        self.save()
+
+    @property
+    def axis_filter_epsilon(self):
+        ''' largest change of a raw axis value (-32768 to 32767) that is ignored at the source, 0 disables the filter '''
+        return self._data.get("axis_filter_epsilon", 0)
+
+    @axis_filter_epsilon.setter
+    def axis_filter_epsilon(self, value):
+        self._data["axis_filter_epsilon"] = max(0, int(value))
+        self.save()
+
+    @property
+    def axis_filter_max_rate(self):
+        ''' maximum number of samples per second processed for each axis, 0 disables the limit '''
+        return self._data.get("axis_filter_max_rate", 0)
+
+    @axis_filter_max_rate.setter
+    def axis_filter_max_rate(self, value):
+        self._data["axis_filter_max_rate"] = max(0, int(value))
+        self.save()
+
+    @property
+    def runtime_statistics(self):
+        ''' if set, call counts and latencies of the event processing are recorded '''
+        return self._data.get("runtime_statistics", False)
+
+    @runtime_statistics.setter
+    def runtime_statistics(self, value):
+        self._data["runtime_statistics"] = bool(value)
+        self.save()
+        self.refresh_runtime_settings()
+
     @property
     def macro_record_axis(self):
         return self._data.get("macro_record_axis", False)
@@ -983,6 +1244,7 @@ class Configuration:
     def verbose(self, value):
         self._data["verbose"] = value
         self.save()
+        self.refresh_runtime_settings()
 
     @property
     def verbose_mode(self):
@@ -1001,6 +1263,7 @@ class Configuration:
     def verbose_mode(self, value):
         self._data["verbose_mode"] = value
         self.save()
+        self.refresh_runtime_settings()
 
     def verbose_set_mode(self, mode, enabled):
         ''' enables the specified verbose mode '''
@@ -1214,11 +1214,15 @@ class CurveView(QtWidgets.QGraphicsScene):
         # Redraw response curve
         curve_fn = self.model.get_curve_function()
         if curve_fn:
+            # one sample every other pixel, evaluated in a single batch
+            positions = range(-int(g_scene_size), int(g_scene_size+1), 2)
+            table = gremlin.spline.LookupTableCurve(curve_fn, len(positions))
+            values = table.evaluate([x / g_scene_size for x in positions])
             path = QtGui.QPainterPath(
-                QtCore.QPointF(int(-g_scene_size),int(-g_scene_size*curve_fn(-1)))
+                QtCore.QPointF(int(-g_scene_size),int(-g_scene_size*values[0]))
             )
-            for x in range(-int(g_scene_size), int(g_scene_size+1), 2):
-                path.lineTo(x, -g_scene_size * curve_fn(x / g_scene_size))
+            for x, y in zip(positions, values):
+                path.lineTo(x, -g_scene_size * y)
             self.addPath(path, QtGui.QPen(QtGui.QColor("#8FBC8F"), 4))
 
             # update the tracking item
@@ -1660,6 +1664,8 @@ class DeadzoneWidget(QtWidgets.QWidget):
 class AxisCurveWidget(QtWidgets.QWidget):
     ''' response curve standalone widget '''
 
+    changed = QtCore.Signal() # indicates the curve data was edited
+
     def __init__(self, curve_data : AxisCurveData, parent=None):
         """Creates a new instance.
 
@@ -1854,6 +1860,7 @@ class AxisCurveWidget(QtWidgets.QWidget):
         
         # mode
         self.curve_model.set_symmetry_mode(self.action_data.symmetry_mode)
+        self._connect_model()
 
         self.container_curve_widget = QtWidgets.QFrame()
         self.container_curve_widget.setStyleSheet('.QFrame{background-color: #ffffff; border-radius: 10px;}')
@@ -2087,6 +2094,7 @@ class AxisCurveWidget(QtWidgets.QWidget):
             
         self.action_data.mapping_type = curve_type
         self.curve_model = AxisCurveData.model_map[curve_type](self.action_data)
+        self._connect_model()
 
         # Update curve settings UI
         if self.action_data.mapping_type == CurveType.Cubic:
@@ -2107,6 +2115,12 @@ class AxisCurveWidget(QtWidgets.QWidget):
         )
         self.curve_view = QtWidgets.QGraphicsView(self.curve_scene)
         self._configure_response_curve_view()
+        self.changed.emit()
+
+    def _connect_model(self):
+        ''' reports edits of the control points of the current model '''
+        self.curve_model.content_modified.connect(self.changed)
+        self.curve_model.content_added.connect(self.changed)
 
     @QtCore.Slot(bool)
     def _curve_symmetry_cb(self, checked):
@@ -2118,6 +2132,7 @@ class AxisCurveWidget(QtWidgets.QWidget):
             self.curve_model.set_symmetry_mode(SymmetryMode.NoSymmetry)
 
         self.curve_scene.redraw_scene()
+        self.changed.emit()
 
     @QtCore.Slot()
     def _curve_set_preset_cb(self):
@@ -2218,6 +2233,7 @@ class AxisCurveWidget(QtWidgets.QWidget):
         self.action_data.curve_update()
         self._update_ui()
         self.update_value(self.last_value)
+        self.changed.emit()
 
 
     def _handle_symmetry_cb(self, state):
@@ -2258,7 +2274,12 @@ class AxisCurveData():
         CurveType.Bezier : CubicBezierSplineModel
         }    
 
-    def __init__(self):
+    def __init__(self, parent = None):
+        ''' curve data
+
+        :param parent the profile item owning the curve, if any
+        '''
+        self.parent = parent
         self.deadzone = [-1, 0, 0, 1]
         self.sensitivity = 1.0
         self._mapping_type = CurveType.Cubic
@@ -2267,6 +2288,8 @@ class AxisCurveData():
         self.show_input_axis = gremlin.config.Configuration().show_input_axis
         self.deadzone_fn = None
         self.response_fn = None
+        self.transform_fn = None # fused deadzone and response curve
+        self.revision = 0 # incremented whenever the curve functions are rebuilt
 
         el = gremlin.event_handler.EventListener()
         el.profile_start.connect(self.profile_start)
@@ -2281,6 +2304,9 @@ class AxisCurveData():
     @QtCore.Slot()
     def profile_start(self):
         ''' called on profile start '''
+        if gremlin.base_profile.is_retained(self.parent):
+            # the curve belongs to a profile kept in the profile cache
+            return
         # setup the curve function for the output
         self.curve_update() 
 
@@ -2365,16 +2391,30 @@ class AxisCurveData():
         else:
             raise gremlin.error.GremlinError("Invalid curve type")
 
+        # sample deadzone and spline once so runtime evaluation is a single table lookup
+        deadzone_fn = self.deadzone_fn
+        response_fn = self.response_fn
+        self.transform_fn = gremlin.spline.LookupTableCurve(
+            lambda value: response_fn(deadzone_fn(value)),
+            gremlin.config.Configuration().curve_lookup_resolution
+        )
+        self.revision += 1
+
+    def transform_function(self):
+        ''' returns the fused deadzone and response curve function mapping -1 to +1 to the curved value '''
+        if self.transform_fn is None:
+            self.curve_update()
+        return self.transform_fn
+
     def curve_value(self, value : float, update : bool = False):
         ''' processes an input value -1 to +1 and outputs the curved value based on the current curve model '''
-        if update or self.deadzone_fn is None or self.response_fn is None:
+        if update or self.transform_fn is None:
             self.curve_update()
-        if self.deadzone_fn is not None:
-            value = self.deadzone_fn(value)
-        if self.response_fn is not None:
-            value = self.response_fn(value)
-        
-        return value
+        return self.transform_fn(value)
+
+    def curve_values(self, values) -> list:
+        ''' processes a sequence of input values -1 to +1 and returns the curved values, used for previews '''
+        return self.transform_function().evaluate(values)
         
 
 
@@ -2401,6 +2441,11 @@ class AxisCurveDialog(QtWidgets.QDialog):
     @property
     def curve_update_handler(self):
         return self.widget.update_value
+
+    @property
+    def changed(self):
+        ''' signal fired when the curve data is edited '''
+        return self.widget.changed
     
 
     def keyPressEvent(self, event):
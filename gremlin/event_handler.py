@@ -20,6 +20,7 @@ import inspect
 import logging
 import time
 import queue
+import threading
 from threading import Thread, Timer
 from typing import Callable
 
@@ -28,6 +29,12 @@ from typing import Callable
 
 import gremlin.joystick_handling
 import gremlin.threading
+from gremlin.axis_transform import AxisTransform
+from gremlin.axis_filter import AxisFilter, FilterResult
+from gremlin.event_ring import EventRing
+import gremlin.scheduler
+import gremlin.instrumentation
+import gremlin.key_chord
 
 from PySide6 import QtCore, QtWidgets
 
@@ -62,8 +69,28 @@ class Event:
 
 	The extended field is used for Keyboard events only to indicate
 	whether or not the key's scan code is extended one.
+
+	Events are created for every input sample so the attributes are
+	slotted to keep the per event allocation small.
 	"""
 
+	__slots__ = (
+		"event_type",
+		"identifier",
+		"device_guid",
+		"is_pressed",
+		"value",
+		"raw_value",
+		"curve_value",
+		"force_remote",
+		"action_id",
+		"data",
+		"is_axis",
+		"virtual_code",
+		"is_virtual",
+		"is_virtual_button",
+	)
+
 	def __init__(
 			self,
 			event_type,
@@ -109,12 +136,17 @@ class Event:
 		self.is_virtual_button = False # true if a virtual button
 
 	def clone(self):
-		"""Returns a clone of the event.
+		"""Returns a shallow clone of the event.
+
+		All event fields are immutable values with the exception of the
+		keyboard state held in data which is shared with the clone.
 
 		:return cloned copy of this event
 		"""
-		import copy
-		return copy.deepcopy(self)
+		event = Event.__new__(Event)
+		for name in Event.__slots__:
+			setattr(event, name, getattr(self, name))
+		return event
 
 
 	def __eq__(self, other):
@@ -229,6 +261,9 @@ class EventListener(QtCore.QObject):
 
 	# called when a process device change should be handled
 	_process_device_change = QtCore.Signal()
+
+	# called when the joystick event ring buffer has samples to drain
+	_event_ring_ready = QtCore.Signal()
 	
 	# Signal emitted when the icon needs to be refreshed
 	icon_changed = QtCore.Signal(DeviceChangeEvent)
@@ -289,9 +324,12 @@ class EventListener(QtCore.QObject):
 			logging.getLogger("system").warning("************ DEBUG MODE - MOUSE HOOKS ARE DISABLED ")
 			self.mouse_hook = None
 
-		# Calibration function for each axis of all devices
+		# Calibration limits (minimum, center, maximum) for each axis of all devices
 		self._calibrations = {}
 
+		# Fused calibration and curve transform for each axis, built on demand
+		self._axis_transforms = {}
+
 		# map of axis input items that could be curved
 		self._joystick_input_item_map = {}
 		
@@ -304,9 +342,19 @@ class EventListener(QtCore.QObject):
 
 		self._joystick_suspend_count = 0 # stack count for suspend joystick
 
-
-		# keyboard input handling buffer
-		self._keyboard_state = {}
+		# joystick event subscribers indexed by (device_guid, input_type, input_id)
+		self._joystick_subscriptions = {}
+		# direct connection so subscribers run in the emitting thread like any other plain callable connected to the signal
+		self.joystick_event.connect(
+			self._dispatch_joystick_subscriptions,
+			QtCore.Qt.ConnectionType.DirectConnection
+		)
+
+		# keyboard input handling buffer, the state of the keys is a bitset over gremlin.key_chord.KeyIndex
+		self._key_index = gremlin.key_chord.KeyIndex()
+		self._keyboard_state = 0
+		# the keyboard and mouse hooks update the state from their own threads
+		self._keyboard_state_lock = threading.Lock()
 		self._keyboard_queue = None
 		self._key_listener_started = False # true if the key listener is started
 		self.gremlin_active = False
@@ -318,6 +366,15 @@ class EventListener(QtCore.QObject):
 		# internal event on process change
 		self._process_device_change.connect(self._process_device_change_cb)
 
+		# optional ring buffer between the DILL callback and the event thread
+		self._event_ring = None
+		self._event_ring_ready.connect(self._drain_event_ring)
+		self.configure_event_ring()
+
+		# optional change threshold and rate limit applied to raw axis samples
+		self._axis_filter = None
+		self.configure_axis_filter()
+
 		Thread(target=self._run).start()
 
 	def registerInput(self, item):
@@ -325,8 +382,50 @@ class EventListener(QtCore.QObject):
 		if item.input_type == InputType.JoystickAxis:
 			key = (item.device_guid, item.input_id)
 			self._joystick_input_item_map[key] = item
+			self._axis_transforms.pop(key, None)
 		
 
+	def subscribe_joystick_input(self, device_guid, input_type, input_id, callback):
+		''' registers a callback for the joystick events of a single input
+
+		Unlike connecting to joystick_event, the callback only receives events
+		of the given input.
+
+		:param device_guid the device guid of the input
+		:param input_type the InputType of the input
+		:param input_id the id of the input on the device
+		:param callback callable taking the event as its only argument
+		'''
+		key = (device_guid, input_type, input_id)
+		callbacks = self._joystick_subscriptions.get(key, ())
+		if callback not in callbacks:
+			# replace rather than modify so a concurrent dispatch sees a consistent tuple
+			self._joystick_subscriptions[key] = callbacks + (callback,)
+
+	def unsubscribe_joystick_input(self, device_guid, input_type, input_id, callback):
+		''' removes a callback registered with subscribe_joystick_input
+
+		:param device_guid the device guid of the input
+		:param input_type the InputType of the input
+		:param input_id the id of the input on the device
+		:param callback the callback to remove
+		'''
+		key = (device_guid, input_type, input_id)
+		callbacks = tuple(cb for cb in self._joystick_subscriptions.get(key, ()) if cb != callback)
+		if callbacks:
+			self._joystick_subscriptions[key] = callbacks
+		else:
+			self._joystick_subscriptions.pop(key, None)
+
+	def _dispatch_joystick_subscriptions(self, event):
+		''' forwards a joystick event to the subscribers of its input '''
+		callbacks = self._joystick_subscriptions.get(
+			(event.device_guid, event.event_type, event.identifier)
+		)
+		if callbacks:
+			for callback in callbacks:
+				callback(event)
+
 	def push_joystick(self):
 		self._joystick_suspend_count += 1
 
@@ -355,10 +454,9 @@ class EventListener(QtCore.QObject):
 
 
 
-	def _process_queue(self):
-		''' processes an item the keyboard buffer queue '''
-		item, is_pressed = self._keyboard_queue.get()
-		verbose = gremlin.config.Configuration().verbose_mode_keyboard
+	def _process_key(self, item, is_pressed):
+		''' processes an item of the keyboard buffer queue '''
+		verbose = gremlin.config.runtime_settings.verbose_mode_keyboard
 		is_error = False
 		if verbose:
 			logging.getLogger("system").info(f"process_queue: found item: {item} is presseD: {is_pressed}")
@@ -366,8 +464,8 @@ class EventListener(QtCore.QObject):
 		if isinstance(item, int):
 			virtual_code = item
 			key = gremlin.keyboard.KeyMap.find_virtual(virtual_code)
-			self._keyboard_buffer[virtual_code] = is_pressed
 			key_id = key.index_tuple()
+			self._keyboard_buffer = gremlin.key_chord.update(self._keyboard_buffer, self._key_index.bit(key_id), is_pressed)
 			
 		else:
 			
@@ -379,7 +477,7 @@ class EventListener(QtCore.QObject):
 				is_error = True
 			else:				
 				virtual_code = key.virtual_code
-				self._keyboard_buffer[key_id] = is_pressed
+				self._keyboard_buffer = gremlin.key_chord.update(self._keyboard_buffer, self._key_index.bit(key_id), is_pressed)
 
 		if not is_error:
 			if verbose:
@@ -395,29 +493,40 @@ class EventListener(QtCore.QObject):
 				data = self._keyboard_buffer
 			))
 
-		# process the events
-		QtWidgets.QApplication.processEvents()
-		self._keyboard_queue.task_done()
-
 
 	def _keyboard_processor(self):
-		''' runs as a thread to process inbound keyboard events using a queue '''
+		''' runs as a thread to process inbound keyboard events using a queue
+
+		The thread blocks on the queue until a key arrives, then drains every
+		key queued in the meantime before processing pending events once per
+		batch. A None entry queued by stop_key_listener ends the thread after
+		the keys queued before it have been processed.
+		'''
 
 		logging.getLogger("system").info("KBD: processing start")
-		self._keyboard_buffer = {}
+		self._keyboard_buffer = 0
 		self._key_listener_started = True
-		while not self._keyboard_thread.stopped():
-			if self._keyboard_queue.empty():
-				time.sleep(0.01)
-				continue
-			self._process_queue()
-
+		key_queue = self._keyboard_queue
+		running = True
+		while running:
+			entry = key_queue.get()
+			while True:
+				if entry is None:
+					running = False
+				else:
+					try:
+						self._process_key(*entry)
+					except Exception as ex:
+						logging.getLogger("system").error(f"KBD: error processing key {entry}: {ex}")
+				key_queue.task_done()
+				try:
+					entry = key_queue.get_nowait()
+				except queue.Empty:
+					break
+
+			# process the events
+			QtWidgets.QApplication.processEvents()
 
-		# done
-		# process any straglers
-		while not self._keyboard_queue.empty():
-			self._process_queue()
-		
 		logging.getLogger("system").info("KBD: processing stop")
 	
 
@@ -433,11 +542,16 @@ class EventListener(QtCore.QObject):
 		''' stops the key listener '''
 		if self._key_listener_started:
 			self._keyboard_thread.stop()
+			# wake up the processor, keys queued before this are still processed
+			self._keyboard_queue.put(None)
 			self._keyboard_thread.join()
 			# clear any remaining input queue items
-			while not self._keyboard_queue.empty():
-				self._keyboard_queue.get()
-			self._keyboard_queue.join()
+			while True:
+				try:
+					self._keyboard_queue.get_nowait()
+				except queue.Empty:
+					break
+				self._keyboard_queue.task_done()
 			self._key_listener_started = False
 
 		
@@ -466,16 +580,41 @@ class EventListener(QtCore.QObject):
 
 	def reload_calibrations(self):
 		"""Reloads the calibration data from the configuration file."""
-		from gremlin.ui.ui_util import create_calibration_function
 		cfg = config.Configuration()
 		for key in self._calibrations:
-			limits = cfg.get_calibration(key[0], key[1])
-			self._calibrations[key] = \
-				create_calibration_function(
-					limits[0],
-					limits[1],
-					limits[2]
-				)
+			self._calibrations[key] = tuple(cfg.get_calibration(key[0], key[1]))
+		self.compile_axis_transforms()
+
+	def compile_axis_transforms(self):
+		"""Rebuilds the fused transforms of all known axes.
+
+		Called on profile start and whenever calibration data changes.
+		"""
+		keys = set(self._calibrations.keys())
+		keys.update(self._joystick_input_item_map.keys())
+		transforms = {}
+		for device_guid, input_id in keys:
+			transforms[(device_guid, input_id)] = self._create_axis_transform(device_guid, input_id)
+		self._axis_transforms = transforms
+
+	def _create_axis_transform(self, device_guid, input_id):
+		''' creates the fused transform for the given axis '''
+		key = (device_guid, input_id)
+		minimum, center, maximum = self._calibrations.get(key, (-32768, 0, 32767))
+		return AxisTransform(
+			minimum,
+			center,
+			maximum,
+			self._joystick_input_item_map.get(key)
+		)
+
+	def _axis_transform(self, device_guid, input_id):
+		''' returns the fused transform for the given axis '''
+		transform = self._axis_transforms.get((device_guid, input_id))
+		if transform is None:
+			transform = self._create_axis_transform(device_guid, input_id)
+			self._axis_transforms[(device_guid, input_id)] = transform
+		return transform
 
 	def _run(self):
 		"""Starts the event loop."""
@@ -490,11 +629,35 @@ class EventListener(QtCore.QObject):
 			time.sleep(0.1)
 		logging.getLogger("system").info("DILL: input stop listen")
 
+	def configure_event_ring(self):
+		''' enables or disables the joystick event ring buffer based on the current configuration '''
+		cfg = gremlin.config.Configuration()
+		ring = self._event_ring
+		if cfg.joystick_event_buffer:
+			if ring is None or ring.capacity != cfg.joystick_event_buffer_size:
+				self._event_ring = EventRing(cfg.joystick_event_buffer_size, cfg.joystick_event_coalesce)
+			else:
+				ring.coalesce_axes = cfg.joystick_event_coalesce
+				ring = None
+		else:
+			self._event_ring = None
+
+		if ring is not None and ring is not self._event_ring:
+			# deliver anything still held by the previous buffer
+			self._emit_joystick_batch(ring.drain())
+
+	def configure_axis_filter(self):
+		''' sets up the raw axis sample filter based on the current configuration '''
+		cfg = gremlin.config.Configuration()
+		axis_filter = AxisFilter(cfg.axis_filter_epsilon, cfg.axis_filter_max_rate)
+		self._axis_filter = axis_filter if axis_filter.enabled else None
+
 	def _joystick_event_handler(self, data):
 		"""Callback for joystick events.
 
 		The handler converts the event data into a signal which is then
-		emitted.
+		emitted. If the ring buffer is enabled the raw sample is stored in
+		the buffer instead and emitted once the event thread drains it.
 
 		:param data the joystick event
 		"""
@@ -503,48 +666,113 @@ class EventListener(QtCore.QObject):
 			# ignore if joystick input is suspended
 			return
 
-		from gremlin.util import dill_hat_lookup
-		verbose = config.Configuration().verbose_mode_joystick
-		
 		event = dinput.InputEvent(data)
-		
+
+		axis_filter = self._axis_filter
+		if axis_filter is not None and event.input_type == dinput.InputType.Axis:
+			result, delay = axis_filter.filter(event.device_guid, event.input_index, event.value)
+			if result is not FilterResult.Accept:
+				if result is FilterResult.Defer:
+					# deliver the newest held back value once the rate allows it
+					gremlin.scheduler.Scheduler().schedule(
+						delay,
+						self._flush_axis_filter,
+						axis_filter,
+						event.device_guid,
+						event.input_index
+					)
+				return
+
+		self._deliver_joystick_sample(event.device_guid, event.input_type, event.input_index, event.value)
+
+	def _flush_axis_filter(self, axis_filter, device_guid, input_index):
+		''' delivers the axis value held back by the rate limit '''
+		if axis_filter is not self._axis_filter or self._joystick_suspend_count > 0:
+			return
+		value = axis_filter.flush(device_guid, input_index)
+		if value is not None:
+			self._deliver_joystick_sample(device_guid, dinput.InputType.Axis, input_index, value)
+
+	def _deliver_joystick_sample(self, device_guid, input_type, input_index, value):
+		''' hands a raw joystick sample to the ring buffer if enabled, emits it otherwise '''
+		ring = self._event_ring
+		if ring is not None:
+			if ring.push(
+				device_guid,
+				input_type,
+				input_index,
+				value,
+				input_type == dinput.InputType.Axis
+			):
+				self._event_ring_ready.emit()
+			return
+
+		self._emit_joystick_event(device_guid, input_type, input_index, value)
+
+	@QtCore.Slot()
+	def _drain_event_ring(self):
+		''' emits the samples held by the joystick event ring buffer '''
+		ring = self._event_ring
+		if ring is not None:
+			self._emit_joystick_batch(ring.drain())
+
+	def _emit_joystick_batch(self, batch):
+		''' emits a batch of raw joystick samples
+
+		:param batch list of (device_guid, input_type, input_index, value) tuples
+		'''
+		for device_guid, input_type, input_index, value in batch:
+			if self._joystick_suspend_count > 0:
+				return
+			self._emit_joystick_event(device_guid, input_type, input_index, value)
+
+	def _emit_joystick_event(self, device_guid, input_type, input_index, value):
+		''' converts a raw joystick sample into an event and emits it
+
+		:param device_guid guid of the device the sample originates from
+		:param input_type dinput.InputType of the input
+		:param input_index index of the input on the device
+		:param value raw value of the input
+		'''
+		from gremlin.util import dill_hat_lookup
+		verbose = gremlin.config.runtime_settings.verbose_mode_joystick
+
 		#breakpoint()
-		device = gremlin.joystick_handling.device_info_from_guid(event.device_guid)
+		device = gremlin.joystick_handling.device_info_from_guid(device_guid)
 		
 		is_virtual = device.is_virtual if device is not None else False
-		if event.input_type == dinput.InputType.Axis:
+		if input_type == dinput.InputType.Axis:
 			if verbose:
-				logging.getLogger("system").info(event)
+				logging.getLogger("system").info(f"InputEvent: GUID {device_guid} type: {input_type} index: {input_index} value: {value}")
 
-			# get the curved input if the input is curved
-			raw_value = event.value
-			value = self._apply_calibration(event)
-			curved_value = self._apply_curve_ex(event.device_guid, event.input_index, value)
+			# calibrate and curve the input in one pass
+			raw_value = value
+			value, curved_value = self._axis_transform(device_guid, input_index)(raw_value)
 			
 			self.joystick_event.emit(Event(
 				event_type= InputType.JoystickAxis,
-				device_guid=event.device_guid,
-				identifier=event.input_index,
+				device_guid=device_guid,
+				identifier=input_index,
 				value = value,
 				curved_value = curved_value,
 				raw_value= raw_value,
 				is_axis = True,
 				is_virtual = is_virtual
 			))
-		elif event.input_type == dinput.InputType.Button:
+		elif input_type == dinput.InputType.Button:
 			self.joystick_event.emit(Event(
 				event_type= InputType.JoystickButton,
-				device_guid=event.device_guid,
-				identifier=event.input_index,
-				is_pressed=event.value == 1,
+				device_guid=device_guid,
+				identifier=input_index,
+				is_pressed=value == 1,
 				is_virtual = is_virtual
 			))
-		elif event.input_type == dinput.InputType.Hat:
+		elif input_type == dinput.InputType.Hat:
 			self.joystick_event.emit(Event(
 				event_type= InputType.JoystickHat,
-				device_guid=event.device_guid,
-				identifier=event.input_index,
-				value = dill_hat_lookup[event.value],
+				device_guid=device_guid,
+				identifier=input_index,
+				value = dill_hat_lookup[value],
 				is_virtual = is_virtual
 			))
 
@@ -613,7 +841,7 @@ class EventListener(QtCore.QObject):
 
 		:param event the keyboard event
 		"""
-		verbose = gremlin.config.Configuration().verbose_mode_keyboard
+		verbose = gremlin.config.runtime_settings.verbose_mode_keyboard
 
 		# verbose = True
 		virtual_code = event.virtual_code
@@ -625,13 +853,13 @@ class EventListener(QtCore.QObject):
 		#print (f"translated key: {key_id} sc: {event.scan_code:X} vk: {virtual_code} (0x{virtual_code:X})")
 
 		is_pressed = event.is_pressed
-		is_repeat = self._keyboard_state.get(key_id) and is_pressed
-
-		if is_repeat:
-			# ignore repeats
-			return True
-
-		self._keyboard_state[key_id] = is_pressed
+		bit = self._key_index.bit(key_id)
+		with self._keyboard_state_lock:
+			if is_pressed and self._keyboard_state & bit:
+				# ignore repeats
+				return True
+			self._keyboard_state = gremlin.key_chord.update(self._keyboard_state, bit, is_pressed)
+			keyboard_state = self._keyboard_state
 		
 		if gremlin.shared_state.is_running:
 			# RUN mode - queue input events
@@ -659,7 +887,7 @@ class EventListener(QtCore.QObject):
 						identifier= key_id,
 						virtual_code = virtual_code,
 						is_pressed=is_pressed,
-						data = self._keyboard_state.copy() # use a copy of the keyboard state at the time the key is sent
+						data = keyboard_state # the state is an immutable bitset so this is the state at the time the key is sent
 			))
 
 			
@@ -669,7 +897,7 @@ class EventListener(QtCore.QObject):
 	
 	def get_key_state(self, key: gremlin.keyboard.Key):
 		''' returns the state of the given key '''
-		return self._keyboard_state.get(key.index_tuple(), False)
+		return bool(self._keyboard_state & self._key_index.bit(key.index_tuple()))
 	
 	def get_shifted_state(self):
 		''' returns true if either of the shift keys are down'''
@@ -708,7 +936,10 @@ class EventListener(QtCore.QObject):
 
 			# update keyboard state for that key
 			key_id = (event.button_id.value + 0x1000, False)
-			self._keyboard_state[key_id] = event.is_pressed
+			bit = self._key_index.bit(key_id)
+			with self._keyboard_state_lock:
+				self._keyboard_state = gremlin.key_chord.update(self._keyboard_state, bit, event.is_pressed)
+				keyboard_state = self._keyboard_state
 
 			if event.is_pressed:
 				print(f"mouse pressed {event.button_id}")
@@ -718,7 +949,7 @@ class EventListener(QtCore.QObject):
 				device_guid=dinput.GUID_Keyboard,
 				identifier=event.button_id,
 				is_pressed=event.is_pressed,
-				data = self._keyboard_state
+				data = keyboard_state
 			))
 			# print (f"Mouse button state: {key_id}  {event.is_pressed}")
 		# Allow the windows event to propagate further
@@ -733,28 +964,14 @@ class EventListener(QtCore.QObject):
 		return self._apply_curve_ex(event.device_guid, event.input_index, event.value)
 		
 	def _apply_calibration_ex(self, device_guid, input_id, value):
-		from gremlin.util import axis_calibration
-		key = (device_guid, input_id)
-		if key in self._calibrations:
-			return self._calibrations[key](value)
-		else:
-			return axis_calibration(value, -32768, 0, 32767)
+		return self._axis_transform(device_guid, input_id).calibrate(value)
 		
 	def _apply_curve_ex(self, device_guid, input_id, value):
-		key = (device_guid, input_id)
-		if key in self._joystick_input_item_map:
-			item = self._joystick_input_item_map[key]
-			if item.curve_data is not None:
-				curved_value = item.curve_data.curve_value(value)
-				#print(f"curved: {value:0.4f} -> {curved_value:0.4f}")
-				return curved_value
-		return value
+		return self._axis_transform(device_guid, input_id).curve(value)
 	
 	def apply_transforms(self, device_guid, input_id, raw_value):
 		''' applies raw transforms to the data - input is expected in dinput range (-32K to +32k)'''
-		calib_value = self._apply_calibration_ex(device_guid, input_id, raw_value)
-		curved_value = self._apply_curve_ex(device_guid, input_id, calib_value)
-		#print(f"Raw value: {raw_value:0.4f} filtered: {calib_value:0.4f} Curved value: {curved_value:0.4f}")
+		_, curved_value = self._axis_transform(device_guid, input_id)(raw_value)
 		return curved_value
 
 	def _init_joysticks(self):
@@ -767,19 +984,14 @@ class EventListener(QtCore.QObject):
 
 		:param device_info information about the device
 		"""
-		from gremlin.util import create_calibration_function
 		cfg = config.Configuration()
 		for entry in device_info.axis_map:
-			limits = cfg.get_calibration(
+			key = (device_info.device_guid, entry.axis_index)
+			self._calibrations[key] = tuple(cfg.get_calibration(
 				device_info.device_guid,
 				entry.axis_index
-			)
-			self._calibrations[(device_info.device_guid, entry.axis_index)] = \
-				create_calibration_function(
-					limits[0],
-					limits[1],
-					limits[2]
-				)
+			))
+			self._axis_transforms.pop(key, None)
 
 
 @gremlin.singleton_decorator.SingletonDecorator
@@ -787,6 +999,12 @@ class EventHandler(QtCore.QObject):
 
 	"""Listens to the inputs from multiple different input devices."""
 
+	# input types routed through the precompiled dispatch table
+	dispatch_input_types = frozenset((
+		InputType.JoystickAxis,
+		InputType.JoystickButton,
+		InputType.JoystickHat
+	))
 	
 	mode_changed = QtCore.Signal(str) # Signal emitted when the mode is changed at design time
 	runtime_mode_changed = QtCore.Signal(str)  # mode change specific to runtime
@@ -822,6 +1040,8 @@ class EventHandler(QtCore.QObject):
 		self.osc_callbacks = {}
 		self._event_lookup = {}
 		self.latched_functors = {}
+		self._key_index = gremlin.key_chord.KeyIndex()
+		self.invalidate_dispatch_table()
 		
 
 	@property
@@ -918,8 +1138,9 @@ class EventHandler(QtCore.QObject):
 		for device_guid in self.latched_events.keys():
 			for mode in self.latched_events[device_guid].keys():
 				for key_pair in self.latched_events[device_guid][mode]:
-					identifier = self.latched_events[device_guid][mode][key_pair]
-					if isinstance(identifier, gremlin.ui.keyboard_device.KeyboardInputItem):
+					for _, identifier in self.latched_events[device_guid][mode][key_pair]:
+						if not isinstance(identifier, gremlin.ui.keyboard_device.KeyboardInputItem):
+							continue
 						if isinstance(key_pair, tuple):
 							scan_code, is_extended = key_pair
 							key_data = f"scan code: 0x{scan_code:X}  extended: {is_extended}"
@@ -944,6 +1165,7 @@ class EventHandler(QtCore.QObject):
 		if event not in self.latched_functors[device_guid][mode]:
 			self.latched_functors[device_guid][mode][event] = []
 		self.latched_functors[device_guid][mode][event].append(functor)
+		self.invalidate_dispatch_table()
 		
 				
 
@@ -981,6 +1203,11 @@ class EventHandler(QtCore.QObject):
 					# multiple keys
 					key_list.extend(primary_key._latched_keys)
 
+				# chord mask of all keys that must be held, in the translated key ids the keyboard state uses
+				chord_mask = gremlin.key_chord.KeyIndex().mask(
+					gremlin.keyboard.KeyMap.translate(key.index_tuple())[0] for key in key_list
+				)
+
 				for key in key_list:
  					# the events will arrive as keyboard events - in any order - this makes sure latching is checked regardless of the order of key presses
 					 
@@ -997,7 +1224,7 @@ class EventHandler(QtCore.QObject):
 						self.latched_events[device_guid][mode] = {}
 					if keyid not in self.latched_events[device_guid][mode].keys():
 						self.latched_events[device_guid][mode][keyid] = []
-					self.latched_events[device_guid][mode][keyid].append(identifier)
+					self.latched_events[device_guid][mode][keyid].append((chord_mask, identifier))
 					if verbose:
 						logging.getLogger("system").info(f"Key latch registered by guid {device_guid}  mode: {mode} vk: {virtual_code} (0x{virtual_code:X}) source keyid: {gremlin.keyboard.KeyMap.keyid_tostring(keyid_source)} -> translated keyId: {gremlin.keyboard.KeyMap.keyid_tostring(keyid)} name: {key.name} -> {identifier.display_name}")
 					
@@ -1052,9 +1279,10 @@ class EventHandler(QtCore.QObject):
 					self._install_plugins(callback),
 					permanent
 				))
+				self.invalidate_dispatch_table()
 
 	def _matching_event_keys(self, event):
-		''' gets the list of latched keys for this event '''
+		''' gets the list of (chord mask, input item) entries of the latched keys for this event '''
 		if not event.event_type in (InputType.Keyboard, InputType.KeyboardLatched, InputType.Mouse):
 			# not a keyboard event
 			return []
@@ -1069,20 +1297,19 @@ class EventHandler(QtCore.QObject):
 			mouse_button = event.identifier
 			# convert the mouse button to the virtual scan code we use for mouse events
 			index = (mouse_button.value + 0x1000, False)
-			verbose = gremlin.config.Configuration().verbose_mode_mouse
+			verbose = gremlin.config.runtime_settings.verbose_mode_mouse
 			if verbose:
 				logging.getLogger("system").info(f"matching mouse event {event.identifier} to {gremlin.keyboard.KeyMap.keyid_tostring(index)}")
 		else:
-			verbose = gremlin.config.Configuration().verbose_mode_keyboard
+			verbose = gremlin.config.runtime_settings.verbose_mode_keyboard
 			device_guid = event.device_guid
 			# index = event.virtual_code if event.virtual_code > 0 else event.identifier  # this is (scan_code, is_extended)
 			index, _ = gremlin.keyboard.KeyMap.translate(event.identifier)
-			verbose = gremlin.config.Configuration().verbose_mode_keyboard
+			verbose = gremlin.config.runtime_settings.verbose_mode_keyboard
 			if verbose:
 				logging.getLogger("system").info(f"matching key event {event.identifier} to {gremlin.keyboard.KeyMap.keyid_tostring(index)}")
 
 		#event_key = Key(scan_code = identifier[0], is_extended = identifier[1], is_mouse = is_mouse, virtual_code= virtual_code)
-		input_items = []
 
 		
 	
@@ -1101,10 +1328,7 @@ class EventHandler(QtCore.QObject):
 					if index_ex in data.keys():
 						matching_keys = data[index_ex]
 
-				for input_item in matching_keys:
-					# key = input_item.key
-					input_items.append(input_item)
-				return input_items
+				return matching_keys
 			
 			
 		return []
@@ -1143,6 +1367,58 @@ class EventHandler(QtCore.QObject):
 			# Recurse until we've dealt with all modes
 			self.build_event_lookup(children)
 
+		self.invalidate_dispatch_table()
+
+	def invalidate_dispatch_table(self):
+		''' marks the dispatch table as stale so it is rebuilt on the next event '''
+		self._dispatch_table = {}
+		self._dispatch_mode = None
+
+	def compile_dispatch_table(self, mode = None):
+		"""Compiles the flat joystick dispatch table for a mode.
+
+		The table maps (device_guid, input_type, input_id) to the callbacks
+		and latched functors registered for that input so processing a
+		joystick event is a single dictionary lookup.
+
+		:param mode the mode to compile the table for, the current runtime
+			mode if not specified
+		"""
+		if mode is None:
+			mode = self.runtime_mode
+
+		table = {}
+		for device_guid, device_cb in self.callbacks.items():
+			events = device_cb.get(mode)
+			if not events:
+				continue
+			for event, callback_list in events.items():
+				if event is None or event.event_type not in EventHandler.dispatch_input_types:
+					continue
+				if event.device_guid != device_guid:
+					# can never match an incoming event
+					continue
+				key = (device_guid, event.event_type, event.identifier)
+				table[key] = (
+					tuple(c[0] for c in callback_list),
+					tuple(c[0] for c in callback_list if c[1]),
+					()
+				)
+
+		for device_guid, device_fn in self.latched_functors.items():
+			events = device_fn.get(mode)
+			if not events:
+				continue
+			for event, functors in events.items():
+				if event.event_type not in EventHandler.dispatch_input_types:
+					continue
+				key = (device_guid, event.event_type, event.identifier)
+				callbacks, permanent, _ = table.get(key, ((), (), ()))
+				table[key] = (callbacks, permanent, tuple(functors))
+
+		self._dispatch_table = table
+		self._dispatch_mode = mode
+
 	def change_profile(self, new_profile):
 		''' requests a profile load '''
 		if new_profile != gremlin.shared_state.current_profile:
@@ -1224,6 +1500,7 @@ class EventHandler(QtCore.QObject):
 				current_profile.set_last_runtime_mode(self.runtime_mode)
 				self.previous_runtime_mode = self.runtime_mode
 				self.runtime_mode = new_mode
+				self.compile_dispatch_table(new_mode)
 				logging.getLogger("system").debug(f"Profile: {current_profile.name} - Runtime Mode switch to: {new_mode}")
 				if emit:
 					self.runtime_mode_changed.emit(self.runtime_mode)
@@ -1265,6 +1542,7 @@ class EventHandler(QtCore.QObject):
 		self.latched_callbacks = {}
 		self.midi_callbacks = {}
 		self.osc_callbacks = {}
+		self.invalidate_dispatch_table()
 
 	@QtCore.Slot(Event)
 	def process_event(self, event : Event):
@@ -1274,65 +1552,49 @@ class EventHandler(QtCore.QObject):
 		:param event the event to process
 		"""
 
-		
-		import gremlin.config
-		import gremlin.keyboard
+		if event.event_type in EventHandler.dispatch_input_types:
+			self._dispatch_event(event)
+			return
 
 		# list of callbacks
 		m_list = []
 		f_list = []
 		
 		
-		verbose = gremlin.config.Configuration().verbose_mode_inputs
+		verbose = gremlin.config.runtime_settings.verbose_mode_inputs
 		if verbose and event.event_type != InputType.JoystickAxis:
 			logging.getLogger("system").info(f"process event - mode [{self.runtime_mode}] event: {str(event)}")
 
 		# filter latched keyboard or mouse events
 		if event.event_type in (InputType.Keyboard, InputType.KeyboardLatched, InputType.Mouse):
-			verbose = gremlin.config.Configuration().verbose_mode_keyboard
-			data = event.data # holds keyboard state info
+			verbose = gremlin.config.runtime_settings.verbose_mode_keyboard
+			state = event.data or 0 # keyboard state bitset at the time of the event
 			if event.event_type == InputType.Mouse:
-				verbose = gremlin.config.Configuration().verbose_mode_mouse
+				verbose = gremlin.config.runtime_settings.verbose_mode_mouse
 			if verbose:
 				logging.getLogger("system").info(f"process keyboard event: {event}")
-				logging.getLogger("system").info(f"\tKeyboard state data:")
-				for key in data.keys():
-					logging.getLogger("system").info(f"\t\t{gremlin.keyboard.KeyMap.keyid_tostring(key)} {data[key]}")
+				logging.getLogger("system").info(f"\tKeyboard state data (pressed keys):")
+				for key in self._key_index.keys(state):
+					logging.getLogger("system").info(f"\t\t{gremlin.keyboard.KeyMap.keyid_tostring(key)}")
 
 			items = self._matching_event_keys(event)  # returns list of primary keys
 			if items:
 				if verbose:
 					logging.getLogger("system").info(f"Matched keys for mode: [{self.runtime_mode}]  event {event} pressed: {event.is_pressed} keys: {len(items)} ")
-					for index, input_item in enumerate(items):
+					for index, (_, input_item) in enumerate(items):
 						logging.getLogger("system").info(f"\t[{index}]: {input_item.name}")
 				
 				
 				
-				for input_item in items:
-					if verbose:
-						logging.getLogger("system").info("-"*50)
-					is_latched = True
+				for chord_mask, input_item in items:
 					latch_key = None
-					# print (data)
-					latched_keys = [input_item.key]
-					latched_keys.extend(input_item.latched_keys)
-					if verbose:
-						logging.getLogger("system").info(f"Checking latching: {len(latched_keys)} key(s)")
-					for k in latched_keys:
-						index = k.index_tuple()
-						found = index in data.keys()
-						state = data[index] if found else False
-						if verbose:
-							logging.getLogger("system").info(f"\tcheck latched key: {gremlin.keyboard.KeyMap.keyid_tostring(index)} {k.name} found: {found} state: {state} {'*****' if state else ''}")
-							if not found:
-								logging.getLogger("system").info(f"\t\t* Key not found *")
-						is_latched = is_latched and state
-
-					if verbose:
-						logging.getLogger("system").info(f"\tLatched state: {is_latched}")
-					
-					if is_latched:
+					if gremlin.key_chord.is_held(state, chord_mask):
 						latch_key = input_item.key
+					if verbose:
+						logging.getLogger("system").info("-"*50)
+						for index in self._key_index.keys(chord_mask):
+							logging.getLogger("system").info(f"\tcheck latched key: {gremlin.keyboard.KeyMap.keyid_tostring(index)} state: {bool(state & self._key_index.bit(index))}")
+						logging.getLogger("system").info(f"\tLatched state: {latch_key is not None}")
 
 					if latch_key:
 						#print (f"Found latched key: {latch_key}")
@@ -1343,7 +1605,14 @@ class EventHandler(QtCore.QObject):
 								logging.getLogger("system").info(trigger_line)
 								logging.getLogger("system").info(f"\tmode: [{self.runtime_mode}] Found latched key: Check key {latch_key.name} callbacks: {len(m_list)} event: {event}")
 								logging.getLogger("system").info(trigger_line)
-							self._trigger_callbacks(m_list, event)
+							if gremlin.config.runtime_settings.runtime_statistics:
+								event_start = time.perf_counter_ns()
+								self._trigger_callbacks(m_list, event)
+								gremlin.instrumentation.Instrumentation().record_input(
+									event, time.perf_counter_ns() - event_start
+								)
+							else:
+								self._trigger_callbacks(m_list, event)
 							return
 						# else:
 						# 	print (f"No callbacks found for: {latch_key}")
@@ -1354,22 +1623,21 @@ class EventHandler(QtCore.QObject):
 			return
 						
 		elif event.event_type ==InputType.Midi:
-			verbose = gremlin.config.Configuration().verbose_mode_details
+			verbose = gremlin.config.runtime_settings.verbose_mode_details
 			m_list = self._matching_midi_callbacks(event)
 		elif event.event_type == InputType.OpenSoundControl:
-			verbose = gremlin.config.Configuration().verbose_mode_details
+			verbose = gremlin.config.runtime_settings.verbose_mode_details
 			m_list = self._matching_osc_callbacks(event)
-		elif event.event_type in (InputType.JoystickAxis, InputType.JoystickButton, InputType.JoystickHat):
-			verbose = gremlin.config.Configuration().verbose_mode_joystick
-			m_list = self._matching_callbacks(event)
-			f_list = self._matching_functors(event)
 		else:
 			# other inputs
-			verbose = gremlin.config.Configuration().verbose_mode_details
+			verbose = gremlin.config.runtime_settings.verbose_mode_details
 			m_list = self._matching_callbacks(event)
 			f_list = self._matching_functors(event)
 
-		
+		statistics = gremlin.config.runtime_settings.runtime_statistics
+		if statistics:
+			event_start = time.perf_counter_ns()
+
 		if m_list:
 			if verbose:
 				logging.getLogger("system").info(f"TRIGGER: mode: [{self.runtime_mode}] callbacks: {len(m_list)} event: {event}")
@@ -1380,6 +1648,48 @@ class EventHandler(QtCore.QObject):
 				logging.getLogger("system").info(f"TRIGGER: mode: [{self.runtime_mode}] functors: {len(f_list)} event: {event}")
 			self._trigger_functor_callbacks(f_list, event)
 
+		if statistics and (m_list or f_list):
+			gremlin.instrumentation.Instrumentation().record_input(
+				event, time.perf_counter_ns() - event_start
+			)
+
+
+	def _dispatch_event(self, event : Event):
+		''' runs the callbacks of a joystick event using the precompiled dispatch table '''
+		if self._dispatch_mode != gremlin.shared_state.runtime_mode:
+			# mode changed outside of change_mode() or registrations changed
+			self.compile_dispatch_table()
+
+		settings = gremlin.config.runtime_settings
+		if settings.verbose_mode_details:
+			# slow path - logs the execution tree of the event's callbacks
+			self._matching_callbacks(event)
+
+		entry = self._dispatch_table.get((event.device_guid, event.event_type, event.identifier))
+		if entry is None:
+			return
+
+		callbacks, permanent, functors = entry
+		if not self.process_callbacks:
+			# Filter events when the system is paused
+			callbacks = permanent
+
+		if settings.verbose_mode_inputs and event.event_type != InputType.JoystickAxis:
+			logging.getLogger("system").info(f"process event - mode [{self._dispatch_mode}] event: {str(event)}")
+		if settings.runtime_statistics:
+			event_start = time.perf_counter_ns()
+		if callbacks:
+			if settings.verbose_mode_joystick:
+				logging.getLogger("system").info(f"TRIGGER: mode: [{self._dispatch_mode}] callbacks: {len(callbacks)} event: {event}")
+			self._trigger_callbacks(callbacks, event)
+		if functors:
+			if settings.verbose_mode_joystick:
+				logging.getLogger("system").info(f"TRIGGER: mode: [{self._dispatch_mode}] functors: {len(functors)} event: {event}")
+			self._trigger_functor_callbacks(functors, event)
+		if settings.runtime_statistics and (callbacks or functors):
+			gremlin.instrumentation.Instrumentation().record_input(
+				event, time.perf_counter_ns() - event_start
+			)
 
 	def _trigger_callbacks(self, callbacks, event):
 		#verbose = gremlin.config.Configuration().verbose'
@@ -1396,6 +1706,17 @@ class EventHandler(QtCore.QObject):
 	def _trigger_functor_callbacks(self, functors, event : Event):
 		#verbose = gremlin.config.Configuration().verbose'
 		import gremlin.actions
+		if gremlin.config.runtime_settings.runtime_statistics:
+			stats = gremlin.instrumentation.Instrumentation()
+			for functor in functors:
+				try:
+					start = time.perf_counter_ns()
+					functor.process_event(event, gremlin.actions.Value(event.value))
+					stats.record_functor(functor, time.perf_counter_ns() - start)
+				except Exception as ex:
+					logging.getLogger("system").error(f"FUNCTOR CALLBACK: error {ex}")
+			return
+
 		for functor in functors:
 			try:
 				functor.process_event(event, gremlin.actions.Value(event.value))
@@ -1462,7 +1783,7 @@ class EventHandler(QtCore.QObject):
 			given event
 		"""
 
-		verbose = gremlin.config.Configuration().verbose_mode_details
+		verbose = gremlin.config.runtime_settings.verbose_mode_details
 
 		# Obtain callbacks matching the event
 		callback_list = []
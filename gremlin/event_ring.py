@@ -0,0 +1,133 @@
+# -*- coding: utf-8; -*-
+
+# Based on original work by (C) Lionel Ott -  (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Bounded buffer handing raw joystick samples to the processing thread."""
+
+import array
+import threading
+
+
+class EventRing:
+
+    """Preallocated ring buffer of raw joystick input samples.
+
+    A single producer, the DILL callback thread, pushes samples which a
+    single consumer drains in batches. Storage is allocated up front so
+    pushing a sample does not allocate. When coalescing is enabled a new
+    sample of an axis that still has an undrained sample in the buffer
+    overwrites that sample in place, so a consumer that falls behind only
+    sees the newest value of each axis while button and hat samples keep
+    their order. If the buffer is full new samples are dropped and counted.
+
+    Overwriting in place requires producer and consumer to agree on which
+    slots are still pending, this is done under a short lock which is not
+    contended outside of a drain.
+    """
+
+    def __init__(self, capacity=1024, coalesce_axes=True):
+        """Creates a new instance.
+
+        :param capacity maximum number of samples held by the buffer
+        :param coalesce_axes if True only the newest pending sample of each
+            axis is kept
+        """
+        self.capacity = max(1, int(capacity))
+        self.coalesce_axes = coalesce_axes
+
+        self._device_guid = [None] * self.capacity
+        self._input_type = [None] * self.capacity
+        self._input_index = array.array("l", [0]) * self.capacity
+        self._value = array.array("l", [0]) * self.capacity
+
+        # monotonic counters, the slot of a counter is counter % capacity
+        self._read = 0
+        self._write = 0
+        # pending axis samples, (device_guid, input_index) -> write counter
+        self._pending_axes = {}
+        # True while the consumer has been notified but not yet drained
+        self._notified = False
+        self._lock = threading.Lock()
+
+        self.dropped = 0
+        self.coalesced = 0
+
+    def __len__(self):
+        """Returns the number of pending samples."""
+        return self._write - self._read
+
+    def push(self, device_guid, input_type, input_index, value, is_axis=False):
+        """Adds a sample to the buffer.
+
+        :param device_guid guid of the device the sample originates from
+        :param input_type type of the input
+        :param input_index index of the input on the device
+        :param value raw value of the input
+        :param is_axis True if the sample is an axis sample that can be
+            coalesced
+        :return True if the consumer has to be notified to drain
+        """
+        with self._lock:
+            if is_axis and self.coalesce_axes:
+                key = (device_guid, input_index)
+                counter = self._pending_axes.get(key)
+                if counter is not None:
+                    # replace the undrained sample of the axis
+                    self._value[counter % self.capacity] = value
+                    self.coalesced += 1
+                    return False
+
+            counter = self._write
+            if counter - self._read >= self.capacity:
+                self.dropped += 1
+                return False
+
+            slot = counter % self.capacity
+            self._device_guid[slot] = device_guid
+            self._input_type[slot] = input_type
+            self._input_index[slot] = input_index
+            self._value[slot] = value
+            self._write = counter + 1
+            if is_axis and self.coalesce_axes:
+                self._pending_axes[key] = counter
+
+            if self._notified:
+                return False
+            self._notified = True
+            return True
+
+    def drain(self):
+        """Removes and returns all pending samples.
+
+        :return list of (device_guid, input_type, input_index, value) tuples
+            in the order they were pushed
+        """
+        with self._lock:
+            capacity = self.capacity
+            batch = []
+            for counter in range(self._read, self._write):
+                slot = counter % capacity
+                batch.append((
+                    self._device_guid[slot],
+                    self._input_type[slot],
+                    self._input_index[slot],
+                    self._value[slot]
+                ))
+                self._device_guid[slot] = None
+            self._read = self._write
+            self._pending_axes.clear()
+            self._notified = False
+        return batch
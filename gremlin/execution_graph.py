@@ -17,7 +17,6 @@
 
 from abc import abstractmethod, ABCMeta
 from collections import namedtuple
-import copy
 import logging
 import time
 
@@ -30,6 +29,7 @@ from gremlin.input_types import InputType
 import gremlin.actions
 import gremlin.error
 import gremlin.input_types
+import gremlin.instrumentation
 import gremlin.plugin_manager
 import gremlin.base_conditions
 import gremlin.shared_state
@@ -74,17 +74,16 @@ class ContainerCallback:
         else:
             raise gremlin.error.GremlinError("Invalid event type")
 
-        # Containers representing a virtual button get their individual
-        # value instance, all others share one to propagate changes across
-        shared_value = copy.deepcopy(value)
-
         if event == InputType.VirtualButton:
             # TODO: remove this at a future stage
             logging.getLogger("system").error(
                 "Virtual button code path being used"
             )
         else:
-            self.execution_graph.process_event(event, shared_value)
+            # the value is created for this event only and is shared by all
+            # functors of the container to propagate changes across, actions
+            # that need to retain it have to use Value.copy()
+            self.execution_graph.process_event(event, value)
 
 
 class VirtualButtonCallback:
@@ -165,6 +164,8 @@ class AbstractExecutionGraph(metaclass=ABCMeta):
         self.functors = []
         self.transitions = {}
         self.current_index = 0
+        # name under which the runtime statistics of the graph are recorded
+        self.name = type(self).__name__
 
         self._build_graph(instance)
 
@@ -182,10 +183,20 @@ class AbstractExecutionGraph(metaclass=ABCMeta):
         # a "release" event is sent.
         process_again = False
 
+        stats = None
+        if gremlin.config.runtime_settings.runtime_statistics:
+            stats = gremlin.instrumentation.Instrumentation()
+            graph_start = time.perf_counter_ns()
+
         while self.current_index is not None and len(self.functors) > 0:
             functor = self.functors[self.current_index]
         
-            result = functor.process_event(event, value)
+            if stats is None:
+                result = functor.process_event(event, value)
+            else:
+                start = time.perf_counter_ns()
+                result = functor.process_event(event, value)
+                stats.record_functor(functor, time.perf_counter_ns() - start)
             if result is None or not result and not isinstance(functor, gremlin.actions.ActivationCondition):
                 logging.getLogger("system").warning(f"Process event returned no data or FALSE - functor: {type(functor).__name__}")
 
@@ -195,6 +206,9 @@ class AbstractExecutionGraph(metaclass=ABCMeta):
             self.current_index = self.transitions.get((self.current_index, result),None)
         self.current_index = 0
 
+        if stats is not None:
+            stats.record_graph(self.name, time.perf_counter_ns() - graph_start)
+
         if process_again:
             time.sleep(0.05)
             self.process_event(event, value)
@@ -208,6 +222,19 @@ class AbstractExecutionGraph(metaclass=ABCMeta):
         """
         pass
 
+    def _container_name(self, container):
+        """Returns a name identifying a container and the input it is bound to.
+
+        :param container the container to name
+        :return name of the container type and its input
+        """
+        name = type(container).__name__
+        device = getattr(container, "device", None)
+        if device is not None:
+            input_type = gremlin.input_types.InputType.to_string(container.device_input_type)
+            name = f"{name} ({device.name} {input_type} {container.device_input_id})"
+        return name
+
     def _create_activation_condition(self, activation_condition):
         """Creates activation condition objects base on the given data.
 
@@ -297,6 +324,7 @@ class ContainerExecutionGraph(AbstractExecutionGraph):
         """
         assert isinstance(container, gremlin.base_profile.AbstractContainer)
         super().__init__(container)
+        self.name = self._container_name(container)
 
     def _build_graph(self, container):
         """Builds the graph structure based on the container's content.
@@ -349,6 +377,8 @@ class ActionSetExecutionGraph(AbstractExecutionGraph):
             execution graph
         """
         super().__init__(action_set)
+        if len(action_set) > 0:
+            self.name = f"{self._container_name(action_set[0].parent)} actions"
 
     def _build_graph(self, action_set):
         """Builds the graph structure based on the content of the action set.
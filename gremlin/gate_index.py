@@ -0,0 +1,108 @@
+# -*- coding: utf-8; -*-
+
+# Based on original work by (C) Lionel Ott -  (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Sorted boundary index used to look up gates and ranges of a gated axis."""
+
+import bisect
+
+
+class GateRangeIndex:
+
+    """Sorted index over the gates and ranges of a gated axis.
+
+    Gates are kept sorted by value and ranges by their lower boundary which
+    allows both the range containing a value and the gates crossed between
+    two values to be found by bisection instead of scanning every entry.
+
+    The index is a snapshot, it has to be rebuilt whenever gate values or
+    the set of used gates and ranges change.
+    """
+
+    # matches the default tolerance of gremlin.util.is_close used by
+    # RangeInfo.inrange
+    tolerance = 0.0001
+
+    def __init__(self, gates=(), ranges=()):
+        """Creates a new index.
+
+        :param gates gate objects providing a value attribute
+        :param ranges range objects providing v1, v2 and inrange(), ranges
+            are expected not to overlap
+        """
+        self._gates = sorted(
+            (gate for gate in gates if gate.value is not None),
+            key=lambda gate: gate.value
+        )
+        self._gate_values = [gate.value for gate in self._gates]
+
+        # stable sort, ranges sharing a boundary keep their given order
+        self._ranges = sorted(
+            (rng for rng in ranges if rng.v1 is not None and rng.v2 is not None),
+            key=lambda rng: rng.v1
+        )
+        self._range_starts = [rng.v1 for rng in self._ranges]
+
+    @property
+    def gates(self):
+        """Returns the indexed gates sorted by value."""
+        return self._gates
+
+    @property
+    def ranges(self):
+        """Returns the indexed ranges sorted by their lower boundary."""
+        return self._ranges
+
+    def range_for_value(self, value):
+        """Returns the range containing the given value.
+
+        When the value sits on the boundary shared by two ranges the lower
+        range is returned, same as a linear scan of the sorted ranges.
+
+        :param value the value to look up
+        :return range containing the value or None if there is none
+        """
+        starts = self._range_starts
+        # the range starting just below the value may still contain it,
+        # earlier ones end before the value unless ranges overlap
+        index = max(0, bisect.bisect_left(starts, value - self.tolerance) - 1)
+        upper = value + self.tolerance
+        count = len(starts)
+        while index < count and starts[index] <= upper:
+            rng = self._ranges[index]
+            if rng.inrange(value):
+                return rng
+            index += 1
+        return None
+
+    def gates_between(self, old_value, new_value):
+        """Returns the gates crossed when moving between two values.
+
+        A gate is crossed if it lies in the interval spanned by the two
+        values, both ends inclusive.
+
+        :param old_value the previous value
+        :param new_value the current value
+        :return list of crossed gates sorted by value
+        """
+        if old_value is None or new_value is None:
+            return []
+        if old_value > new_value:
+            old_value, new_value = new_value, old_value
+
+        low = bisect.bisect_left(self._gate_values, old_value)
+        high = bisect.bisect_right(self._gate_values, new_value)
+        return self._gates[low:high]
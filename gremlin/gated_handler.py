@@ -18,6 +18,7 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from __future__ import annotations
+import contextlib
 import os
 from lxml import etree as ElementTree
 from PySide6 import QtWidgets, QtCore, QtGui #QtWebEngineWidgets
@@ -27,10 +28,12 @@ import gremlin.config
 import gremlin.config
 import gremlin.event_handler
 import gremlin.execution_graph
+from gremlin.gate_index import GateRangeIndex
 from gremlin.input_types import InputType
 import gremlin.joystick_handling
 import gremlin.shared_state
 import gremlin.macro
+import gremlin.scheduler
 from gremlin.ui import ui_common
 import gremlin.ui.device_tab
 import gremlin.ui.input_item
@@ -309,7 +312,7 @@ class GateInfo():
 
         self._used = is_used
         self.slider_index = slider_index # index of the gate in the slider
-        self.delay = delay  # delay in milliseconds for the trigger duration between a press and release
+        self._delay = delay  # delay in milliseconds for the trigger duration between a press and release
         self._error = False # no error state
 
         eh = gremlin.event_handler.EventListener()
@@ -329,7 +332,20 @@ class GateInfo():
     
     def setLastCondition(self, condition : GateCondition):
         ''' sets the last used condition '''
-        self._last_condition = condition
+        if self._last_condition != condition:
+            self._last_condition = condition
+            self.parent.mark_modified()
+
+    @property
+    def delay(self) -> int:
+        ''' delay in milliseconds between a press and release '''
+        return self._delay
+
+    @delay.setter
+    def delay(self, value : int):
+        if self._delay != value:
+            self._delay = value
+            self.parent.mark_modified()
 
     @property
     def containerCount(self) -> int:
@@ -344,6 +360,7 @@ class GateInfo():
     def used(self, value):
         if self._used != value:
             self._used = value
+            self.parent.mark_modified()
             # fire the change event
             eh = GateEventHandler()
             eh.gate_used_changed.emit(self)
@@ -384,6 +401,7 @@ class GateInfo():
             data = self.parent.range_max
         if data != self._value:
             self._value = data
+            self.parent.mark_modified()
             self.parent._update_gate_index() # re-index based on value so the gate is always in sequence
             if emit:
                 # tell listeners the value changed
@@ -547,7 +565,9 @@ class RangeInfo():
     
     def setLastCondition(self, condition : GateCondition):
         ''' sets the last used condition '''
-        self._last_condition = condition
+        if self._last_condition != condition:
+            self._last_condition = condition
+            self.parent.mark_modified()
 
     
     @property
@@ -558,6 +578,7 @@ class RangeInfo():
     def used(self, value):
         if self._used != value:
             self._used = value
+            self.parent.mark_modified()
             # fire the change event
             eh = GateEventHandler()
             eh.range_used_changed.emit(self)        
@@ -660,7 +681,9 @@ class RangeInfo():
     
     @output_range_min.setter
     def output_range_min(self, value):
-        self._output_range_min = value
+        if self._output_range_min != value:
+            self._output_range_min = value
+            self.parent.mark_modified()
     
     @property
     def output_range_max(self):
@@ -671,7 +694,9 @@ class RangeInfo():
     
     @output_range_max.setter
     def output_range_max(self, value):
-        self._output_range_max = value
+        if self._output_range_max != value:
+            self._output_range_max = value
+            self.parent.mark_modified()
 
     
     def range(self) -> tuple[float, float]:
@@ -711,7 +736,9 @@ class RangeInfo():
     def setLastCondition(self, value : GateCondition):
         ''' sets the last condition '''
         assert value in [c for c in GateCondition]
-        self._last_condition = value
+        if self._last_condition != value:
+            self._last_condition = value
+            self.parent.mark_modified()
         
 
     @property
@@ -720,7 +747,9 @@ class RangeInfo():
     @mode.setter
     def mode(self, value : GateRangeOutputMode):
         assert value in [c for c in GateRangeOutputMode]
-        self._output_mode = value
+        if self._output_mode != value:
+            self._output_mode = value
+            self.parent.mark_modified()
 
     @property
     def fixed_value(self) -> float:
@@ -731,7 +760,9 @@ class RangeInfo():
     def fixed_value(self, data: float):
         if data is None:
             # not set
-            self._fixed_value = data
+            if self._fixed_value is not None:
+                self._fixed_value = data
+                self.parent.mark_modified()
         else:
             # check range
             if data < -1.0:
@@ -740,6 +771,7 @@ class RangeInfo():
                 data = 1.0
             if self._fixed_value is None or data != self._fixed_value:
                 self._fixed_value = data
+                self.parent.mark_modified()
 
 
     @property
@@ -928,8 +960,24 @@ class GateEventHandler(QtCore.QObject):
     gate_order_changed = QtCore.Signal() # fires when the gate order should be updated 
     visibility_changed = QtCore.Signal(object, bool) # fires when visibility changes
 
+    short_press_release = QtCore.Signal(object, object, object) # releases a short press on the event thread (functor, event, value)
+
     def __init__(self):
         super().__init__()
+        # releases are timed by the scheduler but the functors run on the
+        # event thread like the press, so a slow functor cannot delay other
+        # scheduled outputs
+        app = QtCore.QCoreApplication.instance()
+        if app is not None:
+            self.moveToThread(app.thread())
+        self.short_press_release.connect(
+            self._short_press_release,
+            QtCore.Qt.ConnectionType.QueuedConnection
+        )
+
+    def _short_press_release(self, functor, event, value):
+        ''' sends the release of a short press '''
+        functor.process_event(event, value)
 
 
 class GateData():
@@ -955,6 +1003,7 @@ class GateData():
 
         self._process_trigger_lock = threading.Lock()
         self._action_data = action_data
+        self._untracked = 0 # change tracking is suspended while > 0
         self.condition = condition
         self.output_mode = mode
         self.profile_mode = profile_mode # profile mode this gate data applies to (can be set via reading from XML)
@@ -988,6 +1037,7 @@ class GateData():
         self._trigger_callbacks = [] # list of registered trigger callbacks
 
         self._active_ranges = []
+        self._index : GateRangeIndex = None # sorted lookup index of used gates and active ranges - rebuilt on demand
 
         # create the gate cache - only the first two gates are marked used and not default
         max_gates = GateData.max_gates
@@ -1029,23 +1079,37 @@ class GateData():
         # update the default range when the order of gates changes
         eh = GateEventHandler()
         eh.gate_order_changed.connect(self._update_default_range)
+        eh.gate_used_changed.connect(self._invalidate_index)
 
         self._hooked = False
+        self._subscription = None # subscribed input (device_guid, input_type, input_id)
 
     def hook(self):
         ''' hook events '''
         if not self._hooked:
             self._hooked = True
-            el = gremlin.event_handler.EventListener()
-            el.joystick_event.connect(self._joystick_event_handler)
+            self._subscribe()
 
     def unhook(self):
         ''' unhook events '''
         if self._hooked:
-            el = gremlin.event_handler.EventListener()
-            el.joystick_event.disconnect(self._joystick_event_handler)
+            self._unsubscribe()
             self._hooked = False
 
+    def _subscribe(self):
+        ''' subscribes to the events of the gated input axis only '''
+        if self._subscription is None:
+            self._subscription = (self._action_data.hardware_device_guid, InputType.JoystickAxis, self._action_data.hardware_input_id)
+            el = gremlin.event_handler.EventListener()
+            el.subscribe_joystick_input(*self._subscription, self._joystick_event_handler)
+
+    def _unsubscribe(self):
+        ''' removes the input axis subscription '''
+        if self._subscription is not None:
+            el = gremlin.event_handler.EventListener()
+            el.unsubscribe_joystick_input(*self._subscription, self._joystick_event_handler)
+            self._subscription = None
+
     @property
     def hooked(self) -> bool:
         ''' true if hooks are in place '''
@@ -1107,6 +1171,10 @@ class GateData():
     @QtCore.Slot()
     def _profile_start_cb(self):
         ''' profile starts - build execution callbacks by defined container '''
+
+        if gremlin.base_profile.is_retained(self._action_data):
+            # the gate belongs to a profile kept in the profile cache, not the one starting
+            return
         
         # build event callback maps from subcontainers in this gated axis
         callbacks_map = {}
@@ -1120,8 +1188,7 @@ class GateData():
 
         if not self.hooked:        
             # listen to hardware events
-            el = gremlin.event_handler.EventListener()
-            el.joystick_event.connect(self._joystick_event_handler)
+            self._subscribe()
 
 
         item_data: gremlin.ui.device_tab.InputItemConfiguration
@@ -1164,8 +1231,7 @@ class GateData():
 
         if not self.hooked:        
             # stop listening to hardware events
-            el = gremlin.event_handler.EventListener()
-            el.joystick_event.disconnect(self._joystick_event_handler)
+            self._unsubscribe()
 
         # clean up callback map
         self._callbacks.clear()
@@ -1190,17 +1256,8 @@ class GateData():
         
         '''
 
-        if not event.is_axis:
-            # ignore if not an axis event
-            return
-
-        if self._action_data.hardware_device_guid != event.device_guid:
-            # ignore if a different input device
-            return
-            
-        if self._action_data.hardware_input_id != event.identifier:
-            # ignore if a different input axis on the input device
-            return
+        # the subscription only delivers events of the gated axis - the event is shared with other listeners so triggers modify a copy
+        event = event.clone()
 
         raw_value = event.raw_value
         input_value = gremlin.joystick_handling.scale_to_range(raw_value, source_min = -32767, source_max = 32767, target_min = -1, target_max = 1)
@@ -1211,7 +1268,7 @@ class GateData():
         triggers = self.process_triggers(input_value, self._active_ranges)
         trigger: TriggerData
 
-        verbose = gremlin.config.Configuration().verbose_mode_details
+        verbose = gremlin.config.runtime_settings.verbose_mode_details
 
         
         # if verbose:
@@ -1308,8 +1365,7 @@ class GateData():
                         for functor in cb.callback.execution_graph.functors:
                             if functor.enabled:
                                 if short_press:
-                                    thread = threading.Thread(target=lambda: self._short_press(functor, event, value, delay))
-                                    thread.start()
+                                    self._short_press(functor, event, value, delay)
                                 else:
                                     # not a momentary trigger
                                     #print (f"trigger mode: {trigger.mode} sending event value: {value.current}")
@@ -1319,8 +1375,7 @@ class GateData():
                 # process user provided functor callback if set (this is used by actions that must act on the modified output of the gated axis rather than the raw hardware input - example: simconnect action)
                 if self._process_callback is not None:
                     if short_press:
-                        thread = threading.Thread(target=lambda: self._short_press(self._process_callback, event, value, delay))
-                        thread.start()
+                        self._short_press(self._process_callback, event, value, delay)
                     else:
                         self._process_callback(event, value)
 
@@ -1329,15 +1384,21 @@ class GateData():
         #     syslog.info("Trigger: end")
 
     def _short_press(self, functor, event, value, delay = 250):
-        ''' triggers a short press of a trigger (gate crossing)'''
+        ''' triggers a short press of a trigger (gate crossing) - the press is sent now and the release is scheduled after the delay '''
         if not hasattr(functor, "process_event"):
             return
-        # print ("short press ")
-        value.current = True
-        functor.process_event(event, value)
-        time.sleep(delay/1000) # ms to seconds
-        value.current = False
-        functor.process_event(event, value)
+        # the event and value are reused by the following triggers so the press and release get their own copies
+        event = event.clone()
+        press_value = value.copy()
+        press_value.current = True
+        functor.process_event(event, press_value)
+        release_value = value.copy()
+        release_value.current = False
+        # only the timing runs on the scheduler thread, the release is handed back to the event thread
+        gremlin.scheduler.Scheduler().schedule(
+            delay/1000, # ms to seconds
+            GateEventHandler().short_press_release.emit, functor, event, release_value
+        )
 
     @property
     def trigger_range_text(self):
@@ -1531,7 +1592,7 @@ class GateData():
                 g1 = g2
                 g2 = gate
             required_gates.append((g1, g2))
-        verbose = gremlin.config.Configuration().verbose_mode_details
+        verbose = gremlin.config.runtime_settings.verbose_mode_details
         if verbose:
             syslog.info("Required ranges: ")
             for g1, g2 in required_gates:
@@ -1539,6 +1600,12 @@ class GateData():
         return required_gates
     
     def updateRanges(self):
+        ''' synchronizes ranges with gates - see _sync_ranges '''
+        # the ranges follow from the gates, rebuilding them is not a profile change
+        with self.untracked():
+            return self._sync_ranges()
+
+    def _sync_ranges(self):
         ''' synchronizes ranges with gates
          
         Scans used gates in sequence and returns the list of RangeInfo objects corresponding to them.
@@ -1574,7 +1641,7 @@ class GateData():
                 continue
             range_info.setUsed(True)
             range_info_list.append(range_info)
-            if gremlin.config.Configuration().verbose_mode_details:
+            if gremlin.config.runtime_settings.verbose_mode_details:
                 syslog.info(f"Ranges: sync range for {range_info.range_gate_display()}  {range_info.range_display()}")
 
         for range_info in ranges:
@@ -1583,6 +1650,7 @@ class GateData():
 
 
         self._active_ranges = range_info_list
+        self._index = GateRangeIndex(self._get_used_gates(), range_info_list)
 
 
         # return the list of ranges 
@@ -1754,6 +1822,26 @@ class GateData():
                 return rng
         return None
     
+    def mark_modified(self):
+        ''' records a change of the gate setup on the action holding it
+
+        Gates and ranges are not part of the tracked profile tree so their
+        edits are reported to the owning action.
+        '''
+        if self._untracked:
+            return
+        if isinstance(self._action_data, gremlin.base_profile.ChangeTracker):
+            self._action_data.mark_modified()
+
+    @contextlib.contextmanager
+    def untracked(self):
+        ''' suspends change tracking of the gates and ranges '''
+        self._untracked += 1
+        try:
+            yield self
+        finally:
+            self._untracked -= 1
+
     def deleteGate(self, data):
         ''' removes a gate '''
         id = data.id
@@ -1765,6 +1853,7 @@ class GateData():
             syslog.info(f"Deleting gate: {id} value: {self._gate_item_map[id].value:0.{_decimals}f}")
         self._gate_item_map[id] = None
         del self._gate_item_map[id]
+        self.mark_modified()
         self._update_gate_index()
 
 
@@ -1816,6 +1905,11 @@ class GateData():
 
     def _update_ranges(self):
         ''' updates the list of ranges with updated gate configuration - this should be called whenever a gate is added or removed  '''
+        with self.untracked():
+            self._rebuild_ranges()
+
+    def _rebuild_ranges(self):
+        ''' rebuilds the ranges from the used gates, keeping the range data in order '''
         if not self._range_item_map:
             return
         
@@ -1859,6 +1953,7 @@ class GateData():
                 
 
         self._range_list = ranges
+        self._invalidate_index()
 
         # update the default range
         self._update_default_range()
@@ -1905,21 +2000,8 @@ class GateData():
             # swap
             v1, v2 = v2, v1
 
-        gates = self._get_used_gates()
-        result = set()
-        # get the low gate
-        for gate in gates:
-            v = gate.value
-            if v >= v1 and v < v2:
-                # v1 is on the gate or below a the gate
-                result.add(gate)
-            if v == v2:
-                # v2 is on the gate
-                result.add(gate)
-            if v > v2:
-                # gate is outside the range - stop processing gates
-                break
-        return list(result)
+        # gates between the two values, both ends inclusive
+        return self._get_index().gates_between(v1, v2)
     
     def _get_ranges_for_values(self, old_value, new_value):
         ''' gets the list of sorted list of gates between two values '''
@@ -1958,6 +2040,7 @@ class GateData():
         gates.sort(key = lambda x: x.value) # sort gate ascending
         for index, gate in enumerate(gates):
             gate.slider_index = index
+        self._invalidate_index()
 
         # # index default gates
         # default_gates = [info for info in self._gates if info.used and info.is_default]
@@ -1967,6 +2050,19 @@ class GateData():
 
         return gates
     
+    @QtCore.Slot()
+    def _invalidate_index(self, *args):
+        ''' drops the gate and range lookup index - it is rebuilt on next use '''
+        self._index = None
+
+    def _get_index(self) -> GateRangeIndex:
+        ''' gets the lookup index of used gates and active ranges '''
+        index = self._index
+        if index is None:
+            index = GateRangeIndex(self._get_used_gates(), self._active_ranges)
+            self._index = index
+        return index
+
     def getSortedGates(self):
         ''' gets a list of sorted gates by increasing value '''
         return self._update_gate_index()
@@ -2020,10 +2116,8 @@ class GateData():
     def _get_range_for_value(self, value : float, include_default : bool = False, used_only : bool = True):
         ''' returns (v1,v2,idx1,idx12) where v1 = lower range, v2 = higher range, idx1 = gate index for v1, idx2 = gate index for v2 '''
         range_info : RangeInfo
-        #print ("------")
         selected = None
         for range_info in self._get_ranges(include_default = include_default, used_only = used_only):
-            print (f"{value:0.4f} - range: {range_info.range_display()} {range_info.range_gate_display()} in range: {range_info.inrange(value)}")
             if range_info.inrange(value):
                 selected = range_info
         return selected
@@ -2036,6 +2130,10 @@ class GateData():
         :returns: the RangeInfo containing the value or None if not found
         '''
 
+        if ranges is self._active_ranges:
+            # active ranges are indexed
+            return self._get_index().range_for_value(value)
+
         for range_info in ranges:
             if range_info.inrange(value):
                 return range_info
@@ -2064,7 +2162,7 @@ class GateData():
     def _get_filtered_range_value(self, range_info : RangeInfo, value : float):
         ''' gets a range filtered value '''
         range_info : RangeInfo
-        verbose = gremlin.config.Configuration().verbose_mode_details
+        verbose = gremlin.config.runtime_settings.verbose_mode_details
 
         if value < range_info.v1 or value > range_info.v2:
             # not in range
@@ -2324,7 +2422,7 @@ class GateData():
                 self._trigger_range_lines = self._trim_list(self._trigger_range_lines, self._trigger_line_count)
                 self._trigger_gate_lines = self._trim_list(self._trigger_gate_lines, self._trigger_line_count)
 
-            if gremlin.config.Configuration().verbose_mode_details:
+            if gremlin.config.runtime_settings.verbose_mode_details:
                 # dump the triggerrs
                 syslog.info(f"Trigger results for value {current_value}:")
                 for trigger in triggers:
@@ -2367,7 +2465,7 @@ class GateData():
         ''' export this configuration to XML '''
         node = ElementTree.Element("gate")
 
-        verbose = gremlin.config.Configuration().verbose_mode_details
+        verbose = gremlin.config.runtime_settings.verbose_mode_details
         
 
         node.set("use_default_range",str(self.use_default_range))
@@ -3600,6 +3698,7 @@ class GatedAxisWidget(QtWidgets.QWidget):
     @QtCore.Slot(bool)
     def _use_default_range_changed_cb(self, checked):
         self.gate_data.use_default_range = checked
+        self.gate_data.mark_modified()
         eh = GateEventHandler()
         eh.use_default_range_changed.emit()
         
@@ -3607,6 +3706,7 @@ class GatedAxisWidget(QtWidgets.QWidget):
     @QtCore.Slot()
     def _display_mode_changed_cb(self):
         self.gate_data.display_mode = self._display_mode_widget.currentData()
+        self.gate_data.mark_modified()
         eh = GateEventHandler()
         eh.display_mode_changed.emit(self.gate_data.display_mode)
         
@@ -3665,7 +3765,7 @@ class GatedAxisWidget(QtWidgets.QWidget):
             values -- tuple of values -1.0 to 1.0
         '''
         
-        verbose = gremlin.config.Configuration().verbose_mode_details
+        verbose = gremlin.config.runtime_settings.verbose_mode_details
         if verbose:
             sv = "Slider: "
             for idx, v in enumerate(values):
@@ -3896,6 +3996,7 @@ class GatedAxisWidget(QtWidgets.QWidget):
         widget = self.sender()
         trigger : TriggerMode = widget.data
         self.gate_data.filter_map[trigger] = checked
+        self.gate_data.mark_modified()
 
     def _create_output_ui(self):
         ''' creates the output line ui options '''
@@ -4531,7 +4632,7 @@ class ActionContainerUi(QtWidgets.QDialog):
     QtCore.Slot()
     def _delay_changed_cb(self):
         ''' delay value changed for gates '''
-        self._range_info.delay = self.delay_widget.value()
+        self._gate.delay = self.delay_widget.value()
 
     QtCore.Slot()
     def _delete_gate_confirm_cb(self):
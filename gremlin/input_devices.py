@@ -51,6 +51,10 @@ import enum
 
 import gremlin.singleton_decorator
 import gremlin.event_handler
+import gremlin.instrumentation
+import gremlin.remote_protocol
+import gremlin.scheduler
+import gremlin.tick
 
 
 syslog = logging.getLogger("system")
@@ -691,136 +695,220 @@ class StateChangeRegistry():
 
 
 
-class GremlinServer(socketserver.ThreadingMixIn,socketserver.UDPServer):
-    pass
-
-class GremlinSocketHandler(socketserver.BaseRequestHandler):
-    ''' handles remote input from a gremlin client on the network
-    
-        received network events are processed here
-    
-    '''
+class GremlinServer(socketserver.UDPServer):
+    ''' receives remote input from gremlin clients on the network
 
+        Datagrams are handled one after the other on the thread running
+        serve_forever, in the order they arrive, instead of on a new thread
+        per datagram. Each message is mapped to a compact opcode which
+        selects its handler from a dispatch table built once, and the vJoy
+        and ViGEm devices written to are looked up once and cached.
 
-    def handle(self):
-        
-      
-        # handles input data
-        raw_data = self.request[0].strip()
-        # socket = self.request[1]
-        
-        data = msgpack.unpackb(raw_data)
-        # syslog.debug(f"Gremlin received remote data: {data}")
+        The time from receiving a datagram to having written its output is
+        recorded per opcode in the runtime statistics.
+    '''
 
-        sender = data["sender"]
-        if sender == remote_client.id:
-            # ignore our own broadcasts
+    # opcodes of the msgpack messages, keyed by (action, subtype)
+    legacy_opcodes = {
+        ("hb", None): gremlin.remote_protocol.OP_HEARTBEAT,
+        ("key", None): gremlin.remote_protocol.OP_KEY,
+        ("mouse", "button"): gremlin.remote_protocol.OP_MOUSE_BUTTON,
+        ("mouse", "wheel"): gremlin.remote_protocol.OP_MOUSE_WHEEL,
+        ("mouse", "hwheel"): gremlin.remote_protocol.OP_MOUSE_HWHEEL,
+        ("mouse", "axis"): gremlin.remote_protocol.OP_MOUSE_MOTION,
+        ("mouse", "amotion"): gremlin.remote_protocol.OP_MOUSE_ACCELERATION,
+        ("gamepad", "axis"): gremlin.remote_protocol.OP_GAMEPAD_AXIS,
+        ("gamepad", "button"): gremlin.remote_protocol.OP_GAMEPAD_BUTTON,
+        ("axis", None): gremlin.remote_protocol.OP_AXIS,
+        ("button", None): gremlin.remote_protocol.OP_BUTTON,
+        ("hat", None): gremlin.remote_protocol.OP_HAT,
+        ("relative_axis", None): gremlin.remote_protocol.OP_RELATIVE_AXIS,
+    }
+
+    def __init__(self, server_address):
+        ''' creates the server
+
+        :param server_address (host, port) tuple to listen on
+        '''
+        super().__init__(server_address, None)
+        # drops batched datagrams arriving after a newer one
+        self.sequence_filter = gremlin.remote_protocol.SequenceFilter()
+        self._stats = gremlin.instrumentation.Instrumentation()
+
+        # vjoy id -> vjoy device, gamepad index -> ViGEm device
+        self._vjoy_devices = dict(gremlin.joystick_handling.VJoyProxy.vjoy_devices)
+        self._gamepads = {}
+
+        op = gremlin.remote_protocol
+        # handlers of batched records, called with (device_id, target_id, value)
+        self._record_handlers = {
+            op.OP_AXIS: self._vjoy_axis,
+            op.OP_BUTTON: self._vjoy_button,
+            op.OP_HAT: self._vjoy_encoded_hat,
+            op.OP_RELATIVE_AXIS: self._vjoy_relative_axis,
+        }
+        # handlers of msgpack messages, called with the message data
+        self._message_handlers = {
+            op.OP_HEARTBEAT: None,
+            op.OP_KEY: self._key,
+            op.OP_MOUSE_BUTTON: self._mouse_button,
+            op.OP_MOUSE_WHEEL: lambda data: gremlin.sendinput.mouse_wheel(data["direction"]),
+            op.OP_MOUSE_HWHEEL: lambda data: gremlin.sendinput.mouse_h_wheel(data["direction"]),
+            op.OP_MOUSE_MOTION: self._mouse_motion,
+            op.OP_MOUSE_ACCELERATION: self._mouse_acceleration,
+            op.OP_GAMEPAD_AXIS: self._gamepad_axis,
+            op.OP_GAMEPAD_BUTTON: self._gamepad_button,
+            op.OP_AXIS: lambda data: self._vjoy_axis(data["device"], data["target"], data["value"]),
+            op.OP_BUTTON: lambda data: self._vjoy_button(data["device"], data["target"], data["value"]),
+            op.OP_HAT: lambda data: self._vjoy_hat(data["device"], data["target"], data["value"]),
+            op.OP_RELATIVE_AXIS: lambda data: self._vjoy_relative_axis(data["device"], data["target"], data["value"]),
+        }
+
+    def finish_request(self, request, client_address):
+        ''' handles a received datagram '''
+        start = time.perf_counter_ns()
+        raw_data = request[0]
+        try:
+            if gremlin.remote_protocol.is_batch(raw_data):
+                name = self._handle_batch(raw_data)
+            else:
+                name = self._handle_message(raw_data)
+        except Exception as ex:
+            syslog.error(f"Gremlin server: unable to process remote data: {ex}")
             return
-        
+        if name is not None:
+            self._stats.record_remote(name, time.perf_counter_ns() - start)
+
+    def _handle_batch(self, raw_data):
+        ''' applies a datagram in the batched binary format
+
+        :return name under which the datagram is recorded, None if ignored
+        '''
+        batch = gremlin.remote_protocol.decode(raw_data)
+        if batch is None:
+            return None
+        sender, sequence, records = batch
+        if sender == remote_client.id_bytes:
+            # ignore our own broadcasts
+            return None
+        if not self.sequence_filter.accept(sender, sequence):
+            # stale datagram
+            return None
+
+        handlers = self._record_handlers
+        for opcode, device_id, target_id, value in records:
+            handler = handlers.get(opcode)
+            if handler is not None:
+                handler(device_id, target_id, value)
+        return "batch"
+
+    def _handle_message(self, raw_data):
+        ''' applies a datagram in the msgpack format
+
+        :return name under which the datagram is recorded, None if ignored
+        '''
+        data = msgpack.unpackb(raw_data.strip())
+        if data["sender"] == remote_client.id:
+            # ignore our own broadcasts
+            return None
         action = data["action"]
-        if action == "hb":
-            # heart beat
-            return
-        
-        if action == "key":
-            # keyboard output
-            virtual_code = data["vc"]
-            scan_code = data["sc"]
-            flags = data["flags"]
-            win32api.keybd_event(virtual_code, scan_code, flags, 0)
-        elif action == "mouse":
-            
-            subtype = data["subtype"]
-            if subtype == "wheel":
-                direction = data["direction"]
-                gremlin.sendinput.mouse_wheel(direction)
-            elif subtype == "hwheel":
-                direction = data["direction"]
-                gremlin.sendinput.mouse_h_wheel(direction)
-            elif subtype == "button":
-                button_id = data["button"]
-                button = gremlin.sendinput.MouseButton.to_enum(button_id)
-                is_pressed = data["value"]
-                if is_pressed:
-                    gremlin.sendinput.mouse_press(button)
-                else:
-                    gremlin.sendinput.mouse_release(button)
-            elif subtype == "axis":
-                dx = data["dx"]
-                dy = data["dy"]
-                mouse_controller = gremlin.sendinput.MouseController()
-                mouse_controller.set_absolute_motion(dx, dy)
-
-            elif subtype == "amotion":
-                # accelerated motion
-                a = data["acc"]
-                min_speed = data["min_speed"]
-                max_speed = data["max_speed"]
-                time_to_max_speed = data["time_to_speed"]
-                mouse_controller = gremlin.sendinput.MouseController()
-                mouse_controller.set_accelerated_motion(a,min_speed,max_speed,time_to_max_speed)
-        elif action == "gamepad":
-            # gamepad handling
-            index = data["index"] # id of the gamepad to send the data to
-            subtype = data["subtype"] # axis or button
-            output_mode = data["mode"] # either a gamepadoutput or the translated button code
-            vigem = gremlin.gamepad_handling.getGamepad(index)
-            if vigem is not None:
-                if subtype == "axis":
-                    value = data["value"]
-                    
-                    if vigem:
-                        if output_mode == GamePadOutput.LeftStickX:
-                            vigem.left_joystick_float_x(vscaled)
-                        elif output_mode == GamePadOutput.LeftStickY:
-                            vigem.left_joystick_float_y(vscaled)
-                        if output_mode == GamePadOutput.RightStickX:
-                            vigem.right_joystick_float_x(vscaled)
-                        elif output_mode == GamePadOutput.RightStickY:
-                            vigem.right_joystick_float_y(vscaled)
-                        if output_mode == GamePadOutput.LeftTrigger:
-                            vscaled = gremlin.util.scale_to_range(value.current,target_min=0.0, target_max=1.0)
-                            vigem.left_trigger_float(vscaled)
-                        if output_mode == GamePadOutput.RightTrigger:
-                            vscaled = gremlin.util.scale_to_range(value.current,target_min=0.0, target_max=1.0)
-                            vigem.right_trigger_float(vscaled)
-
-                elif subtype == "button":
-                    is_pressed = data["is_pressed"]
-                    if is_pressed:
-                        vigem.press_button(button)
-                    else:
-                        vigem.release_button(button)
-                vigem.update()
-            
-
+        opcode = self.legacy_opcodes.get((action, data.get("subtype") if action in ("mouse", "gamepad") else None))
+        handler = self._message_handlers.get(opcode)
+        if handler is None:
+            return None
+        handler(data)
+        return gremlin.remote_protocol.opcode_name(opcode)
+
+    def _vjoy(self, device_id):
+        ''' returns the cached vjoy device of an id, None if not available '''
+        vjoy = self._vjoy_devices.get(device_id)
+        if vjoy is None:
+            vjoy = gremlin.joystick_handling.VJoyProxy.vjoy_devices.get(device_id)
+            if vjoy is not None:
+                self._vjoy_devices[device_id] = vjoy
+        return vjoy
+
+    def _vjoy_axis(self, device_id, axis_id, value):
+        vjoy = self._vjoy(device_id)
+        if vjoy is not None and 0 < axis_id <= vjoy.axis_count:
+            vjoy.axis(axis_id).value = value
+
+    def _vjoy_relative_axis(self, device_id, axis_id, value):
+        vjoy = self._vjoy(device_id)
+        if vjoy is not None and 0 < axis_id <= vjoy.axis_count:
+            axis = vjoy.axis(axis_id)
+            axis.value = max(-1.0, min(1.0, axis.value + value))
+
+    def _vjoy_button(self, device_id, button_id, value):
+        vjoy = self._vjoy(device_id)
+        if vjoy is not None and 0 < button_id <= vjoy.button_count:
+            vjoy.button(button_id).is_pressed = bool(value)
+
+    def _vjoy_hat(self, device_id, hat_id, direction):
+        vjoy = self._vjoy(device_id)
+        if vjoy is not None and 0 < hat_id <= vjoy.hat_count:
+            vjoy.hat(hat_id).direction = tuple(direction)
+
+    def _vjoy_encoded_hat(self, device_id, hat_id, value):
+        self._vjoy_hat(device_id, hat_id, gremlin.remote_protocol.decode_hat(value))
+
+    def _key(self, data):
+        win32api.keybd_event(data["vc"], data["sc"], data["flags"], 0)
+
+    def _mouse_button(self, data):
+        button = gremlin.sendinput.MouseButton.to_enum(data["button"])
+        if data["value"]:
+            gremlin.sendinput.mouse_press(button)
+        else:
+            gremlin.sendinput.mouse_release(button)
 
+    def _mouse_motion(self, data):
+        gremlin.sendinput.MouseController().set_absolute_motion(data["dx"], data["dy"])
 
+    def _mouse_acceleration(self, data):
+        gremlin.sendinput.MouseController().set_accelerated_motion(
+            data["acc"], data["min_speed"], data["max_speed"], data["time_to_speed"]
+        )
 
+    def _gamepad(self, index):
+        ''' returns the cached ViGEm device of a gamepad index, None if not available '''
+        vigem = self._gamepads.get(index)
+        if vigem is None:
+            vigem = gremlin.gamepad_handling.getGamepad(index)
+            if vigem is not None:
+                self._gamepads[index] = vigem
+        return vigem
 
-        elif action in ("button","axis","hat","relative_axis"):
-            # joystick button
-            device = data["device"]
-            target = data["target"]
-            value = data["value"]
-            proxy = gremlin.joystick_handling.VJoyProxy()
-            if device in proxy.vjoy_devices:
-                # valid device
-                vjoy = proxy[device]
-                
-                if action == "button":
-                    # emit button change
-                    if target > 0 and target < vjoy.button_count:
-                        proxy[device].button(target).is_pressed = value
-                elif action == "axis":
-                    if target > 0 and target <= vjoy.axis_count:
-                        proxy[device].axis(target).value = value
-                elif action == "hat":
-                    if target > 0 and target <= vjoy.hat_count:
-                        proxy[device].hat(target).direction = value
-                elif action == "relative_axis":
-                     if target > 0 and target <= vjoy.axis_count:
-                        proxy[device].axis(target).value = max(-1.0,min(1.0, proxy[device].axis(target).value + value))
+    def _gamepad_axis(self, data):
+        vigem = self._gamepad(data["index"])
+        if vigem is None:
+            return
+        output_mode = data["mode"]
+        value = data["value"]
+        if output_mode == GamePadOutput.LeftStickX:
+            vigem.left_joystick_float_x(value)
+        elif output_mode == GamePadOutput.LeftStickY:
+            vigem.left_joystick_float_y(value)
+        elif output_mode == GamePadOutput.RightStickX:
+            vigem.right_joystick_float_x(value)
+        elif output_mode == GamePadOutput.RightStickY:
+            vigem.right_joystick_float_y(value)
+        elif output_mode == GamePadOutput.LeftTrigger:
+            vigem.left_trigger_float(gremlin.util.scale_to_range(value, target_min=0.0, target_max=1.0))
+        elif output_mode == GamePadOutput.RightTrigger:
+            vigem.right_trigger_float(gremlin.util.scale_to_range(value, target_min=0.0, target_max=1.0))
+        vigem.update()
+
+    def _gamepad_button(self, data):
+        vigem = self._gamepad(data["index"])
+        if vigem is None:
+            return
+        # the mode holds the translated button code
+        if data["is_pressed"]:
+            vigem.press_button(data["mode"])
+        else:
+            vigem.release_button(data["mode"])
+        vigem.update()
 
 class RPCGremlin():
     ''' remote UDP multicast listener '''
@@ -838,14 +926,14 @@ class RPCGremlin():
         self._running = False
         self._thread = None
         self._server_thread = None
-        self._keep_running = False
+        self._stop_requested = threading.Event()
 
         
 
     def _run(self):
         import struct
         syslog.debug("Starting gremlin listener...")
-        self._server = GremlinServer(('', self._port),GremlinSocketHandler)
+        self._server = GremlinServer(('', self._port))
         self._server_thread = threading.Thread(target=self._server.serve_forever)
         self._server_thread.daemon = True
         try:
@@ -855,10 +943,8 @@ class RPCGremlin():
             mreq = struct.pack('4sL', group, socket.INADDR_ANY)
             self._server.socket.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, mreq)
             syslog.debug(f"Starting gremlin server listener:  multicast group {RPCGremlin.MULTICAST_GROUP} port {self._port} ...")
-            self._keep_running = True
             self._running = True
-            while self._keep_running:
-                time.sleep(1)
+            self._stop_requested.wait()
         except Exception as ex:
             pass
 
@@ -894,6 +980,7 @@ class RPCGremlin():
                 syslog.debug(f"Remote proxy VJOY [{key}] ok")
             except:
                 pass
+        self._stop_requested.clear()
         self._thread = threading.Thread(target=self._run)
         self._thread.start()
 
@@ -905,7 +992,7 @@ class RPCGremlin():
             return
         
         # stop the server loop
-        self._keep_running = False
+        self._stop_requested.set()
         if self._thread.is_alive():
             self._thread.join()
         self._thread = None
@@ -977,9 +1064,19 @@ class RemoteClient(QtCore.QObject):
         self._sock = None
         # unique ID of this client
         self._id = get_guid()
+        self._id_bytes = bytes.fromhex(self._id)
         self._alive_thread = None
         self._alive_thread_stop_requested = False
 
+        # joystick output is collected and sent once per batch interval
+        self._batch = gremlin.remote_protocol.BatchBuilder()
+        self._batch_interval = config.remote_batch_interval / 1000.0
+        self._batch_task = None
+        self._batch_lock = threading.Lock()
+        self._sequence = 0
+        # output of continuously updated inputs leaves once per tick
+        gremlin.tick.TickService().add_flush_handler(self.flush)
+
 
     def start(self):
         ''' creates a multicast client send socket'''
@@ -1006,6 +1103,7 @@ class RemoteClient(QtCore.QObject):
 
     def stop(self):
         ''' closes the client socket'''
+        self.flush()
         if self._alive_thread:
             syslog.debug("Alive stop requested...")
             self._alive_thread_stop_requested = True
@@ -1042,18 +1140,39 @@ class RemoteClient(QtCore.QObject):
             self.ensure_socket()
             self._sock.sendto(data, self._address)
 
+    def _queued(self, count):
+        ''' schedules sending the batch after an output change was added to it
+
+        :param count number of records in the batch
+        '''
+        if count >= gremlin.remote_protocol.MAX_RECORDS:
+            self.flush()
+            return
+        with self._batch_lock:
+            if self._batch_task is None:
+                self._batch_task = gremlin.scheduler.Scheduler().schedule(self._batch_interval, self.flush)
+
+    def flush(self):
+        ''' sends all collected joystick output as one datagram '''
+        with self._batch_lock:
+            if self._batch_task is not None:
+                # no-op if this is the task running the flush
+                self._batch_task.cancel()
+                self._batch_task = None
+            records = self._batch.take()
+            if not records:
+                return
+            self._sequence = (self._sequence + 1) & 0xFFFFFFFF
+            raw_data = gremlin.remote_protocol.encode(self._id_bytes, self._sequence, records)
+            try:
+                self._send(raw_data)
+            except OSError as ex:
+                syslog.error(f"Remote client: unable to send output: {ex}")
+
     def send_button(self, device_id, button_id, is_pressed, force_remote = False):
         ''' handles a remote joystick event '''
         if self.enabled or force_remote:
-            data = {}
-            data["sender"] = self._id
-            data["action"] = "button"
-            data["device"] = device_id
-            data["target"] = button_id
-            data["value"] = is_pressed
-            raw_data = msgpack.packb(data)
-            self._send(raw_data)
-            #syslog.debug(f"remote gremlin event set button: {device_id} {button_id} {is_pressed}")
+            self._queued(self._batch.button(device_id, button_id, is_pressed))
 
     def toggle_button(self, device_id, button_id, force_remote = False):
         ''' toggles a button '''
@@ -1070,40 +1189,17 @@ class RemoteClient(QtCore.QObject):
     def send_axis(self, device_id, axis_id, value, force_remote = False):
         ''' handles a remote joystick event '''
         if self.enabled or force_remote:
-            data = {}
-            data["sender"] = self._id
-            data["action"] = "axis"
-            data["device"] = device_id
-            data["target"] = axis_id
-            data["value"] = value
-            raw_data = msgpack.packb(data)
-            self._send(raw_data)
-            #syslog.debug(f"remote gremlin event set axis: {device_id} {axis_id} {value}")
+            self._queued(self._batch.axis(device_id, axis_id, value))
 
     def send_relative_axis(self, device_id, axis_id, value, force_remote = False):
         ''' handles a remote relative axis joystick event '''
         if self.enabled or force_remote:
-            data = {}
-            data["sender"] = self._id
-            data["action"] = "relative_axis"
-            data["device"] = device_id
-            data["target"] = axis_id
-            data["value"] = value
-            raw_data = msgpack.packb(data)
-            self._send(raw_data)
+            self._queued(self._batch.relative_axis(device_id, axis_id, value))
 
     def send_hat(self, device_id, hat_id, direction, force_remote = False):
         ''' handles a remote joystick event '''
         if self.enabled or force_remote:
-            data = {}
-            data["sender"] = self._id
-            data["action"] = "hat"
-            data["device"] = device_id
-            data["target"] = hat_id
-            data["value"] = direction
-            raw_data = msgpack.packb(data)
-            self._send(raw_data)
-            #syslog.debug(f"remote gremlin event set hat: {device_id} {hat_id} {direction}")
+            self._queued(self._batch.hat(device_id, hat_id, direction))
 
     def send_key(self, virtual_code, scan_code, flags, force_remote = False):
         ''' handles a key event '''
@@ -1221,6 +1317,11 @@ class RemoteClient(QtCore.QObject):
     def id(self):
         return self._id
 
+    @property
+    def id_bytes(self):
+        ''' id of this client as sent in batched datagrams '''
+        return self._id_bytes
+
             
 
 class OscClient(QtCore.QObject):
@@ -0,0 +1,256 @@
+# -*- coding: utf-8; -*-
+
+# Based on original work by (C) Lionel Ott -  (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Opt-in call counts and latency histograms of the runtime hot paths.
+
+Recording is only done while gremlin.config.runtime_settings.runtime_statistics
+is set, the event handler and execution graphs check that flag once per event
+and time their work with time.perf_counter_ns. The remote input server always
+records the time it takes to apply a received datagram.
+"""
+
+import array
+import json
+import threading
+import time
+
+import gremlin.singleton_decorator
+
+
+class LatencyHistogram:
+
+    """Log-linear histogram of durations in nanoseconds.
+
+    Values are sorted into buckets which split every power of two into
+    sixteen linear sub buckets, keeping the relative error of any reported
+    value below 1/16 across the whole range, similar to an HDR histogram.
+    All buckets are allocated when the histogram is created so recording a
+    value does not allocate. Values beyond the largest bucket are counted
+    in the last bucket.
+    """
+
+    # number of linear sub buckets per power of two as a power of two
+    sub_bucket_bits = 4
+    # largest value that gets its own bucket, 2^40 ns is about 18 minutes
+    max_value_bits = 40
+
+    def __init__(self):
+        """Creates a new, empty histogram."""
+        sub_count = 1 << self.sub_bucket_bits
+        self.bucket_count = sub_count * (self.max_value_bits - self.sub_bucket_bits + 1)
+        self.counts = array.array("q", [0]) * self.bucket_count
+        self.reset()
+
+    def reset(self):
+        """Removes all recorded values."""
+        for i in range(self.bucket_count):
+            self.counts[i] = 0
+        self.count = 0
+        self.total = 0
+        self.minimum = 0
+        self.maximum = 0
+
+    @classmethod
+    def bucket_index(cls, value):
+        """Returns the index of the bucket holding a value.
+
+        :param value non negative value to look up
+        :return index of the bucket, not clamped to the histogram size
+        """
+        shift = value.bit_length() - cls.sub_bucket_bits - 1
+        if shift <= 0:
+            return value
+        return (shift << cls.sub_bucket_bits) + (value >> shift)
+
+    @classmethod
+    def bucket_lower_bound(cls, index):
+        """Returns the smallest value stored in a bucket.
+
+        :param index index of the bucket
+        :return smallest value mapping to the bucket
+        """
+        shift = (index >> cls.sub_bucket_bits) - 1
+        if shift <= 0:
+            return index
+        return (index - (shift << cls.sub_bucket_bits)) << shift
+
+    def record(self, value):
+        """Adds a value to the histogram.
+
+        :param value duration in nanoseconds
+        """
+        if value < 0:
+            value = 0
+        index = self.bucket_index(value)
+        if index >= self.bucket_count:
+            index = self.bucket_count - 1
+        self.counts[index] += 1
+        if self.count == 0 or value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+        self.count += 1
+        self.total += value
+
+    @property
+    def mean(self):
+        """Returns the mean of all recorded values."""
+        return self.total / self.count if self.count > 0 else 0.0
+
+    def percentile(self, percent):
+        """Returns the value below which a percentage of the values fall.
+
+        :param percent percentage between 0 and 100
+        :return the upper bound of the bucket containing the percentile,
+            limited to the range of the recorded values
+        """
+        if self.count == 0:
+            return 0
+        target = max(1, int(round(self.count * percent / 100.0)))
+        cumulative = 0
+        for index in range(self.bucket_count):
+            cumulative += self.counts[index]
+            if cumulative >= target:
+                upper = self.bucket_lower_bound(index + 1) - 1
+                return max(self.minimum, min(upper, self.maximum))
+        return self.maximum
+
+    def to_dict(self):
+        """Returns a summary of the histogram.
+
+        :return dictionary with the count and the mean, minimum, maximum, and
+            percentile durations in microseconds
+        """
+        return {
+            "count": self.count,
+            "total_us": self.total / 1000.0,
+            "mean_us": self.mean / 1000.0,
+            "min_us": self.minimum / 1000.0,
+            "p50_us": self.percentile(50) / 1000.0,
+            "p90_us": self.percentile(90) / 1000.0,
+            "p99_us": self.percentile(99) / 1000.0,
+            "max_us": self.maximum / 1000.0,
+        }
+
+
+@gremlin.singleton_decorator.SingletonDecorator
+class Instrumentation:
+
+    """Collects the runtime statistics of the event processing.
+
+    Statistics are kept per input, keyed by (device_guid, input_type,
+    identifier), per execution graph, keyed by the name of the container or
+    action set the graph executes, per functor type, and per type of
+    received remote message. The histogram of a key is created the first
+    time the key is seen.
+    """
+
+    def __init__(self):
+        self.inputs = {}
+        self.graphs = {}
+        self.functors = {}
+        self.remote = {}
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def _histogram(self, table, key):
+        histogram = table.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = table.get(key)
+                if histogram is None:
+                    histogram = LatencyHistogram()
+                    table[key] = histogram
+        return histogram
+
+    def record_input(self, event, elapsed):
+        """Records the time spent running the callbacks and functors of an input.
+
+        :param event the event that was handled
+        :param elapsed duration in nanoseconds
+        """
+        key = (event.device_guid, event.event_type, event.identifier)
+        self._histogram(self.inputs, key).record(elapsed)
+
+    def record_graph(self, name, elapsed):
+        """Records the time spent executing an execution graph.
+
+        :param name name of the container or action set of the graph
+        :param elapsed duration in nanoseconds
+        """
+        self._histogram(self.graphs, name).record(elapsed)
+
+    def record_functor(self, functor, elapsed):
+        """Records the time spent in a functor's process_event.
+
+        :param functor the functor that was executed
+        :param elapsed duration in nanoseconds
+        """
+        self._histogram(self.functors, type(functor).__name__).record(elapsed)
+
+    def record_remote(self, name, elapsed):
+        """Records the time from receiving a remote datagram to its output.
+
+        :param name type of the received message
+        :param elapsed duration in nanoseconds
+        """
+        self._histogram(self.remote, name).record(elapsed)
+
+    def reset(self):
+        """Removes all recorded statistics."""
+        with self._lock:
+            self.inputs = {}
+            self.graphs = {}
+            self.functors = {}
+            self.remote = {}
+            self.started = time.time()
+
+    def snapshot(self):
+        """Returns the current statistics.
+
+        :return dictionary with the lists of "inputs", "graphs", "functors",
+            and "remote" entries, each sorted by descending total time
+        """
+        def entries(table, describe):
+            result = []
+            for key, histogram in list(table.items()):
+                entry = describe(key)
+                entry.update(histogram.to_dict())
+                result.append(entry)
+            result.sort(key=lambda x: x["total_us"], reverse=True)
+            return result
+
+        return {
+            "started": self.started,
+            "duration": time.time() - self.started,
+            "inputs": entries(self.inputs, lambda key: {
+                "device_guid": str(key[0]),
+                "input_type": getattr(key[1], "name", str(key[1])),
+                "identifier": str(key[2]),
+            }),
+            "graphs": entries(self.graphs, lambda key: {"name": key}),
+            "functors": entries(self.functors, lambda key: {"name": key}),
+            "remote": entries(self.remote, lambda key: {"name": key}),
+        }
+
+    def export(self, fname):
+        """Writes the current statistics to a JSON file.
+
+        :param fname path of the file to write
+        """
+        with open(fname, "w") as out:
+            json.dump(self.snapshot(), out, indent=2)
@@ -0,0 +1,97 @@
+# -*- coding: utf-8; -*-
+
+# Based on original work by (C) Lionel Ott -  (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Keyboard state and key chords as bitsets over a dense key index."""
+
+import threading
+
+import gremlin.singleton_decorator
+
+
+@gremlin.singleton_decorator.SingletonDecorator
+class KeyIndex:
+
+    """Assigns every key id a bit of the keyboard state bitset.
+
+    Key ids are (scan_code, is_extended) tuples, mouse buttons use the
+    scan code of the button offset by 0x1000. Bits are handed out in the
+    order keys are first seen, so the bitsets stay as small as the number
+    of keys actually in use. The keyboard state is an integer with the
+    bits of all pressed keys set, a chord is the mask of the bits of its
+    keys and is held when state & mask == mask.
+    """
+
+    def __init__(self):
+        self._bits = {}
+        self._keys = []
+        self._lock = threading.Lock()
+
+    def bit(self, key_id):
+        """Returns the bit representing a key.
+
+        :param key_id (scan_code, is_extended) tuple of the key
+        :return integer with the single bit of the key set
+        """
+        bit = self._bits.get(key_id)
+        if bit is None:
+            with self._lock:
+                bit = self._bits.get(key_id)
+                if bit is None:
+                    bit = 1 << len(self._keys)
+                    self._keys.append(key_id)
+                    self._bits[key_id] = bit
+        return bit
+
+    def mask(self, key_ids):
+        """Returns the chord mask of a set of keys.
+
+        :param key_ids iterable of (scan_code, is_extended) tuples
+        :return integer with the bits of all keys set
+        """
+        mask = 0
+        for key_id in key_ids:
+            mask |= self.bit(key_id)
+        return mask
+
+    def keys(self, state):
+        """Returns the keys set in a bitset.
+
+        :param state keyboard state or chord mask
+        :return list of (scan_code, is_extended) tuples
+        """
+        return [key_id for index, key_id in enumerate(self._keys) if state >> index & 1]
+
+
+def update(state, bit, is_pressed):
+    """Returns a keyboard state with the bit of a key set or cleared.
+
+    :param state current keyboard state
+    :param bit bit of the key as returned by KeyIndex.bit
+    :param is_pressed True if the key is pressed
+    :return the new keyboard state
+    """
+    return state | bit if is_pressed else state & ~bit
+
+
+def is_held(state, mask):
+    """Returns True if all keys of a chord are pressed.
+
+    :param state keyboard state
+    :param mask chord mask as returned by KeyIndex.mask
+    :return True if every bit of the mask is set in the state
+    """
+    return state & mask == mask
@@ -18,10 +18,11 @@
 import collections
 import ctypes
 from ctypes import wintypes
-import functools
+import heapq
+import itertools
 import logging
 import time
-from threading import Event, Lock, Thread
+from threading import Condition, Thread, current_thread
 from lxml import etree as ElementTree
 
 from PySide6 import QtCore
@@ -41,12 +42,6 @@ import gremlin.input_devices
 
 
 
-MacroEntry = collections.namedtuple(
-    "MacroEntry",
-    ["macro", "state", "is_local", "is_remote"]
-)
-
-
 def _create_function(lib_name, fn_name, param_types, return_type):
     """Creates a handle to a windows dll library function.
 
@@ -294,18 +289,78 @@ def key_from_name(name, validate = False):
 
 
 
+class _MacroRun:
+
+    """Execution state of a single run of a macro.
+
+    A run is executed by the worker pool one step at a time, a step runs
+    the actions up to the next pause after which the run is put back into
+    the run queue, due once the pause has elapsed.
+    """
+
+    def __init__(self, macro, is_local, is_remote):
+        """Creates a new run.
+
+        :param macro the macro being run
+        :param is_local true if the actions are sent locally
+        :param is_remote true if the actions are sent to the remote client
+        """
+        self.macro = macro
+        # one shot macros forward the forced remote flag to their actions
+        if macro.repeat is None:
+            self.args = (is_local, is_remote, macro.force_remote)
+        else:
+            self.args = (is_local, is_remote)
+        self.index = 0
+        self.iteration = 0
+        # no further repetition is started once terminated
+        self.terminated = False
+        # no further action is executed once cancelled
+        self.cancelled = False
+
+
+class _MacroState:
+
+    """Scheduling state of a macro, keyed by the macro's id."""
+
+    def __init__(self, macro):
+        self.macro = macro
+        # run currently executing, None if the macro is idle
+        self.run = None
+        # (is_local, is_remote) of requests waiting for the current run to end
+        self.waiting = collections.deque()
+        # number of requests of this macro waiting behind an exclusive macro
+        self.blocked = 0
+        # incremented on termination to invalidate blocked requests
+        self.generation = 0
+
+
 @SingletonDecorator
 class MacroManager:
 
-    """Manages the proper dispatching and scheduling of macros."""
+    """Manages the proper dispatching and scheduling of macros.
+
+    Macros are executed by a fixed pool of worker threads which take runs
+    from a run queue ordered by the time they are next due. Pauses do not
+    block a worker, instead the remainder of the macro is queued again to
+    run once the pause has elapsed.
+    """
+
+    # number of threads executing macro steps
+    worker_count = 4
 
     def __init__(self):
         """Initializes the instance."""
-        self._active = {}
-        self._queue = []
-        self._flags = {}
-        self._flags_lock = Lock()
-        self._queue_lock = Lock()
+        # macro id -> _MacroState
+        self._states = {}
+        # heap of (due, counter, _MacroRun) entries
+        self._run_queue = []
+        self._counter = itertools.count()
+        # (state, generation, is_local, is_remote) requests held back while
+        # an exclusive macro is waiting to start or running
+        self._blocked = collections.deque()
+        self._active_count = 0
+        self._condition = Condition()
 
         # Default delay between subsequent message dispatch. This is to get
         # around some games not picking up messages if they are sent in too
@@ -314,42 +369,63 @@ class MacroManager:
 
         self._is_executing_exclusive = False
         self._is_running = False
-        self._schedule_event = Event()
 
-        self._run_scheduler_thread = None
+        self._workers = []
 
     def start(self):
-        """Starts the scheduler."""
-        self._active = {}
-        self._flags = {}
-        self._is_running = True
-        if self._run_scheduler_thread is None:
-            self._run_scheduler_thread = Thread(target=self._run_scheduler)
-        if not self._run_scheduler_thread.is_alive():
-            self._run_scheduler_thread.start()
+        """Starts the worker pool."""
+        with self._condition:
+            self._is_running = True
+            self._workers = [
+                worker for worker in self._workers if worker.is_alive()
+            ]
+            while len(self._workers) < self.worker_count:
+                worker = Thread(target=self._run_worker, daemon=True)
+                self._workers.append(worker)
+                worker.start()
+            self._condition.notify_all()
 
     def stop(self):
-        """Stops the scheduler."""
-        self._is_running = False
-        if self._run_scheduler_thread is not None and \
-                self._run_scheduler_thread.is_alive():
+        """Stops the worker pool and waits for the workers to exit.
 
-            # Terminate the scheduler
-            self._schedule_event.set()
-            self._run_scheduler_thread.join()
-            self._run_scheduler_thread = None
-
-            # Terminate any macro that is still active
-            with self._flags_lock:
-                for key, value in self._flags.items():
-                    self._flags[key] = False
+        Runs under way are cancelled before their next action and
+        requests that have not started yet are discarded, so this only
+        waits for the actions executing at the time of the call. Once
+        this returns no macro action is executing, so the caller can
+        release the output devices.
+        """
+        with self._condition:
+            self._is_running = False
+            for state in self._states.values():
+                state.waiting.clear()
+                state.blocked = 0
+                state.generation += 1
+                if state.run is not None:
+                    state.run.cancelled = True
+            self._blocked.clear()
+            # runs waiting in the queue, such as paused ones, end right away
+            queued = [entry[2] for entry in self._run_queue]
+            self._run_queue.clear()
+            for run in queued:
+                self._finish(run)
+            for state in list(self._states.values()):
+                self._release(state)
+            self._condition.notify_all()
+            workers = self._workers
+            self._workers = []
+
+        # a macro action stopping the manager cannot wait for its own worker
+        current = current_thread()
+        for worker in workers:
+            if worker is not current:
+                worker.join()
 
     def queue_macro(self, macro, is_local = None, is_remote = None):
         """Queues a macro in the schedule taking the repeat type into account.
 
         :param macro the macro to add to the scheduler
         """
-        if isinstance(macro.repeat, ToggleRepeat) and macro.id in self._active:
+        if isinstance(macro.repeat, ToggleRepeat) and self.is_active(macro):
             self.terminate_macro(macro)
         else:
             # Preprocess macro to contain pauses as necessary
@@ -359,156 +435,233 @@ class MacroManager:
                 is_remote = macro.is_remote
 
             self._preprocess_macro(macro)
-            with self._queue_lock:
-                self._queue.append(MacroEntry(macro, True, is_local, is_remote))
-            self._schedule_event.set()
+            with self._condition:
+                state = self._states.get(macro.id)
+                if state is None:
+                    state = _MacroState(macro)
+                    self._states[macro.id] = state
+                self._admit(state, is_local, is_remote)
 
     def terminate_macro(self, macro):
-        """Adds a termination request for a macro to the execution queue.
+        """Terminates a macro and discards any of its queued requests.
+
+        A repeating macro stops at the end of its current repetition.
 
         :param macro the macro to terminate
         """
-        self._queue.append(MacroEntry(macro, False, macro.is_local, macro.is_remote))
-        self._schedule_event.set()
-
-    def _run_scheduler(self):
-        """Dispatches macros as required."""
-        while self._is_running:
-            # Wake up when the event triggers and reset it
-            self._schedule_event.wait()
-            self._schedule_event.clear()
-
-            # Run scheduled macros and ensure exclusive ones run separately
-            # from all other macros
-            with self._queue_lock:
-                entries_to_remove = []
-                has_exclusive = False
-                for i, entry in enumerate(self._queue):
-                    # Terminate macro if needed
-                    if entry.state is False:
-                        if entry.macro.id in self._flags \
-                                and self._flags[entry.macro.id]:
-                            # Terminate currently running macro
-                            with self._flags_lock:
-                                self._flags[entry.macro.id] = False
-                            # del self._queue[i]
-
-                            # Remove all queued up macros with the same id as
-                            # they should have been impossible to queue up
-                            # in the first place
-                            removal_list = []
-                            for queue_entry in self._queue:
-                                if queue_entry.macro.id == entry.macro.id:
-                                    removal_list.append(queue_entry)
-                            for queue_entry in removal_list:
-                                self._queue.remove(queue_entry)
-                    # Don't run a queued macro if the same instance is already
-                    # running
-                    elif entry.macro.id in self._active:
-                        continue
-                    # Handle exclusive macros
-                    elif entry.macro.exclusive:
-                        has_exclusive = True
-                        if len(self._active) == 0:
-                            self._dispatch_macro(entry.macro, entry.is_local, entry.is_remote)
-                            self._is_executing_exclusive = True
-                            entries_to_remove.append(entry)
-                    # Start a queued up macro
-                    elif not has_exclusive and not self._is_executing_exclusive:
-                        self._dispatch_macro(entry.macro, entry.is_local, entry.is_remote)
-                        entries_to_remove.append(entry)
-
-                # Remove all entries we've processed
-                for entry in entries_to_remove:
-                    if entry in self._queue:
-                        self._queue.remove(entry)
-
-    def _dispatch_macro(self, macro, is_local = None, is_remote = None):
-        """Dispatches a single macro to be run.
+        with self._condition:
+            state = self._states.get(macro.id)
+            if state is None:
+                return
+            state.waiting.clear()
+            state.generation += 1
+            if state.run is not None:
+                state.run.terminated = True
+            self._release(state)
+
+    def is_active(self, macro):
+        """Returns True if a macro is currently running.
+
+        :param macro the macro to check
+        :return True if a run of the macro is in progress
+        """
+        state = self._states.get(macro.id)
+        return state is not None and state.run is not None
+
+    def _admit(self, state, is_local, is_remote):
+        """Starts a requested run or holds it back until it can start.
 
-        :param macro the macro to dispatch
+        Must be called with the condition held.
+
+        :param state scheduling state of the macro to run
         :param is_local true if local control, set to None to use the macro flag
         :param is_remote true if remote control, set to None to use the macro flag
         """
-        if macro.id not in self._active:
-            self._active[macro.id] = macro
-            Thread(target=functools.partial(self._execute_macro, macro, is_local, is_remote)).start()
+        if state.run is not None:
+            # the same macro cannot run twice at the same time
+            state.waiting.append((is_local, is_remote))
+        elif self._blocked or not self._can_start(state.macro):
+            state.blocked += 1
+            self._blocked.append((state, state.generation, is_local, is_remote))
         else:
-            logging.getLogger("system").warning(
-                "Attempting to dispatch an already running macro"
-            )
+            self._dispatch_macro(state, is_local, is_remote)
 
-    def _execute_macro(self, macro, is_local = None, is_remote = None):
-        """Executes a given macro in a separate thread.
+    def _can_start(self, macro):
+        """Returns True if exclusivity allows a macro to start now.
 
-        This method will run all provided actions and once they all have been
-        executed will remove the macro from the set of active macros and
-        inform the scheduler of the completion.
-
-        The macro flags is_local/is_remote control where the macro actions are sent
-
-        :param macro the macro object to be executed
+        :param macro the macro to check
+        :return True if the macro can be started
         """
-        # Handle macros with a repeat mode
-        # if not is_local:
-        #     is_local = macro.is_local
-        # if not is_remote:
-        #     is_remote = macro.is_remote
+        if self._is_executing_exclusive:
+            return False
+        return not macro.exclusive or self._active_count == 0
+
+    def _dispatch_macro(self, state, is_local = None, is_remote = None):
+        """Dispatches a single macro to be run.
 
+        Must be called with the condition held.
 
+        :param state scheduling state of the macro to dispatch
+        :param is_local true if local control, set to None to use the macro flag
+        :param is_remote true if remote control, set to None to use the macro flag
+        """
+        macro = state.macro
         (state_is_local, state_is_remote) = gremlin.input_devices.remote_state.state
         if not is_remote:
             is_remote = state_is_remote
         if not is_local:
             is_local = state_is_local
-        
+
         if macro.force_remote:
             is_remote = True
             is_local = False
 
+        state.run = _MacroRun(macro, is_local, is_remote)
+        self._active_count += 1
+        if macro.exclusive:
+            self._is_executing_exclusive = True
+        self._push(state.run, 0.0)
 
-        if macro.repeat is not None:
-            delay = macro.repeat.delay
+    def _push(self, run, delay):
+        """Adds a run to the run queue.
 
-            with self._flags_lock:
-                self._flags[macro.id] = True
+        Must be called with the condition held.
 
-            # Handle count repeat mode
-            if isinstance(macro.repeat, CountRepeat):
-                count = 0
-                while count < macro.repeat.count and self._flags[macro.id]:
-                    for action in macro.sequence:
-                        action(is_local, is_remote)
-                    count += 1
-                    time.sleep(delay)
+        :param run the run to queue
+        :param delay time in seconds after which the run is due
+        """
+        heapq.heappush(
+            self._run_queue,
+            (time.perf_counter() + delay, next(self._counter), run)
+        )
+        self._condition.notify()
+
+    def _run_worker(self):
+        """Executes due runs until the manager is stopped and idle."""
+        while True:
+            with self._condition:
+                while True:
+                    if self._run_queue:
+                        delay = self._run_queue[0][0] - time.perf_counter()
+                        if delay <= 0:
+                            run = heapq.heappop(self._run_queue)[2]
+                            break
+                        self._condition.wait(delay)
+                    elif not self._is_running:
+                        return
+                    else:
+                        self._condition.wait()
+            self._execute_step(run)
+
+    def _execute_step(self, run):
+        """Executes the actions of a run up to its next pause.
+
+        Repeating macros check for termination at the start of each
+        repetition only, so a repetition is never cut short. A cancelled
+        run ends before its next action.
+
+        :param run the run to execute
+        """
+        macro = run.macro
+        if run.index == 0 and macro.repeat is not None \
+                and not self._should_repeat(run):
+            self._finish(run)
+            return
 
-            # Handle continuous repeat modes
-            elif type(macro.repeat) in [HoldRepeat, ToggleRepeat]:
-                while self._flags[macro.id]:
-                    for action in macro.sequence:
-                        action(is_local, is_remote)
-                    time.sleep(delay)
+        sequence = macro.sequence
+        try:
+            while run.index < len(sequence):
+                if run.cancelled:
+                    self._finish(run)
+                    return
+                action = sequence[run.index]
+                run.index += 1
+                if isinstance(action, PauseAction):
+                    with self._condition:
+                        if not run.cancelled:
+                            self._push(run, action.pause_duration())
+                            return
+                    self._finish(run)
+                    return
+                action(*run.args)
+        except Exception as e:
+            logging.getLogger("system").error(
+                f"Macro {macro.id} failed, terminating it: {e}"
+            )
+            self._finish(run)
+            return
 
-        # Handle simple one shot macros
-        else:
-            for action in macro.sequence:
-                action(is_local, is_remote, macro.force_remote)
+        run.index = 0
+        run.iteration += 1
+        if macro.repeat is None:
             # indicate the macro is done
             if macro.completed_callback:
                 macro.completed_callback()
+            self._finish(run)
+        else:
+            with self._condition:
+                if not run.cancelled:
+                    self._push(run, macro.repeat.delay)
+                    return
+            self._finish(run)
 
-        # Remove macro from active set, notify manager, and remove any
-        # potential callbacks
-        try:
-            del self._active[macro.id]
-            if macro.exclusive:
+    def _should_repeat(self, run):
+        """Returns True if a repeating macro runs another repetition.
+
+        :param run the run of the repeating macro
+        :return True if the next repetition is to be executed
+        """
+        if run.terminated or run.cancelled:
+            return False
+        if isinstance(run.macro.repeat, CountRepeat):
+            return run.iteration < run.macro.repeat.count
+        return type(run.macro.repeat) in [HoldRepeat, ToggleRepeat]
+
+    def _finish(self, run):
+        """Removes a completed run and starts runs waiting on it.
+
+        :param run the completed run
+        """
+        with self._condition:
+            finished = self._states.get(run.macro.id)
+            if finished is None or finished.run is not run:
+                return
+            finished.run = None
+            self._active_count -= 1
+            if run.macro.exclusive:
                 self._is_executing_exclusive = False
-            with self._flags_lock:
-                if macro.id in self._flags:
-                    self._flags[macro.id] = False
-            self._schedule_event.set()
-        except:
-            pass
+
+            if finished.waiting:
+                is_local, is_remote = finished.waiting.popleft()
+                self._admit(finished, is_local, is_remote)
+
+            # Start held back requests in order until one has to wait again
+            while self._blocked:
+                state, generation, is_local, is_remote = self._blocked[0]
+                if generation == state.generation and state.run is None \
+                        and not self._can_start(state.macro):
+                    break
+                self._blocked.popleft()
+                state.blocked -= 1
+                if generation != state.generation:
+                    self._release(state)
+                elif state.run is not None:
+                    state.waiting.append((is_local, is_remote))
+                else:
+                    self._dispatch_macro(state, is_local, is_remote)
+
+            self._release(finished)
+
+    def _release(self, state):
+        """Forgets the state of a macro that is idle.
+
+        Must be called with the condition held.
+
+        :param state scheduling state of the macro
+        """
+        if state.run is None and not state.waiting \
+                and state.blocked == 0:
+            self._states.pop(state.macro.id, None)
 
     def _preprocess_macro(self, macro):
         """Inserts pauses as necessary into the macro."""
@@ -839,9 +992,15 @@ class PauseAction(MacroAbstractAction):
         self.duration_max = duration_max
         self.is_random = is_random
 
-    def __call__(self, is_local = None, is_remote = None, force_remote = None):
+    def pause_duration(self):
+        """Returns the duration of the next pause.
+
+        The macro manager schedules the remainder of a macro after this
+        duration instead of calling the action.
+
+        :return duration of the pause in seconds
+        """
         import random
-        # is_local, is_remote = self._update_flags(is_local, is_remote, force_remote)
         if self.is_random:
             # random pause
             duration_min = self.duration
@@ -854,8 +1013,10 @@ class PauseAction(MacroAbstractAction):
                 duration = random.uniform(0, duration_min)
         else:
             duration = self.duration
+        return duration
 
-        time.sleep(duration)
+    def __call__(self, is_local = None, is_remote = None, force_remote = None):
+        time.sleep(self.pause_duration())
 
 
 class VJoyMacroAction(MacroAbstractAction):
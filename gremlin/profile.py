@@ -63,29 +63,55 @@ class ProfileConverter:
     def is_current(self, fname):
         """Returns whether or not the provided profile is current.
 
+        Only the root element is read to determine the version.
+
         :param fname path to the profile to evaluate
         """
         if not os.path.isfile(fname):
             return True
-        
-        tree = ElementTree.parse(fname)
-        root = tree.getroot()
+        return self.is_current_version(self.sniff_version(fname))
+
+    def is_current_root(self, root):
+        """Returns whether or not an already parsed profile is current.
+
+        :param root root node of the profile to evaluate
+        """
+        return self.is_current_version(self._determine_version(root))
+
+    def is_current_version(self, version):
+        """Returns whether or not a profile version needs no conversion.
 
-        version = self._determine_version(root)
+        :param version version of the profile
+        :return True if the version is current
+        """
         return version == ProfileConverter.current_version or version == 9
 
-    def convert_profile(self, fname):
+    def sniff_version(self, fname):
+        """Returns the version of a profile without parsing all of it.
+
+        :param fname path to the profile
+        :return version of the profile
+        """
+        with open(fname, "rb") as source:
+            for _, element in ElementTree.iterparse(source, events=("start",)):
+                return self._determine_version(element)
+        raise error.ProfileError("Empty profile encountered")
+
+    def convert_profile(self, fname, tree=None):
         """Converts the provided profile to the current version.
 
         :param fname path to the profile to convert
+        :param tree the already parsed profile, parsed from the file if None
+        :return root node of the converted profile
         """
         # Load the profile
-        tree = ElementTree.parse(fname)
+        if tree is None:
+            tree = ElementTree.parse(fname)
         root = tree.getroot()
 
         # Check if a conversion is required
-        if self.is_current(fname):
-            return
+        if self.is_current_root(root):
+            return root
 
         conversion_map = {
             1: self._convert_from_v1,
@@ -120,8 +146,10 @@ class ProfileConverter:
             # with open(fname, "w") as out:
             #     out.write(dom_xml.toprettyxml(indent="    ", newl="\n"))
 
-            tree = ElementTree.tostring(new_root)
-            tree.write(fname, pretty_print=True,xml_declaration=True,encoding="utf-8")
+            ElementTree.ElementTree(new_root).write(
+                fname, pretty_print=True, xml_declaration=True, encoding="utf-8"
+            )
+            return new_root
         else:
             raise error.ProfileError("Failed to convert profile")
 
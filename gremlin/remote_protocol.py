@@ -0,0 +1,281 @@
+# -*- coding: utf-8; -*-
+
+# Based on original work by (C) Lionel Ott -  (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Binary wire format of batched remote joystick output.
+
+A datagram consists of a fixed header followed by a number of fixed size
+records, all little endian:
+
+    header  magic "GX" (2s), version (B), sender id (16s), sequence (I),
+            record count (H)
+    record  opcode (B), device id (B), target id (H), value (f)
+
+Axis values are the absolute value in [-1, 1], relative axis values the
+change to apply, button values 1.0 for pressed and 0.0 for released, and
+hat values the direction (x, y) encoded as 3 * (x + 1) + (y + 1).
+
+Remote datagrams in the older msgpack format always start with a map
+marker, which can never be the first byte of the magic, so both formats can
+be received on the same socket.
+"""
+
+import struct
+import threading
+
+
+MAGIC = b"GX"
+VERSION = 1
+
+HEADER = struct.Struct("<2sB16sIH")
+RECORD = struct.Struct("<BBHf")
+
+# largest number of records in a datagram, keeps datagrams below the MTU
+MAX_RECORDS = 160
+
+# record opcodes
+OP_AXIS = 1
+OP_BUTTON = 2
+OP_HAT = 3
+OP_RELATIVE_AXIS = 4
+
+# opcodes of messages only sent in the msgpack format
+OP_HEARTBEAT = 16
+OP_KEY = 17
+OP_MOUSE_BUTTON = 18
+OP_MOUSE_WHEEL = 19
+OP_MOUSE_HWHEEL = 20
+OP_MOUSE_MOTION = 21
+OP_MOUSE_ACCELERATION = 22
+OP_GAMEPAD_AXIS = 23
+OP_GAMEPAD_BUTTON = 24
+
+_opcode_names = {
+    OP_AXIS: "axis",
+    OP_BUTTON: "button",
+    OP_HAT: "hat",
+    OP_RELATIVE_AXIS: "relative axis",
+    OP_HEARTBEAT: "heartbeat",
+    OP_KEY: "key",
+    OP_MOUSE_BUTTON: "mouse button",
+    OP_MOUSE_WHEEL: "mouse wheel",
+    OP_MOUSE_HWHEEL: "mouse horizontal wheel",
+    OP_MOUSE_MOTION: "mouse motion",
+    OP_MOUSE_ACCELERATION: "mouse acceleration",
+    OP_GAMEPAD_AXIS: "gamepad axis",
+    OP_GAMEPAD_BUTTON: "gamepad button",
+}
+
+
+def opcode_name(opcode):
+    """Returns a readable name of an opcode.
+
+    :param opcode the opcode
+    :return name of the opcode
+    """
+    return _opcode_names.get(opcode, f"opcode {opcode}")
+
+
+def encode_hat(direction):
+    """Returns the record value of a hat direction.
+
+    :param direction (x, y) tuple with values in -1, 0, 1
+    :return value encoding the direction
+    """
+    x, y = direction
+    return float(3 * (x + 1) + (y + 1))
+
+
+def decode_hat(value):
+    """Returns the hat direction encoded in a record value.
+
+    :param value record value created by encode_hat
+    :return (x, y) direction tuple
+    """
+    code = int(value)
+    return (code // 3 - 1, code % 3 - 1)
+
+
+def is_batch(data):
+    """Returns True if a datagram uses the batched binary format.
+
+    :param data the received datagram
+    :return True if the datagram starts with the batch magic
+    """
+    return data[:2] == MAGIC
+
+
+def encode(sender, sequence, records):
+    """Creates a datagram holding a batch of records.
+
+    :param sender 16 byte id of the sending instance
+    :param sequence sequence number of the datagram
+    :param records list of (opcode, device_id, target_id, value) tuples
+    :return the encoded datagram
+    """
+    buffer = bytearray(HEADER.size + RECORD.size * len(records))
+    HEADER.pack_into(
+        buffer, 0, MAGIC, VERSION, sender, sequence & 0xFFFFFFFF, len(records)
+    )
+    offset = HEADER.size
+    for record in records:
+        RECORD.pack_into(buffer, offset, *record)
+        offset += RECORD.size
+    return bytes(buffer)
+
+
+def decode(data):
+    """Decodes a batched datagram.
+
+    :param data the received datagram
+    :return tuple of the sender id, the sequence number, and the list of
+        (opcode, device_id, target_id, value) records, None if the datagram
+        is truncated or of an unknown version
+    """
+    if len(data) < HEADER.size:
+        return None
+    magic, version, sender, sequence, count = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        return None
+    if len(data) < HEADER.size + count * RECORD.size:
+        return None
+    records = list(RECORD.iter_unpack(
+        memoryview(data)[HEADER.size:HEADER.size + count * RECORD.size]
+    ))
+    return sender, sequence, records
+
+
+class BatchBuilder:
+
+    """Collects output changes until they are sent as one datagram.
+
+    Absolute axis values are coalesced so only the latest value of each
+    axis is sent, relative axis changes are summed. Button and hat changes
+    are kept in the order they were made and are sent ahead of the axes.
+    All methods can be called from any thread.
+    """
+
+    def __init__(self):
+        self._events = []
+        # (device_id, axis_id) -> latest value
+        self._axes = {}
+        # (device_id, axis_id) -> summed change
+        self._relative_axes = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Returns the number of records the batch would contain."""
+        return len(self._events) + len(self._axes) + len(self._relative_axes)
+
+    def axis(self, device_id, axis_id, value):
+        """Sets the value of an axis.
+
+        :param device_id id of the vJoy device
+        :param axis_id id of the axis
+        :param value axis value in [-1, 1]
+        :return number of records in the batch
+        """
+        with self._lock:
+            self._axes[(device_id, axis_id)] = value
+            return len(self)
+
+    def relative_axis(self, device_id, axis_id, value):
+        """Adds a change to an axis.
+
+        :param device_id id of the vJoy device
+        :param axis_id id of the axis
+        :param value change to apply to the axis value
+        :return number of records in the batch
+        """
+        key = (device_id, axis_id)
+        with self._lock:
+            self._relative_axes[key] = self._relative_axes.get(key, 0.0) + value
+            return len(self)
+
+    def button(self, device_id, button_id, is_pressed):
+        """Adds a button change.
+
+        :param device_id id of the vJoy device
+        :param button_id id of the button
+        :param is_pressed True if the button is pressed
+        :return number of records in the batch
+        """
+        with self._lock:
+            self._events.append(
+                (OP_BUTTON, device_id, button_id, 1.0 if is_pressed else 0.0)
+            )
+            return len(self)
+
+    def hat(self, device_id, hat_id, direction):
+        """Adds a hat change.
+
+        :param device_id id of the vJoy device
+        :param hat_id id of the hat
+        :param direction (x, y) direction of the hat
+        :return number of records in the batch
+        """
+        with self._lock:
+            self._events.append(
+                (OP_HAT, device_id, hat_id, encode_hat(direction))
+            )
+            return len(self)
+
+    def take(self):
+        """Removes and returns the collected records.
+
+        :return list of (opcode, device_id, target_id, value) tuples
+        """
+        with self._lock:
+            records = self._events
+            records.extend(
+                (OP_AXIS, device_id, axis_id, value)
+                for (device_id, axis_id), value in self._axes.items()
+            )
+            records.extend(
+                (OP_RELATIVE_AXIS, device_id, axis_id, value)
+                for (device_id, axis_id), value in self._relative_axes.items()
+            )
+            self._events = []
+            self._axes = {}
+            self._relative_axes = {}
+        return records
+
+
+class SequenceFilter:
+
+    """Drops datagrams that arrive after a newer one of the same sender."""
+
+    def __init__(self):
+        # sender id -> last accepted sequence number
+        self._last = {}
+
+    def accept(self, sender, sequence):
+        """Returns True if a datagram is newer than any accepted before.
+
+        Sequence numbers wrap around, a datagram is considered newer if it
+        is less than half the sequence range ahead of the last one.
+
+        :param sender id of the sending instance
+        :param sequence sequence number of the datagram
+        :return True if the datagram is to be processed
+        """
+        last = self._last.get(sender)
+        if last is not None:
+            delta = (sequence - last) & 0xFFFFFFFF
+            if delta == 0 or delta >= 0x80000000:
+                return False
+        self._last[sender] = sequence
+        return True
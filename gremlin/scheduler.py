@@ -0,0 +1,196 @@
+# -*- coding: utf-8; -*-
+
+# Based on original work by (C) Lionel Ott -  (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Shared scheduler running delayed and periodic callbacks on one thread."""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+from gremlin.singleton_decorator import SingletonDecorator
+
+
+class ScheduledTask:
+
+    """Handle of a callback registered with the scheduler."""
+
+    __slots__ = ("due", "interval", "callback", "args", "_cancelled", "_done")
+
+    def __init__(self, due, interval, callback, args):
+        """Creates a new instance.
+
+        :param due time, as returned by time.perf_counter, the task is due
+        :param interval repeat interval in seconds, None for one-shot tasks
+        :param callback the callable to run
+        :param args positional arguments passed to the callback
+        """
+        self.due = due
+        self.interval = interval
+        self.callback = callback
+        self.args = args
+        self._cancelled = False
+        self._done = False
+
+    def cancel(self):
+        """Cancels the task, a callback that is already running completes."""
+        self._cancelled = True
+
+    @property
+    def cancelled(self):
+        """Returns True if the task has been cancelled."""
+        return self._cancelled
+
+    @property
+    def pending(self):
+        """Returns True if the task will still run."""
+        return not (self._cancelled or self._done)
+
+
+@SingletonDecorator
+class Scheduler:
+
+    """Runs delayed and periodic callbacks from a single worker thread.
+
+    Tasks are kept in a heap ordered by due time, the worker sleeps until
+    the earliest task is due or a new earlier task is added. Cancellation
+    only flags the task, cancelled entries are dropped when they reach the
+    top of the heap.
+
+    Callbacks run on the worker thread and must not block, long running
+    work delays every other task.
+    """
+
+    # lower bound on the interval of periodic tasks in seconds
+    min_interval = 0.001
+
+    def __init__(self):
+        """Creates a new instance."""
+        self._heap = []
+        # tie breaker keeping tasks due at the same time in insertion order
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._is_running = False
+
+    def schedule(self, delay, callback, *args):
+        """Runs a callback once after the given delay.
+
+        :param delay delay in seconds
+        :param callback the callable to run
+        :param args positional arguments passed to the callback
+        :return ScheduledTask handle which can be used to cancel the task
+        """
+        task = ScheduledTask(
+            time.perf_counter() + max(0.0, delay), None, callback, args
+        )
+        self._push(task)
+        return task
+
+    def schedule_periodic(self, interval, callback, *args, delay=0.0):
+        """Runs a callback repeatedly until the task is cancelled.
+
+        Subsequent runs are scheduled relative to the previous due time
+        rather than the time the callback completed so the period does not
+        drift.
+
+        :param interval time between runs in seconds
+        :param callback the callable to run
+        :param args positional arguments passed to the callback
+        :param delay delay in seconds before the first run
+        :return ScheduledTask handle which can be used to cancel the task
+        """
+        task = ScheduledTask(
+            time.perf_counter() + max(0.0, delay),
+            max(self.min_interval, interval),
+            callback,
+            args
+        )
+        self._push(task)
+        return task
+
+    def stop(self):
+        """Stops the worker thread, pending tasks are discarded."""
+        with self._condition:
+            self._is_running = False
+            self._heap = []
+            self._condition.notify()
+        if self._thread is not None and \
+                self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def _push(self, task):
+        """Adds a task to the heap and wakes the worker if needed.
+
+        :param task the task to add
+        """
+        with self._condition:
+            heapq.heappush(self._heap, (task.due, next(self._counter), task))
+            if not self._is_running:
+                self._is_running = True
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="scheduler",
+                    daemon=True
+                )
+                self._thread.start()
+            elif self._heap[0][2] is task:
+                # new earliest task, the worker has to shorten its wait
+                self._condition.notify()
+
+    def _run(self):
+        """Worker loop executing due tasks."""
+        while True:
+            with self._condition:
+                task = None
+                while self._is_running:
+                    heap = self._heap
+                    if not heap:
+                        self._condition.wait()
+                        continue
+                    due, _, task = heap[0]
+                    if task.cancelled:
+                        heapq.heappop(heap)
+                        task = None
+                        continue
+                    now = time.perf_counter()
+                    if due > now:
+                        self._condition.wait(due - now)
+                        task = None
+                        continue
+                    heapq.heappop(heap)
+                    if task.interval is not None:
+                        # skip runs missed by more than one period instead
+                        # of running them back to back
+                        task.due = max(due + task.interval, now)
+                        heapq.heappush(
+                            heap, (task.due, next(self._counter), task)
+                        )
+                    break
+                if not self._is_running:
+                    return
+
+            try:
+                task.callback(*task.args)
+            except Exception as e:
+                logging.getLogger("system").error(
+                    f"Scheduler: task {task.callback} failed: {e}"
+                )
+            if task.interval is None:
+                task._done = True
@@ -20,11 +20,11 @@ import ctypes
 import ctypes.wintypes
 import enum
 import math
-import threading
 import time
 
 
 from gremlin.util import deg2rad
+import gremlin.tick
 
 from gremlin.singleton_decorator import SingletonDecorator
 
@@ -241,8 +241,7 @@ class MouseController:
         self._motion_type = MotionType.Fixed
         self._delta_generator = FixedMouseMotion(0, 0)
 
-        self._is_running = False
-        self._thread = threading.Thread(target=self._control_loop)
+        self._subscription = None
 
     def set_absolute_motion(self, dx=None, dy=None):
         """Configures a motion using absolute velocities.
@@ -290,26 +289,22 @@ class MouseController:
             self._motion_type = MotionType.Accelerated
 
     def start(self):
-        """Starts the thread that will send motions when required."""
-        if not self._is_running:
-            self._thread = threading.Thread(target=self._control_loop)
-            self._thread.start()
+        """Starts sending motions on the shared tick."""
+        if self._subscription is None or not self._subscription.active:
+            self._subscription = \
+                gremlin.tick.TickService().subscribe(self._update)
 
     def stop(self):
-        """Stops the thread that sends motion events."""
-        if self._thread.is_alive():
-            self._is_running = False
-            self._thread.join()
-
-    def _control_loop(self):
-        """Loop responsible for creating and sending mouse motion events."""
-        self._is_running = True
-
-        while self._is_running:
-            dx, dy = self._delta_generator()
-            if dx != 0 or dy != 0:
-                mouse_relative_motion(int(dx), int(dy))
-            time.sleep(0.01)
+        """Stops sending motion events."""
+        if self._subscription is not None:
+            self._subscription.cancel()
+            self._subscription = None
+
+    def _update(self):
+        """Creates and sends the mouse motion of one tick."""
+        dx, dy = self._delta_generator()
+        if dx != 0 or dy != 0:
+            mouse_relative_motion(int(dx), int(dy))
 
 
 class _MOUSEINPUT(ctypes.Structure):
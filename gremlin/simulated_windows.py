@@ -0,0 +1,186 @@
+# -*- coding: utf-8; -*-
+
+# Based on original work by (C) Lionel Ott -  (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""No-op stand ins for the Windows only modules used by the runtime.
+
+install() is called by the simulated DILL and vJoy backends. On systems
+without the pywin32 modules and the Windows DLL loaders of ctypes it
+registers replacements, so the runtime can be imported and a profile run
+headless on top of the simulated devices. The replacements accept every
+call and do nothing: keys and mouse events are not sent, the keyboard and
+mouse hook threads exit immediately and the foreground process is
+unknown. On Windows the real modules are found and nothing is replaced.
+
+install() has to be called before the gremlin modules using the Windows
+modules are imported.
+"""
+
+import ctypes
+import importlib.util
+import sys
+import types
+
+
+# virtual key codes used by the keyboard tables
+_virtual_keys = {
+    "VK_BACK": 0x08, "VK_TAB": 0x09, "VK_RETURN": 0x0D, "VK_SHIFT": 0x10,
+    "VK_CONTROL": 0x11, "VK_MENU": 0x12, "VK_PAUSE": 0x13, "VK_CAPITAL": 0x14,
+    "VK_ESCAPE": 0x1B, "VK_SPACE": 0x20, "VK_PRIOR": 0x21, "VK_NEXT": 0x22,
+    "VK_END": 0x23, "VK_HOME": 0x24, "VK_LEFT": 0x25, "VK_UP": 0x26,
+    "VK_RIGHT": 0x27, "VK_DOWN": 0x28, "VK_PRINT": 0x2A, "VK_INSERT": 0x2D,
+    "VK_DELETE": 0x2E, "VK_LWIN": 0x5B, "VK_RWIN": 0x5C, "VK_APPS": 0x5D,
+    "VK_MULTIPLY": 0x6A, "VK_ADD": 0x6B, "VK_SEPARATOR": 0x6C,
+    "VK_SUBTRACT": 0x6D, "VK_DECIMAL": 0x6E, "VK_DIVIDE": 0x6F,
+    "VK_NUMLOCK": 0x90, "VK_SCROLL": 0x91, "VK_LSHIFT": 0xA0,
+    "VK_RSHIFT": 0xA1, "VK_LCONTROL": 0xA2, "VK_RCONTROL": 0xA3,
+    "VK_LMENU": 0xA4, "VK_RMENU": 0xA5,
+}
+_virtual_keys.update({f"VK_NUMPAD{i}": 0x60 + i for i in range(10)})
+_virtual_keys.update({f"VK_F{i}": 0x6F + i for i in range(1, 25)})
+
+
+class _Function:
+
+    """Function of a simulated DLL, returns 0 for every call."""
+
+    def __init__(self, name):
+        self.__name__ = name
+        self.argtypes = None
+        self.restype = None
+
+    def __call__(self, *args):
+        return 0
+
+
+class _Library:
+
+    """Simulated DLL whose functions do nothing."""
+
+    def __init__(self, name, *args, **kwargs):
+        self._name = name
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        function = _Function(name)
+        setattr(self, name, function)
+        return function
+
+
+class _LibraryLoader:
+
+    """Simulated ctypes.windll returning simulated DLLs by name."""
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        library = _Library(name)
+        setattr(self, name, library)
+        return library
+
+    def LoadLibrary(self, name):
+        return _Library(name)
+
+
+def _win_error(code=None, descr=None):
+    ''' replacement of ctypes.WinError '''
+    return OSError(code or 0, descr or "Windows API not available")
+
+
+def _win32api():
+    module = types.ModuleType("win32api")
+    module.keybd_event = lambda *args: None
+    module.GetLastError = lambda: 0
+    module.GetFileVersionInfo = lambda path, name: {
+        "FileVersionMS": 0, "FileVersionLS": 0
+    }
+    module.LOWORD = lambda value: value & 0xFFFF
+    module.HIWORD = lambda value: (value >> 16) & 0xFFFF
+    return module
+
+
+def _win32con():
+    module = types.ModuleType("win32con")
+    module.KEYEVENTF_EXTENDEDKEY = 0x0001
+    module.KEYEVENTF_KEYUP = 0x0002
+    for name, value in _virtual_keys.items():
+        setattr(module, name, value)
+    return module
+
+
+def _win32gui():
+    module = types.ModuleType("win32gui")
+    module.GetForegroundWindow = lambda: 0
+    return module
+
+
+def _win32process():
+    module = types.ModuleType("win32process")
+    module.GetWindowThreadProcessId = lambda hwnd: (0, 0)
+    return module
+
+
+def _winreg():
+    ''' registry without any keys '''
+    module = types.ModuleType("winreg")
+
+    def missing(*args, **kwargs):
+        raise FileNotFoundError("registry not available")
+
+    for name in [
+        "OpenKey", "CreateKey", "DeleteKey", "QueryInfoKey", "QueryValueEx",
+        "SetValueEx", "EnumKey", "EnumValue"
+    ]:
+        setattr(module, name, missing)
+    module.HKEY_CURRENT_USER = 0x80000001
+    module.HKEY_LOCAL_MACHINE = 0x80000002
+    module.KEY_READ = 0x20019
+    module.KEY_WRITE = 0x20006
+    module.KEY_ALL_ACCESS = 0xF003F
+    module.REG_DWORD = 4
+    module.REG_MULTI_SZ = 7
+    return module
+
+
+_modules = {
+    "win32api": _win32api,
+    "win32con": _win32con,
+    "win32gui": _win32gui,
+    "win32process": _win32process,
+    "winreg": _winreg,
+}
+
+
+def install():
+    """Registers the replacements of Windows only modules that are missing.
+
+    :return list of the names of the replaced modules
+    """
+    replaced = []
+    for name, create in _modules.items():
+        if name in sys.modules or importlib.util.find_spec(name) is not None:
+            continue
+        sys.modules[name] = create()
+        replaced.append(name)
+
+    if not hasattr(ctypes, "WinDLL"):
+        ctypes.WinDLL = _Library
+        ctypes.windll = _LibraryLoader()
+        ctypes.WINFUNCTYPE = ctypes.CFUNCTYPE
+        ctypes.WinError = _win_error
+        replaced.append("ctypes")
+    return replaced
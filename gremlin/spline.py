@@ -16,8 +16,14 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 
+import array
 import collections
-import gremlin.util
+
+try:
+    import numpy
+except ImportError:
+    # batch evaluation falls back to pure Python
+    numpy = None
 
 
 # Named tuple to facilitate working with 2D coordinates
@@ -169,7 +175,7 @@ class CubicBezierSpline:
         :return function value at the provided position
         """
         # Ensure we have a valid value for x
-        x = gremlin.util.clamp(x, -1.0, 1.0)
+        x = min(1.0, max(-1.0, x))
 
         # Determine spline group to use
         index = 0
@@ -204,3 +210,73 @@ class CubicBezierSpline:
         high = self._lookup[index][interval[1]][1]
 
         return low.y + (x - low.x) * ((high.y - low.y) / (high.x - low.x))
+
+
+class LookupTableCurve:
+
+    """Uniformly sampled lookup table of a response curve.
+
+    The curve is sampled once over [-1, 1] so that evaluating it is an
+    index computation followed by a linear interpolation between the two
+    neighbouring samples, independent of the number of control points.
+    """
+
+    # Number of samples used when no resolution is specified
+    default_resolution = 2048
+
+    def __init__(self, curve_fn, resolution=None):
+        """Creates a new LookupTableCurve object.
+
+        :param curve_fn the function to sample, mapping [-1, 1] to [-1, 1]
+        :param resolution number of samples taken over [-1, 1]
+        """
+        if resolution is None:
+            resolution = LookupTableCurve.default_resolution
+        self.resolution = max(2, int(resolution))
+        self._last = self.resolution - 1
+        self._scale = self._last / 2.0
+        self._table = array.array(
+            "d",
+            [curve_fn(-1.0 + 2.0 * i / self._last) for i in range(self.resolution)]
+        )
+        self._np_x = None
+        self._np_y = None
+
+    def __call__(self, x):
+        """Returns the function value at the desired position.
+
+        :param x the location at which to evaluate the function
+        :return function value at the provided position
+        """
+        table = self._table
+        if x <= -1.0:
+            return table[0]
+        if x >= 1.0:
+            return table[self._last]
+        position = (x + 1.0) * self._scale
+        index = int(position)
+        if index >= self._last:
+            return table[self._last]
+        low = table[index]
+        return low + (table[index + 1] - low) * (position - index)
+
+    def evaluate(self, values):
+        """Returns the function values for a sequence of positions.
+
+        Uses NumPy when it is available, intended for previews which
+        evaluate the curve at many positions at once.
+
+        :param values the locations at which to evaluate the function
+        :return list of function values, one per provided position
+        """
+        if numpy is None:
+            return [self(x) for x in values]
+
+        if self._np_x is None:
+            self._np_x = numpy.linspace(-1.0, 1.0, self.resolution)
+            self._np_y = numpy.frombuffer(self._table, dtype=numpy.float64)
+        return numpy.interp(
+            numpy.asarray(values, dtype=numpy.float64),
+            self._np_x,
+            self._np_y
+        ).tolist()
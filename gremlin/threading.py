@@ -30,4 +30,8 @@ class AbortableThread(threading.Thread):
         self._stop_event.set()
 
     def stopped(self):
-        return self._stop_event.is_set()
\ No newline at end of file
+        return self._stop_event.is_set()
+
+    def wait_stopped(self, timeout = None):
+        ''' blocks until stop is requested or the timeout elapses, returns True if stop was requested '''
+        return self._stop_event.wait(timeout)
\ No newline at end of file
@@ -0,0 +1,252 @@
+# -*- coding: utf-8; -*-
+
+# Based on original work by (C) Lionel Ott -  (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Shared fixed rate tick driving all continuously updated outputs.
+
+Outputs that change over time, such as relative axes, mouse motion, or key
+auto repeat, subscribe to the tick instead of running their own sleeping
+thread. The tick is a single periodic task of the shared scheduler which is
+only active while there are subscribers. After all subscribers of a tick
+have run the registered flush handlers are called, so output that is
+collected rather than sent immediately leaves once per tick.
+"""
+
+import ctypes
+import logging
+import sys
+import threading
+import time
+
+import gremlin.instrumentation
+import gremlin.scheduler
+from gremlin.singleton_decorator import SingletonDecorator
+
+
+class TickSubscription:
+
+    """Handle of a callback subscribed to the tick."""
+
+    __slots__ = ("callback", "args", "every", "_countdown", "_cancelled")
+
+    def __init__(self, callback, args, every):
+        """Creates a new instance.
+
+        :param callback the callable to run
+        :param args positional arguments passed to the callback
+        :param every number of ticks between runs of the callback
+        """
+        self.callback = callback
+        self.args = args
+        self.every = every
+        self._countdown = 1
+        self._cancelled = False
+
+    def cancel(self):
+        """Removes the subscription, a callback that is running completes."""
+        self._cancelled = True
+
+    @property
+    def active(self):
+        """Returns True if the callback still runs on the tick."""
+        return not self._cancelled
+
+
+@SingletonDecorator
+class TickService:
+
+    """Runs subscribed callbacks at a fixed rate from the scheduler thread.
+
+    Each tick is due one period after the due time of the previous one, so
+    the cadence does not drift with the time the callbacks take. Ticks
+    missed by more than a period are skipped and counted instead of being
+    run back to back. The lateness of every tick relative to its due time is kept in
+    a histogram, shown with the runtime statistics.
+
+    Callbacks run on the scheduler thread and must not block.
+    """
+
+    # default tick rate in Hz
+    default_rate = 100
+
+    def __init__(self):
+        """Creates a new instance."""
+        self._rate = self.default_rate
+        self._subscriptions = []
+        self._flush_handlers = []
+        self._task = None
+        self._lock = threading.Lock()
+        self._expected = 0.0
+        self._timer_resolution = False
+
+        self.jitter = gremlin.instrumentation.LatencyHistogram()
+        self.missed = 0
+
+    @property
+    def rate(self):
+        """Returns the tick rate in Hz."""
+        return self._rate
+
+    @rate.setter
+    def rate(self, value):
+        """Sets the tick rate, a running tick picks up the new rate.
+
+        :param value tick rate in Hz
+        """
+        value = max(1, min(1000, int(value)))
+        with self._lock:
+            if value == self._rate:
+                return
+            self._rate = value
+            if self._task is not None:
+                self._task.cancel()
+                self._task = None
+                self._start()
+
+    @property
+    def interval(self):
+        """Returns the time between ticks in seconds."""
+        return 1.0 / self._rate
+
+    def subscribe(self, callback, *args, interval=None):
+        """Runs a callback on every tick until the subscription is cancelled.
+
+        :param callback the callable to run
+        :param args positional arguments passed to the callback
+        :param interval time in seconds between runs of the callback, rounded
+            to a whole number of ticks, None to run on every tick
+        :return TickSubscription handle which can be used to cancel it
+        """
+        every = 1
+        if interval is not None:
+            every = max(1, int(round(interval * self._rate)))
+        subscription = TickSubscription(callback, args, every)
+        with self._lock:
+            self._subscriptions = self._subscriptions + [subscription]
+            if self._task is None:
+                self._start()
+        return subscription
+
+    def add_flush_handler(self, callback):
+        """Registers a callable run after all subscribers of a tick.
+
+        :param callback the callable to run, takes no arguments
+        """
+        with self._lock:
+            if callback not in self._flush_handlers:
+                self._flush_handlers = self._flush_handlers + [callback]
+
+    def remove_flush_handler(self, callback):
+        """Removes a flush handler.
+
+        :param callback the callable to remove
+        """
+        with self._lock:
+            self._flush_handlers = [
+                handler for handler in self._flush_handlers
+                if handler != callback
+            ]
+
+    def reset_statistics(self):
+        """Clears the recorded tick lateness and missed tick count."""
+        self.jitter.reset()
+        self.missed = 0
+
+    def statistics(self):
+        """Returns the tick timing statistics.
+
+        :return dictionary with the rate, the number of missed ticks, and the
+            lateness histogram summary in microseconds
+        """
+        result = {"rate": self._rate, "missed": self.missed}
+        result.update(self.jitter.to_dict())
+        return result
+
+    def _start(self):
+        """Starts the periodic tick, must be called with the lock held."""
+        interval = self.interval
+        self._expected = time.perf_counter() + interval
+        self._set_timer_resolution(True)
+        self._task = gremlin.scheduler.Scheduler().schedule_periodic(
+            interval, self._tick, delay=interval
+        )
+
+    def _tick(self):
+        """Runs the subscribers and flush handlers of one tick."""
+        now = time.perf_counter()
+        interval = self.interval
+        lateness = now - self._expected
+        if lateness >= interval:
+            self.missed += int(lateness / interval)
+        # mirrors how the scheduler computes the due time of the next tick
+        self._expected = max(self._expected + interval, now)
+        self.jitter.record(int(max(0.0, lateness) * 1e9))
+
+        has_cancelled = False
+        for subscription in self._subscriptions:
+            if subscription._cancelled:
+                has_cancelled = True
+                continue
+            subscription._countdown -= 1
+            if subscription._countdown > 0:
+                continue
+            subscription._countdown = subscription.every
+            try:
+                subscription.callback(*subscription.args)
+            except Exception as e:
+                subscription._cancelled = True
+                has_cancelled = True
+                logging.getLogger("system").error(
+                    f"Tick: callback {subscription.callback} failed and was "
+                    f"removed: {e}"
+                )
+
+        for handler in self._flush_handlers:
+            try:
+                handler()
+            except Exception as e:
+                logging.getLogger("system").error(
+                    f"Tick: flush handler {handler} failed: {e}"
+                )
+
+        if has_cancelled:
+            with self._lock:
+                self._subscriptions = [
+                    s for s in self._subscriptions if not s._cancelled
+                ]
+                if not self._subscriptions and self._task is not None:
+                    self._task.cancel()
+                    self._task = None
+                    self._set_timer_resolution(False)
+
+    def _set_timer_resolution(self, enable):
+        """Requests a 1 ms system timer resolution while the tick runs.
+
+        The default Windows timer resolution of 15.6 ms is too coarse for
+        the tick rate, other platforms are left alone.
+
+        :param enable True to request the resolution, False to release it
+        """
+        if sys.platform != "win32" or enable == self._timer_resolution:
+            return
+        try:
+            if enable:
+                ctypes.windll.winmm.timeBeginPeriod(1)
+            else:
+                ctypes.windll.winmm.timeEndPeriod(1)
+            self._timer_resolution = enable
+        except (AttributeError, OSError):
+            pass
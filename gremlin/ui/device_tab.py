@@ -567,6 +567,12 @@ class JoystickDeviceTabWidget(QDataWidget):
         )
         self.input_item_list_view = input_item.InputItemListView(name=device.name, custom_widget_handler = self._custom_widget_handler)
         self.input_item_list_view.setMinimumWidth(375)
+
+        # the input widgets are created the first time the tab is shown, tabs
+        # of devices that are never opened only hold the model, model changes
+        # such as mode switches do not create them either
+        self._populated = False
+        self.input_item_list_view.redraw_enabled = False
         
 
         # Handle vJoy as input and vJoy as output devices properly
@@ -581,9 +587,7 @@ class JoystickDeviceTabWidget(QDataWidget):
         self.input_item_list_view.item_edit_curve.connect(self._edit_curve_item_cb)
         self.input_item_list_view.item_delete_curve.connect(self._delete_curve_item_cb)
 
-        # load the model
-        self.input_item_list_view.redraw()
-    
+
 
         # Handle user interaction
         self.input_item_list_view.item_selected.connect(
@@ -649,18 +653,33 @@ class JoystickDeviceTabWidget(QDataWidget):
         self.updating = False
         self.last_event = None
 
-        # update the selection if nothing is selected
+        # update display on config change
+        el.config_changed.connect(self._config_changed_cb)
+
+
+    def showEvent(self, event):
+        ''' creates the input widgets when the tab is first shown '''
+        if not self._populated and self.input_item_list_view is not None:
+            self._populate()
+        super().showEvent(event)
+
+    def _populate(self):
+        ''' creates the input widgets of the input list '''
+        self._populated = True
+
+        # load the model
+        self.input_item_list_view.redraw_enabled = True
+        self.input_item_list_view.redraw()
+
+        # restore a selection made before the tab was shown
         selected_index = self.input_item_list_view.current_index
         if selected_index is not None and selected_index != -1:
+            self.input_item_list_view.select_item(selected_index, emit=False)
             self.input_item_selected_cb(selected_index)
 
-        # update display on config change
-        el.config_changed.connect(self._config_changed_cb)
-
         # update all curve icons
         self.update_curve_icons()
 
-
     def clear_layout(self):
         ''' clear data references '''
         self.input_item_list_model = None
@@ -674,11 +693,12 @@ class JoystickDeviceTabWidget(QDataWidget):
         import gremlin.event_handler
         curve_data : gremlin.curve_handler.AxisCurveData = data.curve_data
         if not curve_data:
-            curve_data = gremlin.curve_handler.AxisCurveData()
+            curve_data = gremlin.curve_handler.AxisCurveData(data)
             curve_data.curve_update()
             data.curve_data = curve_data
             
         dialog = gremlin.curve_handler.AxisCurveDialog(curve_data)
+        dialog.changed.connect(data.mark_modified)
         gremlin.util.centerDialog(dialog, dialog.width(), dialog.height())
 
         # hook input value changed handler
@@ -743,7 +763,8 @@ class JoystickDeviceTabWidget(QDataWidget):
 
 
     def _config_changed_cb(self):
-        self.input_item_list_view.redraw()
+        if self._populated:
+            self.input_item_list_view.redraw()
 
     def _custom_widget_handler(self, list_view : input_item.InputItemListView, index : int, identifier : input_item.InputIdentifier, data, parent = None):
         ''' creates a widget for the input
@@ -947,6 +968,9 @@ class JoystickDeviceTabWidget(QDataWidget):
 
         index = self.last_item_index
         self.input_item_list_model.mode = mode
+        if not self._populated:
+            # the tab shows the new mode when it is first shown
+            return
         self.input_item_list_view.redraw()
         self.input_item_list_view.select_item(index, emit=False)
         self.input_item_selected_cb(index)
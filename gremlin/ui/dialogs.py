@@ -30,9 +30,12 @@ from PySide6.QtGui import QIcon as load_icon
 from PySide6.QtWidgets import QMessageBox
 from gremlin.clipboard import Clipboard
 import gremlin.config
+import gremlin.error
 import gremlin.event_handler
+import gremlin.instrumentation
 import gremlin.joystick_handling
 import gremlin.shared_state
+import gremlin.tick
 import gremlin.types
 import gremlin.ui
 import gremlin.ui.ui_common
@@ -1696,6 +1699,164 @@ class LogWindowUi(ui_common.BaseDialogUi):
         )
 
 
+class RuntimeStatisticsUi(ui_common.BaseDialogUi):
+
+    """Window displaying the runtime statistics of the event processing."""
+
+    columns = [
+        ("count", "Calls"),
+        ("total_us", "Total (ms)"),
+        ("mean_us", "Mean (us)"),
+        ("p50_us", "p50 (us)"),
+        ("p90_us", "p90 (us)"),
+        ("p99_us", "p99 (us)"),
+        ("max_us", "Max (us)"),
+    ]
+
+    def __init__(self, parent=None):
+        """Creates a new instance.
+
+        :param parent the parent of this widget
+        """
+        super().__init__(parent)
+
+        self.setWindowTitle("Runtime Statistics")
+        self.setMinimumWidth(800)
+        self.setMinimumHeight(400)
+
+        self.config = gremlin.config.Configuration()
+        self.stats = gremlin.instrumentation.Instrumentation()
+
+        self.main_layout = QtWidgets.QVBoxLayout(self)
+
+        self.enable_widget = QtWidgets.QCheckBox("Record runtime statistics")
+        self.enable_widget.setToolTip(
+            "Records call counts and durations of the event processing while a profile runs.<br>"
+            "Recording adds a small overhead to every event."
+        )
+        self.enable_widget.setChecked(self.config.runtime_statistics)
+        self.enable_widget.clicked.connect(self._enable_cb)
+        self.main_layout.addWidget(self.enable_widget)
+
+        self.tab_container = QtWidgets.QTabWidget()
+        self.main_layout.addWidget(self.tab_container)
+        self.tables = {}
+        self._create_table("inputs", "Inputs", ["Device", "Type", "Input"])
+        self._create_table("graphs", "Containers", ["Container"])
+        self._create_table("functors", "Actions", ["Functor"])
+        self._create_table("remote", "Remote input", ["Message"])
+
+        self.tick_widget = QtWidgets.QLabel()
+        self.tick_widget.setToolTip(
+            "Lateness of the shared tick updating relative axes, mouse motion, and auto repeat"
+        )
+        self.main_layout.addWidget(self.tick_widget)
+
+        self.status_widget = QtWidgets.QLabel()
+
+        self.refresh_widget = QtWidgets.QPushButton("Refresh")
+        self.refresh_widget.clicked.connect(self._refresh)
+        self.reset_widget = QtWidgets.QPushButton("Reset")
+        self.reset_widget.clicked.connect(self._reset)
+        self.export_widget = QtWidgets.QPushButton("Export...")
+        self.export_widget.clicked.connect(self._export)
+
+        self.button_layout = QtWidgets.QHBoxLayout()
+        self.button_layout.addWidget(self.status_widget)
+        self.button_layout.addStretch()
+        self.button_layout.addWidget(self.refresh_widget)
+        self.button_layout.addWidget(self.reset_widget)
+        self.button_layout.addWidget(self.export_widget)
+        self.main_layout.addLayout(self.button_layout)
+
+        self._refresh()
+
+    def _create_table(self, key, title, headers):
+        """Creates a tab holding the table of one statistics category.
+
+        :param key name of the category in the statistics snapshot
+        :param title the title of the tab
+        :param headers headers of the columns identifying an entry
+        """
+        table = QtWidgets.QTableWidget()
+        table.setColumnCount(len(headers) + len(self.columns))
+        table.setHorizontalHeaderLabels(headers + [c[1] for c in self.columns])
+        table.verticalHeader().setVisible(False)
+        table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.tables[key] = (table, len(headers))
+        self.tab_container.addTab(table, title)
+
+    def _describe(self, key, entry):
+        """Returns the cells identifying an entry.
+
+        :param key name of the category of the entry
+        :param entry the entry of the statistics snapshot
+        :return list of strings
+        """
+        if key == "inputs":
+            try:
+                device_name = gremlin.joystick_handling.device_name_from_guid(entry["device_guid"])
+            except gremlin.error.GremlinError:
+                device_name = None
+            if not device_name:
+                device_name = entry["device_guid"]
+            return [device_name, entry["input_type"], entry["identifier"]]
+        return [entry["name"]]
+
+    def _refresh(self):
+        """Updates the tables with the current statistics."""
+        snapshot = self.stats.snapshot()
+        for key, (table, offset) in self.tables.items():
+            entries = snapshot[key]
+            table.setSortingEnabled(False)
+            table.setRowCount(len(entries))
+            for row, entry in enumerate(entries):
+                for column, text in enumerate(self._describe(key, entry)):
+                    table.setItem(row, column, QtWidgets.QTableWidgetItem(text))
+                for column, (field, _) in enumerate(self.columns):
+                    value = entry[field]
+                    if field == "total_us":
+                        value /= 1000.0
+                    item = QtWidgets.QTableWidgetItem()
+                    item.setData(QtCore.Qt.DisplayRole, value if field == "count" else round(value, 1))
+                    table.setItem(row, offset + column, item)
+            table.setSortingEnabled(True)
+            table.resizeColumnsToContents()
+        self.status_widget.setText(f"Recording for {snapshot['duration']:.0f} seconds")
+
+        tick = gremlin.tick.TickService().statistics()
+        self.tick_widget.setText(
+            f"Output tick at {tick['rate']} Hz: {tick['count']} ticks, "
+            f"lateness p50 {tick['p50_us']:.0f} us, p99 {tick['p99_us']:.0f} us, "
+            f"max {tick['max_us']:.0f} us, {tick['missed']} missed"
+        )
+
+    def _reset(self):
+        """Removes all recorded statistics."""
+        self.stats.reset()
+        gremlin.tick.TickService().reset_statistics()
+        self._refresh()
+
+    def _enable_cb(self, checked):
+        """Enables or disables the recording of statistics.
+
+        :param checked True if statistics are recorded
+        """
+        self.config.runtime_statistics = checked
+
+    def _export(self):
+        """Writes the current statistics to a file chosen by the user."""
+        fname, _ = QtWidgets.QFileDialog.getSaveFileName(
+            None,
+            "Export runtime statistics",
+            gremlin.util.userprofile_path(),
+            "JSON files (*.json)"
+        )
+        if fname != "":
+            self.stats.export(fname)
+
+
 class AboutUi(ui_common.BaseDialogUi):
 
     """Widget which displays information about the application."""
@@ -350,6 +350,7 @@ class InputItemListView(ui_common.AbstractView):
         self.name = name
         self._current_index = -1 # nothing selected
         self.custom_widget_handler = custom_widget_handler
+        self.redraw_enabled = True # if false, redraws are skipped until the owner enables them and redraws
 
         # Create required UI items
         self.main_layout = QtWidgets.QVBoxLayout(self)
@@ -430,6 +431,10 @@ class InputItemListView(ui_common.AbstractView):
         """
 
 
+        if not self.redraw_enabled:
+            # the widgets are created once the owner enables redraws
+            return
+
         verbose = gremlin.config.Configuration().verbose_mode_inputs
         self.widget_map.clear()
 
@@ -102,14 +102,14 @@ class MergeAxisUi(ui_common.BaseDialogUi):
 
     def to_profile(self):
         """Saves all merge axis entries to the profile."""
-        self.profile_data.merge_axes = []
+        merge_axes = []
         for entry in self.entries:
             vjoy_sel = entry.vjoy_selector.get_selection()
             joy1_sel = entry.joy1_selector.get_selection()
             joy2_sel = entry.joy2_selector.get_selection()
             mode_idx = entry.mode_selector.currentIndex()
             operation_str = entry.operation_selector.currentText()
-            self.profile_data.merge_axes.append({
+            merge_axes.append({
                 "mode": entry.mode_selector.mode_list[mode_idx],
                 "operation": gremlin.types.MergeAxisOperation.to_enum(
                     operation_str
@@ -127,6 +127,8 @@ class MergeAxisUi(ui_common.BaseDialogUi):
                     "axis_id": joy2_sel["input_id"]
                 }
             })
+        # assigned as a whole so an unchanged list does not mark the profile
+        self.profile_data.merge_axes = merge_axes
 
     def from_profile(self):
         """Populates the merge axis entries of the ui from the profile data."""
@@ -151,6 +153,7 @@ class MergeAxisUi(ui_common.BaseDialogUi):
             del self.profile_data.merge_axes[
                 self.profile_data.merge_axes.index(entry)
             ]
+            self.profile_data.mark_modified()
 
     def _output_vjoy_devices(self):
         output_devices = []
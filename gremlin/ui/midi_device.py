@@ -438,18 +438,20 @@ class MidiListener(AbortableThread):
         self.port_name = port_name
         self.callback = callback
 
+    def _receive(self, message):
+        ''' called by the MIDI backend thread for every received message '''
+        if gremlin.config.runtime_settings.verbose:
+            logging.getLogger("system").info(f"Midinput: heard message: {message}")
+        self.callback(self.port_name, self.port_number, message)
+
     def run(self):
         verbose = gremlin.config.Configuration().verbose
         
         try:
-            with mido.open_input(self.port_name) as inport:
+            # messages are delivered by the backend as they arrive, this thread only keeps the port open until stopped
+            with mido.open_input(self.port_name, callback = self._receive) as inport:
                 logging.getLogger("system").info(f"MIDI Interface: Active on port: {self.port_name} [{self.port_number}]")
-                while not self.stopped():
-                    for message in inport.iter_pending():
-                        if verbose:
-                            logging.getLogger("system").info(f"Midinput: heard message: {message}")
-                        self.callback(self.port_name, self.port_number, message)
-                    time.sleep(0.01)
+                self.wait_stopped()
                         
                 if verbose:
                     logging.getLogger("system").info(f"Midinput: close port {self.port_number}")
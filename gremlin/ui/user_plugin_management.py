@@ -65,6 +65,7 @@ class ModuleManagementController(QtCore.QObject):
                 instance = self._create_module_instance("Default", module)
 
                 self.profile_data.plugins.append(module)
+                self.profile_data.mark_modified()
 
                 # Update the view
                 self.view.module_list.add_module(
@@ -76,6 +77,7 @@ class ModuleManagementController(QtCore.QObject):
         for i, module in enumerate(self.profile_data.plugins):
             if module.file_name == file_name:
                 del self.profile_data.plugins[i]
+                self.profile_data.mark_modified()
                 break
 
         # Remove corresponding UI element
@@ -103,6 +105,7 @@ class ModuleManagementController(QtCore.QObject):
     def remove_instance(self, instance, widget):
         # Remove model
         del instance.parent.instances[instance.parent.instances.index(instance)]
+        instance.parent.mark_modified()
         # Remove view
         widget.parent().remove_instance(widget)
 
@@ -152,6 +155,7 @@ class ModuleManagementController(QtCore.QObject):
             new_instance.set_variable(new_var.name, new_var)
 
         module_data.instances.append(new_instance)
+        module_data.mark_modified()
         module_widget = widget.module_widget
         new_instance_widget =  InstanceWidget(new_instance.name)
         new_instance_widget.module_widget = module_widget
@@ -325,6 +329,7 @@ class ModuleManagementController(QtCore.QObject):
             ivar.is_valid = var.value is not None
 
         module_data.instances.append(instance)
+        module_data.mark_modified()
 
         return instance
 
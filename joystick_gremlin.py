@@ -21,7 +21,6 @@ Main UI of JoystickGremlin.
 
 import argparse
 import ctypes
-import hashlib
 import logging
 import os
 import gc
@@ -148,6 +147,7 @@ class GremlinUi(QtWidgets.QMainWindow):
         QtWidgets.QMainWindow.__init__(self, parent)
         self.ui = Ui_Gremlin()
         self.ui.setupUi(self)
+        self._add_runtime_statistics_menu()
         self._recreate_tab_widget()
         self.locked = False
         self.activate_locked = False
@@ -199,6 +199,7 @@ class GremlinUi(QtWidgets.QMainWindow):
         self.profile = gremlin.base_profile.Profile()
         self._profile_fname = None
         self._profile_auto_activated = False
+        self._tabs_stale = False # true if the device tabs were not built for the current profile
         # Input selection storage
         self._last_input_timestamp = time.time()
         self._last_input_change_timestamp = time.time()
@@ -239,6 +240,9 @@ class GremlinUi(QtWidgets.QMainWindow):
         # hook input selection 
         el.select_input.connect(self._select_input_handler)
 
+        # hook mapping edits for the profile change tracking
+        el.mapping_changed.connect(self._mapping_changed_cb)
+
         # hook changes
         eh = gremlin.event_handler.EventHandler()
         eh.profile_changed.connect(self._profile_changed_cb)
@@ -368,6 +372,12 @@ class GremlinUi(QtWidgets.QMainWindow):
 
 
 
+    def _add_runtime_statistics_menu(self):
+        ''' adds the runtime statistics entry after the log display in the tools menu '''
+        self.ui.actionRuntimeStatistics = QtGui.QAction("Runtime Statistics", self)
+        self.ui.actionRuntimeStatistics.setObjectName("actionRuntimeStatistics")
+        self.ui.menuTools.addAction(self.ui.actionRuntimeStatistics)
+
     def _tab_context_menu_cb(self, pos):
         ''' tab context menu '''
         tab_index = self.ui.devices.tabBar().tabAt(pos)
@@ -472,6 +482,16 @@ class GremlinUi(QtWidgets.QMainWindow):
 
 
 
+    def changeEvent(self, evt):
+        """Builds the device tabs skipped by a process switch once the
+        window is activated.
+
+        :param evt the change event
+        """
+        super().changeEvent(evt)
+        if evt.type() == QtCore.QEvent.Type.ActivationChange and self.isActiveWindow():
+            self._create_stale_tabs()
+
     def closeEvent(self, evt):
         """Terminate the entire application if the main window is closed.
 
@@ -579,6 +599,15 @@ class GremlinUi(QtWidgets.QMainWindow):
             lambda: self._remove_modal_window("log")
         )
 
+    def runtime_statistics(self):
+        """Opens the runtime statistics window."""
+        self.modal_windows["runtime_statistics"] = \
+            gremlin.ui.dialogs.RuntimeStatisticsUi()
+        self.modal_windows["runtime_statistics"].show()
+        self.modal_windows["runtime_statistics"].closed.connect(
+            lambda: self._remove_modal_window("runtime_statistics")
+        )
+
     def manage_modes(self):
         """Opens the mode management window."""
         dialog = gremlin.ui.dialogs.ModeManagerUi(self.profile)
@@ -672,6 +701,8 @@ class GremlinUi(QtWidgets.QMainWindow):
 
     def menu_activate(self, activate):
         self.activate(activate)
+        if not activate:
+            self._create_stale_tabs()
 
     def activate(self, activate):
         """Activates and deactivates the code runner.
@@ -958,6 +989,7 @@ class GremlinUi(QtWidgets.QMainWindow):
         if self._profile_fname:
             # save first
             self.profile.to_xml(self._profile_fname)
+            self.profile.mark_saved()
             if  os.path.isfile(self._profile_fname):
                 path = os.path.realpath(self._profile_fname)
                 webbrowser.open(path)
@@ -1002,6 +1034,9 @@ class GremlinUi(QtWidgets.QMainWindow):
         self.ui.actionLogDisplay.triggered.connect(
             self.log_window
         )
+        self.ui.actionRuntimeStatistics.triggered.connect(
+            self.runtime_statistics
+        )
         # About
         self.ui.actionAbout.triggered.connect(self.about)
 
@@ -1069,6 +1104,7 @@ class GremlinUi(QtWidgets.QMainWindow):
         """
         
         assert_ui_thread()
+        self._tabs_stale = False
 
         try:
             gremlin.shared_state.is_tab_loading = True
@@ -2106,9 +2142,12 @@ class GremlinUi(QtWidgets.QMainWindow):
                 # change profile
                 if verbose:
                     logging.getLogger("system").info(f"PROC: process change forces a profile load: switch from {os.path.basename(self._profile_fname)} ->  {os.path.basename(profile_path)}")
+                # the tabs are only needed once the user looks at the profile,
+                # skip building them when switching between running profiles
+                create_tabs = not self.runner.is_running() or config.runtime_ui_update
                 self.ui.actionActivate.setChecked(False)
                 self.activate(False)
-                self._do_load_profile(profile_path)
+                self._do_load_profile(profile_path, create_tabs)
                 self.ui.actionActivate.setChecked(True)
                 
                 self._profile_auto_activated = True # remember the profile was auto activated by virtue of a process change
@@ -2387,10 +2426,11 @@ class GremlinUi(QtWidgets.QMainWindow):
         gremlin.shared_state.current_profile = value
 
 
-    def _do_load_profile(self, fname):
+    def _do_load_profile(self, fname, create_tabs = True):
         """Load the profile with the given filename.
 
         :param fname the name of the profile file to load
+        :param create_tabs if False, the device tabs are cleared and built when the window is next activated
         """
         # Disable the program if it is running when we're loading a
         # new profile
@@ -2402,13 +2442,24 @@ class GremlinUi(QtWidgets.QMainWindow):
 
         # Attempt to load the new profile
         try:
-            new_profile = gremlin.base_profile.Profile()
-            if gremlin.shared_state.current_profile:
+            profile_cache = gremlin.base_profile.ProfileCache()
+            current_profile = gremlin.shared_state.current_profile
+            if current_profile:
+                # keep process mapped profiles loaded for the next switch
+                if self._is_process_mapped(current_profile.profile_file):
+                    profile_cache.put(current_profile)
                 eh = gremlin.event_handler.EventListener()
                 eh.profile_unload.emit()
 
-            gremlin.shared_state.current_profile = new_profile
-            profile_updated = new_profile.from_xml(fname)
+            new_profile = profile_cache.take(fname)
+            if new_profile is not None:
+                logging.getLogger("system").info(f"Load profile: using loaded {os.path.basename(fname)}")
+                gremlin.shared_state.current_profile = new_profile
+                profile_updated = False
+            else:
+                new_profile = gremlin.base_profile.Profile()
+                gremlin.shared_state.current_profile = new_profile
+                profile_updated = new_profile.from_xml(fname)
 
             profile_folder = os.path.dirname(fname)
             if profile_folder not in sys.path:
@@ -2439,10 +2490,20 @@ class GremlinUi(QtWidgets.QMainWindow):
             
             current_mode = gremlin.shared_state.current_mode
             
-            self._create_tabs()
+            ui_start = time.perf_counter()
+            if create_tabs:
+                self._create_tabs()
+            else:
+                # drop the tabs of the previous profile
+                self._recreate_tab_widget()
+                gremlin.shared_state.device_widget_map.clear()
+                self._tabs_stale = True
 
             # Make the first root node the default active mode
             self.mode_selector.populate_selector(new_profile, current_mode, emit = True)
+            logging.getLogger("system").info(
+                f"Load profile: built the UI in {(time.perf_counter() - ui_start) * 1000:.1f} ms"
+            )
             
 
             # Save the profile at this point if it was converted from a prior
@@ -2451,6 +2512,10 @@ class GremlinUi(QtWidgets.QMainWindow):
             if profile_updated:
                 new_profile.to_xml(fname)
 
+            # what was loaded, including sanitizing and the default input
+            # items created for the tabs, is the saved state
+            new_profile.mark_saved()
+
 
         except (KeyError, TypeError) as error:
             # An error occurred while parsing an existing profile,
@@ -2473,6 +2538,26 @@ class GremlinUi(QtWidgets.QMainWindow):
             popCursor()
             
 
+    def _create_stale_tabs(self):
+        ''' builds the device tabs if they were skipped on the last profile load '''
+        if self._tabs_stale:
+            self._create_tabs()
+            self.mode_selector.populate_selector(self.profile, gremlin.shared_state.current_mode, emit = False)
+
+    def _is_process_mapped(self, fname):
+        """Returns True if a profile is associated with a process.
+
+        :param fname path of the profile file
+        :return True if the process map references the profile
+        """
+        if not fname:
+            return False
+        return any(
+            compare_path(item.profile, fname)
+            for item in self._profile_map.items()
+            if item.profile
+        )
+
     def refresh(self):
         ''' refresh the UI '''
         self._create_tabs()
@@ -2543,6 +2628,16 @@ class GremlinUi(QtWidgets.QMainWindow):
                 continue_process = False
         return continue_process
 
+    def _mapping_changed_cb(self, item_data):
+        """Records an edit of the mappings of an input as a profile change.
+
+        :param item_data the input item that was edited
+        """
+        if isinstance(item_data, gremlin.base_profile.ChangeTracker):
+            item_data.mark_modified()
+        elif self.profile is not None:
+            self.profile.mark_modified()
+
     def _has_profile_changed(self):
         """Returns whether or not the profile has changed.
 
@@ -2550,23 +2645,8 @@ class GremlinUi(QtWidgets.QMainWindow):
         """
         if self._profile_fname is None:
             return True
-        else:
-            # save the profile and compare to the original file
-            tmp_path = os.path.join(os.getenv("temp"), "gremlin.xml")
-            self.profile.to_xml(tmp_path)
-            current_sha = hashlib.sha256(
-                open(tmp_path).read().encode("utf-8")
-            ).hexdigest()
-            profile_sha = hashlib.sha256(
-                open(self._profile_fname).read().encode("utf-8")
-            ).hexdigest()
-
-            is_changed =  current_sha != profile_sha
-            # if is_changed:
-            #     gremlin.util.display_file(tmp_path)
-            #     gremlin.util.display_file(self._profile_fname)
-
-            return is_changed
+        # the profile counts its modifications since it was loaded or saved
+        return self.profile.dirty
                 
 
     def _last_runtime_mode(self):
@@ -5,6 +5,14 @@ import pytest
 
 import dinput
 
+if sys.platform != "win32":
+    # DirectInput, vJoy and the Windows modules are not available, run on
+    # the simulated backends which also replace the Windows modules
+    import dinput.simulated
+    import vjoy.simulated
+    dinput.simulated.install()
+    vjoy.simulated.install()
+
 import gremlin.event_handler
 import gremlin.joystick_handling
 
@@ -0,0 +1,54 @@
+# -*- coding: utf-8; -*-
+
+# Based on original work by (C) Lionel Ott -  (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+import sys
+sys.path.append(".")
+
+from gremlin.axis_filter import AxisFilter, FilterResult
+
+
+def test_disabled():
+    axis_filter = AxisFilter()
+    assert not axis_filter.enabled
+    assert axis_filter.filter("a", 1, 10)[0] == FilterResult.Accept
+    assert axis_filter.filter("a", 1, 10)[0] == FilterResult.Accept
+
+
+def test_epsilon():
+    axis_filter = AxisFilter(epsilon=2)
+    assert axis_filter.filter("a", 1, 100)[0] == FilterResult.Accept
+    assert axis_filter.filter("a", 1, 102)[0] == FilterResult.Drop
+    assert axis_filter.filter("a", 1, 98)[0] == FilterResult.Drop
+    assert axis_filter.filter("a", 1, 103)[0] == FilterResult.Accept
+    # axes are filtered independently
+    assert axis_filter.filter("a", 2, 101)[0] == FilterResult.Accept
+    # extremes always pass
+    axis_filter.filter("a", 1, 32766)
+    assert axis_filter.filter("a", 1, 32767)[0] == FilterResult.Accept
+
+
+def test_max_rate():
+    axis_filter = AxisFilter(max_rate=100)
+    assert axis_filter.filter("a", 1, 0, now=1.0)[0] == FilterResult.Accept
+    result, delay = axis_filter.filter("a", 1, 10, now=1.002)
+    assert result == FilterResult.Defer
+    assert abs(delay - 0.008) < 1e-9
+    # only one flush is requested, it delivers the newest value
+    assert axis_filter.filter("a", 1, 20, now=1.004)[0] == FilterResult.Drop
+    assert axis_filter.flush("a", 1, now=1.01) == 20
+    assert axis_filter.flush("a", 1, now=1.01) is None
+    assert axis_filter.filter("a", 1, 30, now=1.021)[0] == FilterResult.Accept
@@ -0,0 +1,130 @@
+# -*- coding: utf-8; -*-
+
+# Based on original work by (C) Lionel Ott -  (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+import sys
+sys.path.append(".")
+
+import os
+import time
+
+import pytest
+
+import dinput
+import dinput.simulated
+import vjoy.simulated
+
+
+DEVICE_GUID = "{3C1F2E80-6B0A-11EF-8000-444553540000}"
+
+profile_xml = f"""<?xml version='1.0' encoding='utf-8'?>
+<profile version="10" start_mode="Default" default_mode="Default" restore_last="False" force_numlock="False">
+  <devices>
+    <device name="Test Stick" label="Test Stick" device-guid="{DEVICE_GUID}" type="joystick">
+      <mode name="Default">
+        <axis id="1" description="">
+          <container type="basic">
+            <action-set>
+              <vjoyremap vjoy="1" axis="1" mode="VJoyAxis" input="1" axis-type="absolute" reverse="False"/>
+            </action-set>
+          </container>
+        </axis>
+      </mode>
+    </device>
+  </devices>
+  <vjoy-devices/>
+</profile>
+"""
+
+# the backends are selected before the event listener registers its DILL
+# callbacks, which happens the first time it is used
+vjoy_backend = vjoy.simulated.install(vjoy.simulated.SimulatedVJoy([
+    vjoy.simulated.SimulatedVJoyDevice(1)
+]))
+stick = dinput.simulated.VirtualDevice("Test Stick", guid=DEVICE_GUID)
+dinput.simulated.install(dinput.simulated.SimulatedDill(
+    [stick] + vjoy_backend.dinput_devices()
+))
+
+
+def _wait(condition, timeout = 5.0):
+    ''' processes Qt events until the condition holds or the timeout expires '''
+    from PySide6 import QtCore
+    end = time.perf_counter() + timeout
+    while not condition() and time.perf_counter() < end:
+        QtCore.QCoreApplication.processEvents()
+        time.sleep(0.005)
+    return condition()
+
+
+@pytest.fixture(scope="module")
+def runner():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6 import QtWidgets
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv)
+
+    import gremlin.code_runner
+    import gremlin.event_handler
+    import gremlin.joystick_handling
+    import gremlin.plugin_manager
+
+    gremlin.joystick_handling.joystick_devices_initialization()
+    gremlin.plugin_manager.ActionPlugins()
+    gremlin.plugin_manager.ContainerPlugins()
+    gremlin.event_handler.EventListener()
+    assert _wait(lambda: dinput.DILL.input_event_callback_fn is not None)
+
+    class HeadlessCodeRunner(gremlin.code_runner.CodeRunner):
+
+        def setUIState(self, enabled):
+            pass
+
+    yield HeadlessCodeRunner()
+
+
+def test_start_remaps_axis(runner, tmp_path):
+    import gremlin.base_profile
+    import gremlin.event_handler
+    import gremlin.shared_state
+
+    fname = tmp_path / "profile.xml"
+    fname.write_text(profile_xml)
+    profile = gremlin.base_profile.Profile()
+    gremlin.shared_state.current_profile = profile
+    profile.from_xml(str(fname))
+    eh = gremlin.event_handler.EventHandler()
+    eh.set_runtime_mode(profile.get_root_mode())
+    eh.set_edit_mode(profile.get_root_mode())
+
+    runner.start(
+        profile.build_inheritance_tree(),
+        profile.settings,
+        profile.get_start_mode(),
+        profile
+    )
+    try:
+        assert gremlin.event_handler.EventListener().gremlin_active
+
+        vjoy_backend.clear()
+        stick.set_axis(1, 32767)
+        assert _wait(lambda: any(
+            record.vjoy_id == 1 and record.input_type == "axis" and record.input_id == 1
+            for record in list(vjoy_backend.records)
+        ))
+    finally:
+        runner.stop()
+
+    assert not gremlin.event_handler.EventListener().gremlin_active
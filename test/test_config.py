@@ -18,6 +18,7 @@
 import sys
 sys.path.append(".")
 
+import json
 import os
 import tempfile
 import pytest
@@ -108,4 +109,54 @@ def test_exceptions():
         c.set("test", "some", "other", "test")
 
     with pytest.raises(gremlin.error.GremlinError):
-        c.value("does", "not", "exist")
\ No newline at end of file
+        c.value("does", "not", "exist")
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    c = gremlin.config.Configuration()
+    fname = str(tmp_path / "config.json")
+    monkeypatch.setattr(type(c), "get_config", lambda self: fname)
+    # writes only happen on flush
+    monkeypatch.setattr(type(c), "save_delay", 60.0)
+    c.save()
+    c.flush()
+    return fname
+
+
+def _write_external(fname, data):
+    content = json.JSONEncoder(sort_keys=True, indent=4).encode(data)
+    with open(fname, "w") as hdl:
+        hdl.write(content)
+    stat = os.stat(fname)
+    os.utime(fname, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_reload_external_edit(config_file):
+    c = gremlin.config.Configuration()
+    data = {"calibration": {}, "profiles": {}, "last_mode": {"external": "Default"}}
+
+    _write_external(config_file, data)
+    c.reload()
+    c.flush()
+    assert c._data["last_mode"] == {"external": "Default"}
+
+    # the same content again is not reloaded
+    last_reload = c._last_reload
+    _write_external(config_file, data)
+    c.reload()
+    assert c._last_reload == last_reload
+
+
+def test_reload_keeps_pending_changes(config_file):
+    c = gremlin.config.Configuration()
+    c._data["last_mode"] = {"pending": "Default"}
+    c.save()
+
+    _write_external(config_file, {"calibration": {}, "profiles": {}, "last_mode": {}})
+    c.reload()
+
+    assert c._data["last_mode"] == {"pending": "Default"}
+    c.flush()
+    with open(config_file) as hdl:
+        assert json.load(hdl)["last_mode"] == {"pending": "Default"}
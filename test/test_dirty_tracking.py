@@ -0,0 +1,140 @@
+# -*- coding: utf-8; -*-
+
+# Based on original work by (C) Lionel Ott -  (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+import sys
+sys.path.append(".")
+
+import pytest
+from PySide6 import QtWidgets
+
+import gremlin.base_profile
+import gremlin.event_handler
+from gremlin.ui.ui_common import DualSlider
+
+import action_plugins.gated_axis
+import action_plugins.response_curve
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+@pytest.fixture
+def profile():
+    return gremlin.base_profile.Profile()
+
+
+def _input_item(profile):
+    return gremlin.base_profile.InputItem(profile)
+
+
+class Tracked(gremlin.base_profile.ChangeTracker):
+
+    _untracked_attributes = frozenset(["view"])
+
+    def __init__(self):
+        self.value = 0
+        self.view = 0
+
+
+def test_assignment_bumps_generation():
+    item = Tracked()
+    assert item.generation == 0
+
+    item.value = 1
+    assert item.generation == 1
+
+    # assigning an equal value is not a change
+    item.value = 1
+    assert item.generation == 1
+
+
+def test_untracked_attribute_keeps_generation():
+    item = Tracked()
+
+    item.view = 1
+
+    assert item.generation == 0
+
+
+def test_untracked_context_keeps_generation():
+    item = Tracked()
+
+    with item.untracked():
+        item.value = 1
+    assert item.generation == 0
+
+    item.value = 2
+    assert item.generation == 1
+
+
+def test_loaded_profile_is_clean(app, profile):
+    created = []
+    el = gremlin.event_handler.EventListener()
+    el.action_created.connect(created.append)
+    try:
+        profile.from_xml("benchmarks/profiles/gated_axis.xml")
+    finally:
+        el.action_created.disconnect(created.append)
+    assert not profile.dirty
+
+    # the device tab and the profile start rebuild the ranges of the gates
+    gate_data = [
+        action.gate_data for action in created
+        if isinstance(action, action_plugins.gated_axis.GatedAxis)
+    ]
+    assert gate_data
+    for data in gate_data:
+        data.updateRanges()
+        data.getRanges(update = True)
+
+    assert not profile.dirty
+
+
+def test_deadzone_edit_marks_profile(app, profile):
+    action = action_plugins.response_curve.ResponseCurve(_input_item(profile))
+    widget = action_plugins.response_curve.DeadzoneWidget(action)
+    profile.mark_saved()
+    assert not profile.dirty
+
+    widget._update_left(DualSlider.LowerHandle, -0.9 * widget._normalizer)
+
+    assert action.deadzone[0] == pytest.approx(-0.9)
+    assert profile.dirty
+
+
+def test_gate_move_marks_profile(app, profile):
+    action = action_plugins.gated_axis.GatedAxis(_input_item(profile))
+    gate = action.gate_data.registerGate(0.0)
+    assert gate is not None
+    profile.mark_saved()
+    assert not profile.dirty
+
+    gate.value = 0.25
+
+    assert profile.dirty
+
+
+def test_unchanged_gate_value_keeps_profile_clean(app, profile):
+    action = action_plugins.gated_axis.GatedAxis(_input_item(profile))
+    gate = action.gate_data.registerGate(0.0)
+    profile.mark_saved()
+
+    gate.value = gate.value
+
+    assert not profile.dirty
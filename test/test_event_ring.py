@@ -0,0 +1,70 @@
+# -*- coding: utf-8; -*-
+
+# Based on original work by (C) Lionel Ott -  (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+import sys
+sys.path.append(".")
+
+from gremlin.event_ring import EventRing
+
+
+def test_order_and_notify():
+    ring = EventRing(8)
+    assert ring.push("a", "button", 1, 1) is True
+    # consumer already notified
+    assert ring.push("a", "button", 1, 0) is False
+    assert len(ring) == 2
+    assert ring.drain() == [("a", "button", 1, 1), ("a", "button", 1, 0)]
+    assert len(ring) == 0
+    assert ring.drain() == []
+    assert ring.push("a", "button", 2, 1) is True
+
+
+def test_coalesce_axes():
+    ring = EventRing(8)
+    ring.push("a", "axis", 1, 100, True)
+    ring.push("a", "button", 3, 1)
+    ring.push("a", "axis", 1, 200, True)
+    ring.push("b", "axis", 1, 5, True)
+    ring.push("a", "axis", 1, 300, True)
+    assert ring.coalesced == 2
+    assert ring.drain() == [
+        ("a", "axis", 1, 300),
+        ("a", "button", 3, 1),
+        ("b", "axis", 1, 5)
+    ]
+    # a drained axis starts a new entry
+    ring.push("a", "axis", 1, 400, True)
+    assert ring.drain() == [("a", "axis", 1, 400)]
+
+
+def test_no_coalesce():
+    ring = EventRing(8, coalesce_axes=False)
+    ring.push("a", "axis", 1, 100, True)
+    ring.push("a", "axis", 1, 200, True)
+    assert [entry[3] for entry in ring.drain()] == [100, 200]
+
+
+def test_bounded():
+    ring = EventRing(4)
+    for i in range(10):
+        ring.push("a", "button", i, 1)
+    assert ring.dropped == 6
+    assert [entry[2] for entry in ring.drain()] == [0, 1, 2, 3]
+    # wraps around after draining
+    for i in range(4):
+        ring.push("a", "button", 10 + i, 1)
+    assert [entry[2] for entry in ring.drain()] == [10, 11, 12, 13]
@@ -0,0 +1,88 @@
+# -*- coding: utf-8; -*-
+
+# Based on original work by (C) Lionel Ott -  (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+import sys
+sys.path.append(".")
+
+import math
+
+from gremlin.gate_index import GateRangeIndex
+
+
+class Gate:
+
+    def __init__(self, value):
+        self.value = value
+
+
+class Range:
+
+    def __init__(self, g1, g2):
+        self.v1 = g1.value
+        self.v2 = g2.value
+
+    def inrange(self, value):
+        if self.v1 < value < self.v2:
+            return True
+        return math.isclose(value, self.v1, abs_tol=0.0001) or \
+            math.isclose(value, self.v2, abs_tol=0.0001)
+
+
+def _create(count):
+    gates = [Gate(-1.0 + 2.0 * i / (count - 1)) for i in range(count)]
+    ranges = [Range(g1, g2) for g1, g2 in zip(gates, gates[1:])]
+    return gates, ranges
+
+
+def _linear_range(ranges, value):
+    return next((rng for rng in ranges if rng.inrange(value)), None)
+
+
+def _linear_gates(gates, v1, v2):
+    if v1 > v2:
+        v1, v2 = v2, v1
+    return [gate for gate in gates if v1 <= gate.value <= v2]
+
+
+def test_range_for_value():
+    gates, ranges = _create(21)
+    index = GateRangeIndex(reversed(gates), reversed(ranges))
+    for i in range(-1000, 1001):
+        value = i / 1000.0
+        assert index.range_for_value(value) is _linear_range(ranges, value)
+
+    # boundaries resolve to the lower range
+    assert index.range_for_value(gates[5].value) is ranges[4]
+    assert index.range_for_value(-1.0) is ranges[0]
+    assert index.range_for_value(1.0) is ranges[-1]
+    assert index.range_for_value(1.5) is None
+
+
+def test_gates_between():
+    gates, _ = _create(21)
+    index = GateRangeIndex(gates)
+    assert index.gates_between(None, 0.5) == []
+    assert index.gates_between(0.0, 0.0) == [gates[10]]
+    assert index.gates_between(0.05, 0.09) == []
+    for v1, v2 in [(-1.0, 1.0), (-0.35, 0.12), (0.5, -0.5), (0.1, 0.3)]:
+        assert index.gates_between(v1, v2) == _linear_gates(gates, v1, v2)
+
+
+def test_empty_index():
+    index = GateRangeIndex()
+    assert index.range_for_value(0.0) is None
+    assert index.gates_between(-1.0, 1.0) == []
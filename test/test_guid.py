@@ -0,0 +1,62 @@
+# -*- coding: utf-8; -*-
+
+# Based on original work by (C) Lionel Ott -  (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+import sys
+sys.path.append(".")
+
+import copy
+
+import dinput
+
+
+def _raw_guid(data1):
+    raw = dinput._GUID()
+    raw.Data1 = data1
+    raw.Data2 = 0x11D0
+    raw.Data3 = 0x11E9
+    for i in range(8):
+        raw.Data4[i] = i
+    return raw
+
+
+def test_interned():
+    g1 = dinput.GUID(_raw_guid(0xB4CA5720))
+    g2 = dinput.GUID(_raw_guid(0xB4CA5720))
+    g3 = dinput.GUID.from_raw(_raw_guid(0xB4CA5720))
+    assert g1 is g2
+    assert g1 is g3
+    assert copy.deepcopy(g1) is g1
+    assert str(g1) == "{B4CA5720-11D0-11E9-0001-020304050607}"
+
+
+def test_equality_and_hash():
+    g1 = dinput.GUID(_raw_guid(0xB4CA5721))
+    g2 = dinput.GUID(_raw_guid(0xB4CA5722))
+    assert g1 == dinput.GUID.from_raw(_raw_guid(0xB4CA5721))
+    assert g1 != g2
+    assert g1 != None
+    assert hash(g1) == hash(dinput.GUID(_raw_guid(0xB4CA5721)))
+    lookup = {g1: 1, g2: 2}
+    assert lookup[dinput.GUID.from_raw(_raw_guid(0xB4CA5722))] == 2
+
+
+def test_raw_data_is_copied():
+    raw = _raw_guid(0xB4CA5723)
+    guid = dinput.GUID(raw)
+    raw.Data1 = 0
+    assert guid.guid[0] == 0xB4CA5723
+    assert dinput.GUID.from_raw(raw) is not guid
@@ -0,0 +1,97 @@
+# -*- coding: utf-8; -*-
+
+# Based on original work by (C) Lionel Ott -  (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+import collections
+import json
+import sys
+sys.path.append(".")
+
+from gremlin.instrumentation import Instrumentation, LatencyHistogram
+
+
+def test_bucket_bounds():
+    previous = -1
+    for value in list(range(0, 4096)) + [10**6, 10**9, 2**39]:
+        index = LatencyHistogram.bucket_index(value)
+        lower = LatencyHistogram.bucket_lower_bound(index)
+        upper = LatencyHistogram.bucket_lower_bound(index + 1)
+        assert lower <= value < upper
+        # relative bucket width is bounded by the sub bucket resolution
+        assert upper - lower <= max(1, lower // 16)
+        assert index >= previous
+        previous = index
+
+
+def test_percentiles():
+    histogram = LatencyHistogram()
+    for value in range(1, 1001):
+        histogram.record(value * 1000)
+    assert histogram.count == 1000
+    assert histogram.minimum == 1000
+    assert histogram.maximum == 1000000
+    assert abs(histogram.mean - 500500) < 1e-6
+    for percent in (50, 90, 99):
+        expected = percent * 10000
+        assert abs(histogram.percentile(percent) - expected) <= expected / 16
+    assert histogram.percentile(100) == 1000000
+
+    # values beyond the range end up in the last bucket
+    histogram.record(2**50)
+    assert histogram.counts[-1] == 1
+    assert histogram.maximum == 2**50
+
+    histogram.reset()
+    assert histogram.count == 0
+    assert histogram.percentile(50) == 0
+    assert sum(histogram.counts) == 0
+
+
+Event = collections.namedtuple(
+    "Event", ["device_guid", "event_type", "identifier"]
+)
+
+
+class Functor:
+    pass
+
+
+def test_instrumentation(tmp_path):
+    stats = Instrumentation()
+    stats.reset()
+    event = Event("guid", "axis", 1)
+    stats.record_input(event, 2000)
+    stats.record_input(event, 4000)
+    stats.record_input(Event("guid", "button", 2), 100)
+    stats.record_graph("container", 3000)
+    stats.record_functor(Functor(), 500)
+    stats.record_remote("batch", 800)
+
+    snapshot = stats.snapshot()
+    assert [e["identifier"] for e in snapshot["inputs"]] == ["1", "2"]
+    assert snapshot["inputs"][0]["count"] == 2
+    assert snapshot["inputs"][0]["total_us"] == 6.0
+    assert snapshot["graphs"][0]["name"] == "container"
+    assert snapshot["functors"][0]["name"] == "Functor"
+    assert snapshot["remote"][0]["name"] == "batch"
+
+    fname = tmp_path / "stats.json"
+    stats.export(str(fname))
+    with open(fname) as data:
+        assert json.load(data)["functors"][0]["count"] == 1
+
+    stats.reset()
+    assert stats.snapshot()["inputs"] == []
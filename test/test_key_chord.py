@@ -0,0 +1,66 @@
+# -*- coding: utf-8; -*-
+
+# Based on original work by (C) Lionel Ott -  (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+import sys
+sys.path.append(".")
+
+import gremlin.key_chord
+from gremlin.key_chord import KeyIndex
+
+
+ctrl = (0x1D, False)
+shift = (0x2A, False)
+key_a = (0x1E, False)
+mouse_left = (0x1001, False)
+
+
+def test_key_index():
+    index = KeyIndex()
+    assert index is KeyIndex()
+    bit = index.bit(ctrl)
+    assert bit == index.bit(ctrl)
+    assert bin(bit).count("1") == 1
+    assert index.bit(key_a) != bit
+    mask = index.mask([ctrl, key_a, ctrl])
+    assert mask == bit | index.bit(key_a)
+    assert sorted(index.keys(mask)) == sorted([ctrl, key_a])
+
+
+def test_chord_matching():
+    index = KeyIndex()
+    chord = index.mask([ctrl, key_a])
+    mouse_chord = index.mask([shift, mouse_left])
+
+    state = 0
+    state = gremlin.key_chord.update(state, index.bit(key_a), True)
+    assert not gremlin.key_chord.is_held(state, chord)
+    state = gremlin.key_chord.update(state, index.bit(ctrl), True)
+    assert gremlin.key_chord.is_held(state, chord)
+    # unrelated keys do not affect the chord
+    state = gremlin.key_chord.update(state, index.bit(shift), True)
+    assert gremlin.key_chord.is_held(state, chord)
+    assert not gremlin.key_chord.is_held(state, mouse_chord)
+    state = gremlin.key_chord.update(state, index.bit(mouse_left), True)
+    assert gremlin.key_chord.is_held(state, mouse_chord)
+
+    # a previous state is an unchanged snapshot
+    snapshot = state
+    state = gremlin.key_chord.update(state, index.bit(ctrl), False)
+    assert not gremlin.key_chord.is_held(state, chord)
+    assert gremlin.key_chord.is_held(snapshot, chord)
+    # releasing a released key keeps the state
+    assert gremlin.key_chord.update(state, index.bit(ctrl), False) == state
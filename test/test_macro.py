@@ -0,0 +1,145 @@
+# -*- coding: utf-8; -*-
+
+# Based on original work by (C) Lionel Ott -  (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+import sys
+sys.path.append(".")
+
+import threading
+import time
+
+import pytest
+
+import gremlin.macro
+
+
+class Record(gremlin.macro.MacroAbstractAction):
+
+    """Macro action recording its name when executed."""
+
+    def __init__(self, log, name):
+        self.log = log
+        self.name = name
+
+    def __call__(self, is_local = None, is_remote = None, force_remote = None):
+        self.log.append(self.name)
+
+
+def _macro(log, *names, pause = None, exclusive = False, repeat = None):
+    macro = gremlin.macro.Macro()
+    for i, name in enumerate(names):
+        if i > 0 and pause is not None:
+            macro.pause(pause)
+        macro.add_action(Record(log, name))
+    macro.exclusive = exclusive
+    macro.repeat = repeat
+    return macro
+
+
+def _wait_for(predicate, timeout = 2.0):
+    end = time.perf_counter() + timeout
+    while not predicate():
+        assert time.perf_counter() < end, "timed out"
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def manager():
+    manager = gremlin.macro.MacroManager.klass()
+    manager.default_delay = 0.01
+    manager.start()
+    yield manager
+    manager.stop()
+
+
+def test_exclusive_macro_runs_alone(manager):
+    log = []
+    exclusive = _macro(log, "e1", "e2", pause = 0.1, exclusive = True)
+    other = _macro(log, "o")
+
+    manager.queue_macro(exclusive)
+    _wait_for(lambda: "e1" in log)
+    manager.queue_macro(other)
+    _wait_for(lambda: "o" in log)
+
+    assert log == ["e1", "e2", "o"]
+
+
+def test_blocked_requests_start_in_order(manager):
+    log = []
+    exclusive = _macro(log, "e1", "e2", pause = 0.1, exclusive = True)
+    first = _macro(log, "o1")
+    second = _macro(log, "x", exclusive = True)
+    third = _macro(log, "o3")
+
+    manager.queue_macro(exclusive)
+    _wait_for(lambda: "e1" in log)
+    # a non exclusive request may not overtake the exclusive one ahead of it
+    for macro in (first, second, third):
+        manager.queue_macro(macro)
+    _wait_for(lambda: "o3" in log)
+
+    assert log == ["e1", "e2", "o1", "x", "o3"]
+
+
+def test_toggle_repeat_terminates(manager):
+    log = []
+    macro = _macro(log, "t", repeat = gremlin.macro.ToggleRepeat(0.01))
+
+    manager.queue_macro(macro)
+    _wait_for(lambda: len(log) >= 3)
+    # queueing a running toggle macro again stops it
+    manager.queue_macro(macro)
+    _wait_for(lambda: not manager.is_active(macro))
+    count = len(log)
+    time.sleep(0.05)
+
+    assert len(log) == count
+
+
+def test_pause_does_not_hold_a_worker(manager):
+    log = []
+    macros = [
+        _macro(log, f"a{i}", f"b{i}", pause = 0.2)
+        for i in range(manager.worker_count + 1)
+    ]
+
+    for macro in macros:
+        manager.queue_macro(macro)
+    _wait_for(lambda: len(log) == 2 * len(macros))
+
+    # every macro starts before any resumes from its pause
+    assert all(name.startswith("a") for name in log[:len(macros)])
+
+
+def test_stop_cancels_paused_run(manager):
+    log = []
+    macro = _macro(log, "s1", "s2", pause = 10.0)
+    workers = list(manager._workers)
+
+    manager.queue_macro(macro)
+    _wait_for(lambda: "s1" in log)
+    # a second request waits for the first run to end
+    manager.queue_macro(macro)
+    start = time.perf_counter()
+    manager.stop()
+
+    assert time.perf_counter() - start < 1.0
+    assert log == ["s1"]
+    assert not manager.is_active(macro)
+    assert not manager._run_queue
+    assert not any(worker.is_alive() for worker in workers)
+    assert threading.current_thread() not in workers
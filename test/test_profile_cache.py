@@ -0,0 +1,130 @@
+# -*- coding: utf-8; -*-
+
+# Based on original work by (C) Lionel Ott -  (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+import sys
+sys.path.append(".")
+
+import os
+
+import pytest
+
+import gremlin.base_profile
+import gremlin.config
+
+
+class _Profile:
+
+    """Stand in exposing what the cache uses of a profile."""
+
+    def __init__(self, fname, dirty=False):
+        self.profile_file = fname
+        self.dirty = dirty
+        self.retained = False
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(
+        type(gremlin.config.Configuration()),
+        "profile_cache_size",
+        property(lambda self: 2)
+    )
+    return gremlin.base_profile.ProfileCache.klass()
+
+
+def _write(path, content):
+    with open(path, "w") as out:
+        out.write(content)
+    return str(path)
+
+
+def test_put_take(cache, tmp_path):
+    fname = _write(tmp_path / "a.xml", "<profile/>")
+    profile = _Profile(fname)
+
+    cache.put(profile)
+    assert profile.retained
+    assert fname in cache
+
+    assert cache.take(fname) is profile
+    assert not profile.retained
+    assert len(cache) == 0
+    assert cache.take(fname) is None
+
+
+def test_dirty_profile_not_kept(cache, tmp_path):
+    fname = _write(tmp_path / "a.xml", "<profile/>")
+    profile = _Profile(fname, dirty=True)
+
+    cache.put(profile)
+    assert not profile.retained
+    assert len(cache) == 0
+
+
+def test_least_recently_used_evicted(cache, tmp_path):
+    profiles = [
+        _Profile(_write(tmp_path / f"{i}.xml", "<profile/>")) for i in range(3)
+    ]
+    for profile in profiles:
+        cache.put(profile)
+
+    assert len(cache) == 2
+    assert not profiles[0].retained
+    assert profiles[0].profile_file not in cache
+    assert profiles[1].retained and profiles[2].retained
+
+
+def test_modified_file_invalidates(cache, tmp_path):
+    fname = _write(tmp_path / "a.xml", "<profile/>")
+    profile = _Profile(fname)
+    cache.put(profile)
+
+    _write(fname, "<profile version=\"10\"/>")
+    stat = os.stat(fname)
+    os.utime(fname, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert cache.take(fname) is None
+    assert not profile.retained
+    assert len(cache) == 0
+
+
+def test_cached_profile_ignores_profile_start(cache, tmp_path):
+    from PySide6 import QtWidgets
+    import action_plugins.gated_axis
+    import gremlin.event_handler
+    QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+    def gated_axis(fname):
+        profile = gremlin.base_profile.Profile()
+        profile._profile_fname = _write(fname, "<profile/>")
+        action = action_plugins.gated_axis.GatedAxis(
+            gremlin.base_profile.InputItem(profile)
+        )
+        return profile, action.gate_data
+
+    cached, cached_gate = gated_axis(tmp_path / "cached.xml")
+    _, running_gate = gated_axis(tmp_path / "running.xml")
+    cache.put(cached)
+    assert cached.retained
+
+    el = gremlin.event_handler.EventListener()
+    el.profile_start.emit()
+    try:
+        assert running_gate._subscription is not None
+        assert cached_gate._subscription is None
+    finally:
+        el.profile_stop.emit()
@@ -0,0 +1,100 @@
+# -*- coding: utf-8; -*-
+
+# Based on original work by (C) Lionel Ott -  (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+import sys
+sys.path.append(".")
+
+import pytest
+
+import gremlin.remote_protocol as rp
+
+
+sender = bytes(range(16))
+
+
+def test_batch_coalescing():
+    batch = rp.BatchBuilder()
+    batch.axis(1, 1, 0.25)
+    batch.button(1, 3, True)
+    batch.axis(1, 1, -0.5)
+    batch.axis(2, 1, 1.0)
+    batch.hat(1, 1, (1, -1))
+    batch.button(1, 3, False)
+    batch.relative_axis(1, 2, 0.1)
+    assert batch.relative_axis(1, 2, 0.2) == 6
+
+    records = batch.take()
+    assert records[:3] == [
+        (rp.OP_BUTTON, 1, 3, 1.0),
+        (rp.OP_HAT, 1, 1, rp.encode_hat((1, -1))),
+        (rp.OP_BUTTON, 1, 3, 0.0),
+    ]
+    assert records[3:5] == [(rp.OP_AXIS, 1, 1, -0.5), (rp.OP_AXIS, 2, 1, 1.0)]
+    assert records[5][:3] == (rp.OP_RELATIVE_AXIS, 1, 2)
+    assert records[5][3] == pytest.approx(0.3)
+    assert len(batch) == 0
+    assert batch.take() == []
+
+
+def test_encode_decode():
+    records = [
+        (rp.OP_BUTTON, 1, 128, 1.0),
+        (rp.OP_HAT, 2, 4, rp.encode_hat((-1, 0))),
+        (rp.OP_AXIS, 16, 8, -0.75),
+    ]
+    data = rp.encode(sender, 42, records)
+    assert rp.is_batch(data)
+    assert len(data) == rp.HEADER.size + 3 * rp.RECORD.size
+
+    decoded_sender, sequence, decoded = rp.decode(data)
+    assert decoded_sender == sender
+    assert sequence == 42
+    assert decoded == records
+    assert rp.decode_hat(decoded[1][3]) == (-1, 0)
+
+    # truncated datagrams are rejected
+    assert rp.decode(data[:-1]) is None
+    assert rp.decode(data[:10]) is None
+
+
+def test_hat_encoding():
+    for x in (-1, 0, 1):
+        for y in (-1, 0, 1):
+            assert rp.decode_hat(rp.encode_hat((x, y))) == (x, y)
+
+
+def test_sequence_filter():
+    seq_filter = rp.SequenceFilter()
+    assert seq_filter.accept(sender, 10)
+    assert not seq_filter.accept(sender, 10)
+    assert not seq_filter.accept(sender, 9)
+    assert seq_filter.accept(sender, 12)
+    # senders are tracked separately
+    assert seq_filter.accept(b"x" * 16, 1)
+
+    # wrap around of the sequence number
+    other = b"y" * 16
+    assert seq_filter.accept(other, 0xFFFFFFFE)
+    assert seq_filter.accept(other, 0xFFFFFFFF)
+    assert seq_filter.accept(other, 0)
+    assert not seq_filter.accept(other, 0xFFFFFFFE)
+
+
+def test_opcode_names():
+    assert rp.opcode_name(rp.OP_AXIS) == "axis"
+    assert rp.opcode_name(rp.OP_GAMEPAD_BUTTON) == "gamepad button"
+    assert rp.opcode_name(99) == "opcode 99"
@@ -0,0 +1,60 @@
+# -*- coding: utf-8; -*-
+
+# Based on original work by (C) Lionel Ott -  (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+import sys
+sys.path.append(".")
+
+import threading
+import time
+
+from gremlin.scheduler import Scheduler
+
+
+def test_schedule_order():
+    done = threading.Event()
+    calls = []
+    scheduler = Scheduler()
+    scheduler.schedule(0.03, lambda: (calls.append(3), done.set()))
+    scheduler.schedule(0.01, calls.append, 1)
+    scheduler.schedule(0.02, calls.append, 2)
+    assert done.wait(1.0)
+    assert calls == [1, 2, 3]
+
+
+def test_cancel():
+    done = threading.Event()
+    calls = []
+    scheduler = Scheduler()
+    task = scheduler.schedule(0.01, calls.append, 1)
+    assert task.pending
+    task.cancel()
+    assert not task.pending
+    scheduler.schedule(0.02, done.set)
+    assert done.wait(1.0)
+    assert calls == []
+
+
+def test_periodic():
+    calls = []
+    scheduler = Scheduler()
+    task = scheduler.schedule_periodic(0.01, lambda: calls.append(time.perf_counter()))
+    time.sleep(0.1)
+    task.cancel()
+    count = len(calls)
+    assert count >= 3
+    time.sleep(0.05)
+    assert len(calls) <= count + 1
@@ -0,0 +1,166 @@
+# -*- coding: utf-8; -*-
+
+# Based on original work by (C) Lionel Ott -  (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+import sys
+sys.path.append(".")
+
+import ctypes
+import os
+
+import dinput
+import dinput.simulated
+import vjoy.simulated
+
+
+def _install_dill(devices):
+    backend = dinput.simulated.SimulatedDill(devices)
+    previous = (dinput.DILL._dll, dinput.DILL.initalized)
+    dinput.DILL.set_backend(backend)
+    return backend, previous
+
+
+def _restore_dill(previous):
+    dinput.DILL._dll, dinput.DILL.initalized = previous
+
+
+def test_device_enumeration():
+    device = dinput.simulated.VirtualDevice(
+        "Stick", axis_count=3, button_count=12, hat_count=1
+    )
+    backend, previous = _install_dill([device])
+    try:
+        assert dinput.DILL.get_device_count() == 1
+        info = dinput.DILL.get_device_information_by_index(0)
+        assert info.name == "Stick"
+        assert info.axis_count == 3
+        assert info.button_count == 12
+        assert str(info.device_guid) == device.guid
+        assert info.axis_map[2].linear_index == 3
+        assert dinput.DILL.device_exists(info.device_guid)
+
+        device.set_axis(2, 1000)
+        device.set_hat(1, 9000)
+        assert dinput.DILL.get_axis(info.device_guid, 2) == 1000
+        assert dinput.DILL.get_hat(info.device_guid, 1) == 9000
+        assert dinput.DILL.get_button(info.device_guid, 4) is False
+    finally:
+        _restore_dill(previous)
+
+
+def test_input_and_device_callbacks():
+    device = dinput.simulated.VirtualDevice("Stick")
+    backend, previous = _install_dill([device])
+    events = []
+    changes = []
+    try:
+        dinput.DILL.set_input_event_callback(
+            lambda data: events.append(dinput.InputEvent(data))
+        )
+        dinput.DILL.set_device_change_callback(
+            lambda data, action: changes.append(
+                (dinput.DeviceSummary(data), action)
+            )
+        )
+
+        device.set_axis(1, -32768)
+        device.set_button(5, True)
+        assert len(events) == 2
+        assert events[0].device_guid == dinput.GUID(device.raw_guid)
+        assert events[0].input_type == dinput.InputType.Axis
+        assert events[0].value == -32768
+        assert events[1].input_type == dinput.InputType.Button
+        assert events[1].input_index == 5
+        assert events[1].value == 1
+
+        pedals = dinput.simulated.VirtualDevice("Pedals", axis_count=3)
+        backend.add_device(pedals)
+        backend.remove_device(pedals)
+        assert [action for _, action in changes] == [
+            dinput.simulated.DEVICE_CONNECTED,
+            dinput.simulated.DEVICE_DISCONNECTED
+        ]
+        assert changes[0][0].name == "Pedals"
+    finally:
+        _restore_dill(previous)
+
+
+def test_event_generator():
+    device = dinput.simulated.VirtualDevice("Stick")
+    backend, previous = _install_dill([device])
+    values = []
+    applied = []
+    try:
+        dinput.DILL.set_input_event_callback(
+            lambda data: values.append(data.value)
+        )
+        script = dinput.simulated.merge_scripts(
+            dinput.simulated.axis_sweep(device, 1, 1000, 0.05),
+            dinput.simulated.button_presses(device, 1, 100, 0.05)
+        )
+        generator = dinput.simulated.EventGenerator(
+            script, listener=lambda timestamp, entry: applied.append(timestamp)
+        )
+        generator.start()
+        generator.join(5.0)
+
+        assert generator.emitted == len(script) == 60
+        assert len(values) == len(script)
+        assert applied == sorted(applied)
+        # playback follows the script timing, the first input may be late
+        assert applied[-1] - applied[0] >= script[-1].time - 0.005
+    finally:
+        _restore_dill(previous)
+
+
+def test_vjoy_outputs_are_recorded():
+    backend = vjoy.simulated.SimulatedVJoy([
+        vjoy.simulated.SimulatedVJoyDevice(1, axis_count=4, button_count=8, hat_count=1)
+    ])
+    assert backend.GetVJDStatus(1) == 1
+    assert backend.GetVJDStatus(2) == 3
+    assert backend.GetVJDAxisExist(1, 0x33) == 1
+    assert backend.GetVJDAxisExist(1, 0x34) == 0
+
+    maximum = ctypes.c_ulong()
+    backend.GetVJDAxisMax(1, 0x30, ctypes.byref(maximum))
+    assert maximum.value == backend.axis_maximum
+
+    # writes require ownership
+    assert not backend.SetBtn(True, 1, 1)
+    assert backend.AcquireVJD(1)
+    assert backend.GetOwnerPid(1) == os.getpid()
+    assert backend.SetAxis(100, 1, 0x31)
+    assert backend.SetBtn(True, 1, 8)
+    assert backend.SetContPov(4500, 1, 1)
+    assert not backend.SetBtn(True, 1, 9)
+
+    records = [(r.input_type, r.input_id, r.value) for r in backend.records]
+    assert records == [("axis", 2, 100), ("button", 8, True), ("hat", 1, 4500)]
+
+    backend.RelinquishVJD(1)
+    assert backend.GetVJDStatus(1) == 1
+
+
+def test_vjoy_dinput_counterparts():
+    backend = vjoy.simulated.SimulatedVJoy([
+        vjoy.simulated.SimulatedVJoyDevice(1, axis_count=8, button_count=32),
+        vjoy.simulated.SimulatedVJoyDevice(2, axis_count=3, button_count=16)
+    ])
+    devices = backend.dinput_devices()
+    summaries = [dinput.DeviceSummary(dev.summary()) for dev in devices]
+    assert all(summary.is_virtual for summary in summaries)
+    assert [summary.button_count for summary in summaries] == [32, 16]
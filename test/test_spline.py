@@ -0,0 +1,58 @@
+# -*- coding: utf-8; -*-
+
+# Based on original work by (C) Lionel Ott -  (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+import sys
+sys.path.append(".")
+
+import pytest
+
+from gremlin.spline import CubicSpline, CubicBezierSpline, LookupTableCurve
+
+
+def test_lookup_table_cubic():
+    spline = CubicSpline([(-1.0, -1.0), (-0.3, -0.1), (0.2, 0.05), (1.0, 1.0)])
+    curve = LookupTableCurve(spline)
+    for i in range(-100, 101):
+        x = i / 100.0
+        assert curve(x) == pytest.approx(spline(x), abs=1e-4)
+
+
+def test_lookup_table_bezier():
+    spline = CubicBezierSpline([(-1.0, -1.0), (-0.5, -0.2), (0.5, 0.2), (1.0, 1.0)])
+    curve = LookupTableCurve(spline)
+    for i in range(-100, 101):
+        x = i / 100.0
+        assert curve(x) == pytest.approx(spline(x), abs=1e-4)
+
+
+def test_lookup_table_limits():
+    curve = LookupTableCurve(lambda x: x, 11)
+    assert curve.resolution == 11
+    assert curve(-1.0) == -1.0
+    assert curve(1.0) == 1.0
+    assert curve(-5.0) == -1.0
+    assert curve(5.0) == 1.0
+    assert curve(0.05) == pytest.approx(0.05)
+
+
+def test_lookup_table_evaluate():
+    curve = LookupTableCurve(lambda x: x * x * x, 512)
+    values = [-1.5, -1.0, -0.25, 0.0, 0.33, 1.0, 1.5]
+    result = curve.evaluate(values)
+    assert len(result) == len(values)
+    for x, y in zip(values, result):
+        assert y == pytest.approx(curve(x))
@@ -0,0 +1,85 @@
+# -*- coding: utf-8; -*-
+
+# Based on original work by (C) Lionel Ott -  (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>
+
+import sys
+sys.path.append(".")
+
+import time
+
+from gremlin.tick import TickService
+
+
+def test_subscribers_share_tick():
+    service = TickService()
+    service.rate = 100
+    calls = []
+    flushes = []
+    flush = lambda: flushes.append(len(calls))
+    service.add_flush_handler(flush)
+    first = service.subscribe(calls.append, "a")
+    second = service.subscribe(calls.append, "b")
+    time.sleep(0.1)
+    first.cancel()
+    second.cancel()
+    service.remove_flush_handler(flush)
+
+    assert calls.count("a") >= 3
+    assert abs(calls.count("a") - calls.count("b")) <= 1
+    # both subscribers run before the flush of their tick
+    assert flushes[0] % 2 == 0
+
+
+def test_interval_and_cancel():
+    service = TickService()
+    service.rate = 100
+    fast = []
+    slow = []
+    fast_sub = service.subscribe(lambda: fast.append(1))
+    slow_sub = service.subscribe(lambda: slow.append(1), interval=0.05)
+    assert slow_sub.every == 5
+    time.sleep(0.2)
+    fast_sub.cancel()
+    slow_sub.cancel()
+    assert not fast_sub.active
+    count = len(fast)
+    assert len(slow) < count
+    time.sleep(0.05)
+    assert len(fast) == count
+
+
+def test_failing_subscriber_is_removed():
+    service = TickService()
+    calls = []
+    def fail():
+        calls.append(1)
+        raise ValueError("failure")
+    subscription = service.subscribe(fail)
+    time.sleep(0.05)
+    assert not subscription.active
+    assert len(calls) == 1
+
+
+def test_statistics():
+    service = TickService()
+    service.reset_statistics()
+    subscription = service.subscribe(lambda: None)
+    time.sleep(0.05)
+    subscription.cancel()
+    statistics = service.statistics()
+    assert statistics["rate"] == service.rate
+    assert statistics["count"] >= 2
+    assert statistics["max_us"] >= statistics["p50_us"] >= 0
@@ -0,0 +1,295 @@
+# -*- coding: utf-8; -*-
+
+# Based on original work by (C) Lionel Ott -  (C) EMCS 2024 and other contributors
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""In-process simulation of the vJoy interface library.
+
+SimulatedVJoy implements the C API of vJoyInterface.dll and records every
+output written to its devices, it can be installed in place of the library
+with install(). The DirectInput side of each simulated vJoy device is
+provided by dinput_devices() so Gremlin links both the same way it does
+with the real driver.
+"""
+
+import collections
+import os
+import threading
+import time
+
+
+# vJoy device status values, mirrors vjoy_interface.VJoyState
+_STATUS_OWNED = 0
+_STATUS_FREE = 1
+_STATUS_MISSING = 3
+
+# HID usage of the first axis, the others follow sequentially
+_AXIS_USAGE_FIRST = 0x30
+
+# vendor and product id vJoy devices report to DirectInput
+VJOY_VENDOR_ID = 0x1234
+VJOY_PRODUCT_ID = 0xBEAD
+
+
+OutputRecord = collections.namedtuple(
+    "OutputRecord",
+    ["timestamp", "vjoy_id", "input_type", "input_id", "value"]
+)
+OutputRecord.__doc__ = "Output written to a simulated vJoy device."
+
+
+class SimulatedVJoyDevice:
+
+    """State of a single simulated vJoy device."""
+
+    def __init__(self, vjoy_id, axis_count=8, button_count=128, hat_count=4):
+        """Creates a new instance.
+
+        :param vjoy_id id of the device, between 1 and 16
+        :param axis_count number of axes, at most 8
+        :param button_count number of buttons
+        :param hat_count number of continuous hats
+        """
+        self.vjoy_id = vjoy_id
+        self.axis_count = min(8, axis_count)
+        self.button_count = button_count
+        self.hat_count = hat_count
+        self.owner_pid = 0
+        self.reset()
+
+    def reset(self):
+        """Centers all axes and hats and releases all buttons."""
+        self.axes = {
+            _AXIS_USAGE_FIRST + i: 16384 for i in range(self.axis_count)
+        }
+        self.buttons = [False] * self.button_count
+        self.hats = [-1] * self.hat_count
+
+
+class SimulatedVJoy:
+
+    """Implementation of the vJoy C API on top of simulated devices.
+
+    Every axis, button, and hat write is appended to a bounded record as an
+    OutputRecord with the time.perf_counter timestamp of the write, an
+    optional listener is called with each record as it is written.
+    """
+
+    version = 0x219
+    axis_minimum = 0
+    axis_maximum = 32767
+
+    def __init__(self, devices=(), record_size=100000, listener=None):
+        """Creates a new instance.
+
+        :param devices SimulatedVJoyDevice instances to expose
+        :param record_size maximum number of outputs kept in the record
+        :param listener callable invoked with every OutputRecord
+        """
+        self.devices = {dev.vjoy_id: dev for dev in devices}
+        self.records = collections.deque(maxlen=record_size)
+        self.listener = listener
+        self._lock = threading.Lock()
+
+    def add_device(self, device):
+        """Adds a device.
+
+        :param device the SimulatedVJoyDevice to add
+        """
+        self.devices[device.vjoy_id] = device
+
+    def dinput_devices(self):
+        """Returns the DirectInput counterparts of the vJoy devices.
+
+        :return list of dinput.simulated.VirtualDevice instances reporting
+            the vJoy vendor and product ids and the counts of each device
+        """
+        from dinput.simulated import VirtualDevice
+        return [
+            VirtualDevice(
+                "vJoy Device",
+                axis_count=dev.axis_count,
+                button_count=dev.button_count,
+                hat_count=dev.hat_count,
+                vendor_id=VJOY_VENDOR_ID,
+                product_id=VJOY_PRODUCT_ID
+            )
+            for _, dev in sorted(self.devices.items())
+        ]
+
+    def clear(self):
+        """Removes all recorded outputs."""
+        with self._lock:
+            self.records.clear()
+
+    def _record(self, vjoy_id, input_type, input_id, value):
+        record = OutputRecord(
+            time.perf_counter(), vjoy_id, input_type, input_id, value
+        )
+        with self._lock:
+            self.records.append(record)
+        if self.listener is not None:
+            self.listener(record)
+
+    def _owned(self, vjoy_id):
+        device = self.devices.get(vjoy_id)
+        if device is None or device.owner_pid != os.getpid():
+            return None
+        return device
+
+    # General vJoy information
+
+    def GetvJoyVersion(self):
+        return self.version
+
+    def vJoyEnabled(self):
+        return True
+
+    def GetvJoyProductString(self):
+        return "vJoy - Virtual Joystick"
+
+    def GetvJoyManufacturerString(self):
+        return "Simulated"
+
+    def GetvJoySerialNumberString(self):
+        return str(self.version)
+
+    # Device properties
+
+    def GetVJDButtonNumber(self, vjoy_id):
+        device = self.devices.get(vjoy_id)
+        return device.button_count if device is not None else 0
+
+    def GetVJDDiscPovNumber(self, vjoy_id):
+        return 0
+
+    def GetVJDContPovNumber(self, vjoy_id):
+        device = self.devices.get(vjoy_id)
+        return device.hat_count if device is not None else 0
+
+    def GetVJDAxisExist(self, vjoy_id, axis):
+        device = self.devices.get(vjoy_id)
+        return 1 if device is not None and axis in device.axes else 0
+
+    def GetVJDAxisMax(self, vjoy_id, axis, value):
+        value._obj.value = self.axis_maximum
+        return True
+
+    def GetVJDAxisMin(self, vjoy_id, axis, value):
+        value._obj.value = self.axis_minimum
+        return True
+
+    # Device management
+
+    def GetOwnerPid(self, vjoy_id):
+        device = self.devices.get(vjoy_id)
+        return device.owner_pid if device is not None else 0
+
+    def AcquireVJD(self, vjoy_id):
+        device = self.devices.get(vjoy_id)
+        if device is None or device.owner_pid not in (0, os.getpid()):
+            return False
+        device.owner_pid = os.getpid()
+        return True
+
+    def RelinquishVJD(self, vjoy_id):
+        device = self._owned(vjoy_id)
+        if device is not None:
+            device.owner_pid = 0
+
+    def UpdateVJD(self, vjoy_id, data):
+        return self._owned(vjoy_id) is not None
+
+    def GetVJDStatus(self, vjoy_id):
+        device = self.devices.get(vjoy_id)
+        if device is None:
+            return _STATUS_MISSING
+        return _STATUS_FREE if device.owner_pid == 0 else _STATUS_OWNED
+
+    # Reset functions
+
+    def ResetVJD(self, vjoy_id):
+        device = self._owned(vjoy_id)
+        if device is None:
+            return False
+        device.reset()
+        return True
+
+    def ResetAll(self):
+        for device in self.devices.values():
+            device.reset()
+
+    def ResetButtons(self, vjoy_id):
+        device = self._owned(vjoy_id)
+        if device is None:
+            return False
+        device.buttons = [False] * device.button_count
+        return True
+
+    def ResetPovs(self, vjoy_id):
+        device = self._owned(vjoy_id)
+        if device is None:
+            return False
+        device.hats = [-1] * device.hat_count
+        return True
+
+    # Set values
+
+    def SetAxis(self, value, vjoy_id, axis):
+        device = self._owned(vjoy_id)
+        if device is None or axis not in device.axes:
+            return False
+        device.axes[axis] = value
+        self._record(vjoy_id, "axis", axis - _AXIS_USAGE_FIRST + 1, value)
+        return True
+
+    def SetBtn(self, state, vjoy_id, button):
+        device = self._owned(vjoy_id)
+        if device is None or not 0 < button <= device.button_count:
+            return False
+        device.buttons[button - 1] = bool(state)
+        self._record(vjoy_id, "button", button, bool(state))
+        return True
+
+    def SetDiscPov(self, value, vjoy_id, hat):
+        return False
+
+    def SetContPov(self, value, vjoy_id, hat):
+        device = self._owned(vjoy_id)
+        if device is None or not 0 < hat <= device.hat_count:
+            return False
+        device.hats[hat - 1] = value
+        self._record(vjoy_id, "hat", hat, value)
+        return True
+
+
+def install(backend=None):
+    """Replaces the vJoy library with a simulated backend.
+
+    The Windows only modules missing on this system are replaced as well,
+    see gremlin.simulated_windows.
+
+    :param backend the SimulatedVJoy to install, if None a backend with a
+        single fully featured device with id 1 is created
+    :return the installed backend
+    """
+    import gremlin.simulated_windows
+    from vjoy.vjoy_interface import VJoyInterface
+
+    gremlin.simulated_windows.install()
+    if backend is None:
+        backend = SimulatedVJoy([SimulatedVJoyDevice(1)])
+    VJoyInterface.set_backend(backend)
+    return backend
@@ -177,8 +177,10 @@ class Axis:
         self._max_value = tmp.value
         self._half_range = int(self._max_value / 2)
 
-        self._deadzone_fn = lambda x: deadzone(x, -1.0, -0.0, 0.0, 1.0)
-        self._response_curve_fn = lambda x: x
+        self._deadzone = None
+        self._response_curve = None
+        # fused deadzone and response curve, None if the output is unmodified
+        self._output_fn = None
 
         # If this is not the case our value setter needs to change
         if self._min_value != 0:
@@ -192,13 +194,14 @@ class Axis:
         :param control_points the control points defining the spline
         """
         if spline_type == "cubic-spline":
-            self._response_curve_fn = gremlin.spline.CubicSpline(control_points)
+            self._response_curve = gremlin.spline.CubicSpline(control_points)
         elif spline_type == "cubic-bezier-spline":
-            self._response_curve_fn = \
+            self._response_curve = \
                 gremlin.spline.CubicBezierSpline(control_points)
         else:
             logging.getLogger("system").error("Invalid spline type specified")
-            self._response_curve_fn = lambda x: x
+            self._response_curve = None
+        self._update_output_fn()
 
     def set_deadzone(self, low, center_low, center_high, high):
         """Sets the deadzone for the axis.
@@ -208,8 +211,24 @@ class Axis:
         :param center_high upper center deadzone limit
         :param high high deadzone limit
         """
-        self._deadzone_fn = lambda x: deadzone(
-            x, low, center_low, center_high, high
+        if (low, center_low, center_high, high) == (-1.0, 0.0, 0.0, 1.0):
+            self._deadzone = None
+        else:
+            self._deadzone = (low, center_low, center_high, high)
+        self._update_output_fn()
+
+    def _update_output_fn(self):
+        """Fuses deadzone and response curve into a single lookup table."""
+        if self._deadzone is None and self._response_curve is None:
+            self._output_fn = None
+            return
+
+        dz = self._deadzone if self._deadzone is not None \
+            else (-1.0, 0.0, 0.0, 1.0)
+        curve = self._response_curve if self._response_curve is not None \
+            else (lambda x: x)
+        self._output_fn = gremlin.spline.LookupTableCurve(
+            lambda x: curve(deadzone(x, *dz))
         )
 
     @property
@@ -241,9 +260,9 @@ class Axis:
 
         # Normalize value to [-1, 1] and apply response curve and deadzone
         # settings
-        self._value = self._response_curve_fn(
-            self._deadzone_fn(min(1.0, max(-1.0, value)))
-        )
+        value = min(1.0, max(-1.0, value))
+        self._value = value if self._output_fn is None \
+            else self._output_fn(value)
 
         if not VJoyInterface.SetAxis(
                 int(self._half_range + self._half_range * self._value),
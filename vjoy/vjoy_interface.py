@@ -153,13 +153,25 @@ class VJoyInterface:
         },
     }
 
+    @classmethod
+    def set_backend(self, backend):
+        """Replaces the vJoy library with another implementation of its API.
+
+        Has to be called before initialize, no library is loaded and the
+        backend functions are exposed as is. This allows running without the
+        vJoy driver, for example with the devices of vjoy.simulated.
+
+        :param backend object providing the functions of the vJoy C API
+        """
+        VJoyInterface.vjoy_dll = backend
+        self.initialize()
+
     @classmethod
     def initialize(self):
         """Initializes the functions as class methods."""
-        from pathlib import Path
-        from gremlin.util import display_error, get_dll_version, version_valid #, get_vjoy_driver_version
-
         if VJoyInterface.vjoy_dll is None:
+            from pathlib import Path
+            from gremlin.util import display_error, get_dll_version, version_valid #, get_vjoy_driver_version
 
             dll_folder = os.path.dirname(__file__)
             dll_file = "vJoyInterface.dll"
@@ -215,8 +227,12 @@ class VJoyInterface:
                 os._exit(1)
 
 
+        is_library = isinstance(self.vjoy_dll, ctypes.CDLL)
         for fn_name, params in self.api_functions.items():
             dll_fn = getattr(self.vjoy_dll, fn_name)
+            if not is_library:
+                setattr(self, fn_name, dll_fn)
+                continue
             if "arguments" in params:
                 dll_fn.argtypes = params["arguments"]
             if "returns" in params: